@@ -0,0 +1,4 @@
+"""
+Ad-hoc performance benchmarks (not collected by pytest)
+Run from the backend directory, e.g.: python -m benchmarks.bench_parsers
+"""
@@ -0,0 +1,86 @@
+"""
+Benchmark: fixed-point amount parsing vs the float path it replaced
+
+Generates a column of bank-export amounts ("-1,234.56", "$12.00", ...) and
+converts it to cents four ways:
+
+- "float cell": strip $ and commas, float(), round(x * 100), one cell at a time
+- "int cell": parse_cents, one cell at a time
+- "float column": the same cleanup with pandas string methods, NumPy round
+- "int column": parse_cents_column
+
+Each path also reports the cells where it disagrees with exact decimal
+rounding (the float paths turn 1.005 into 100 instead of 101).
+
+Usage: python -m benchmarks.bench_amounts [rows]
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from services.parsers.amount_parsing import parse_cents, parse_cents_column
+
+
+def make_amounts(rows: int, seed: int = 42) -> list[str]:
+    """Synthetic amount cells in the shapes banks export them"""
+    rng = random.Random(seed)
+    cells = []
+    for _ in range(rows):
+        cents = rng.randrange(1, 500_000)
+        digits = f"{cents // 100:,}.{cents % 100:02d}"
+        shape = rng.randrange(4)
+        if shape == 0:
+            cells.append(f"-{digits}")
+        elif shape == 1:
+            cells.append(f"${digits}")
+        elif shape == 2:
+            # Sub-cent precision, as in FX-converted exports
+            cells.append(f"{digits}{rng.randrange(10)}")
+        else:
+            cells.append(digits.replace(",", ""))
+    return cells
+
+
+def float_cell(text: str) -> int:
+    return int(round(float(text.replace("$", "").replace(",", "").strip()) * 100))
+
+
+def float_column(series: pd.Series) -> np.ndarray:
+    cleaned = series.str.replace("$", "", regex=False).str.replace(",", "", regex=False)
+    return np.round(cleaned.astype(np.float64).to_numpy() * 100).astype(np.int64)
+
+
+def timed(convert: Callable[[], object]) -> tuple[float, list[int]]:
+    started = time.perf_counter()
+    result = convert()
+    return (time.perf_counter() - started, [int(v) for v in result])
+
+
+def main(rows: int = 200_000) -> None:
+    cells = make_amounts(rows)
+    series = pd.Series(cells, dtype=object)
+
+    runs = {
+        "float cell": lambda: [float_cell(c) for c in cells],
+        "int cell": lambda: [parse_cents(c) for c in cells],
+        "float column": lambda: float_column(series),
+        "int column": lambda: parse_cents_column(series).tolist(),
+    }
+
+    exact = [parse_cents(c) for c in cells]
+
+    print(f"Amount parsing, {rows:,} cells\n")
+    print(f"{'path':<14}{'time':>10}{'rounding errors':>17}")
+    for name, convert in runs.items():
+        elapsed, result = timed(convert)
+        errors = sum(a != b for a, b in zip(result, exact, strict=True))
+        print(f"{name:<14}{elapsed:>9.3f}s{errors:>17,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
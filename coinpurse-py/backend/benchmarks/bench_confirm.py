@@ -0,0 +1,147 @@
+"""
+Benchmark: ways of copying a confirmed preview into transactions
+
+Stages a synthetic preview batch in a fresh SQLite file for each path,
+confirms every row, checks the resulting transactions match and prints
+the timings. "orm" is the original one-Transaction-per-row path.
+
+Usage: python -m benchmarks.bench_confirm [rows]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from models import (
+    Account,
+    AccountType,
+    Base,
+    Category,
+    FileFormat,
+    ImportBatch,
+    ImportStatus,
+    Institution,
+    TaxTreatmentType,
+    Transaction,
+)
+from repositories.import_staging_repository import ImportStagingRepository
+from services import ImportService
+from services.parsers import DEFAULT_CHUNK_SIZE, ParsedBatch
+
+MERCHANTS = ["AMAZON MKTPLACE", "STARBUCKS #1234", "SHELL OIL", "WHOLE FOODS"]
+
+
+def stage_batch(db: Session, rows: int, seed: int = 42) -> int:
+    """Create an account and a PREVIEW batch with rows staged, returning its ID"""
+    rng = random.Random(seed)
+    institution = Institution(name="Bench Bank")
+    category = Category(name="Uncategorized")
+    db.add_all([institution, category])
+    db.flush()
+
+    account = Account(
+        institution_id=institution.institution_id,
+        account_name="Bench Account",
+        account_type=AccountType.CREDIT_CARD,
+        tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+        last_4_digits="0000",
+        tracks_transactions=True,
+    )
+    db.add(account)
+    db.flush()
+
+    batch = ImportBatch(
+        account_id=account.account_id,
+        file_name="bench.csv",
+        file_format=FileFormat.CSV,
+        total_rows=rows,
+        status=ImportStatus.PREVIEW,
+    )
+    db.add(batch)
+    db.flush()
+
+    start = date(2020, 1, 1)
+    txn_dates = [start + timedelta(days=rng.randrange(365 * 5)) for _ in range(rows)]
+    amounts = [rng.randrange(-50_000, 20_000) for _ in range(rows)]
+    staged = ParsedBatch(
+        row_numbers=range(2, rows + 2),
+        transaction_dates=txn_dates,
+        posted_dates=[d + timedelta(days=rng.randrange(3)) for d in txn_dates],
+        descriptions=[rng.choice(MERCHANTS) for _ in range(rows)],
+        amounts=amounts,
+        transaction_types=["CREDIT" if cents >= 0 else "DEBIT" for cents in amounts],
+        bank_categories=[None] * rows,
+        validation_errors=[[] for _ in range(rows)],
+    )
+    staged.coinpurse_category_ids = [category.category_id] * rows
+    ImportStagingRepository(db).add_batch(batch.import_batch_id, staged)
+    db.commit()
+    return batch.import_batch_id
+
+
+def confirm_orm(db: Session, import_batch_id: int, selected: list[int]) -> None:
+    """The original path: one ORM Transaction added per row"""
+    staging_repo = ImportStagingRepository(db)
+    batch = db.get(ImportBatch, import_batch_id)
+    staging_repo.select_rows(import_batch_id, selected)
+    values = staging_repo.get_importable_values(
+        import_batch_id, batch.account_id, datetime.now(UTC)
+    )
+    for pending, row in enumerate(values, start=1):
+        db.add(Transaction(**row))
+        if pending % DEFAULT_CHUNK_SIZE == 0:
+            db.flush()
+    db.commit()
+
+
+def time_confirm(mode: str, rows: int) -> tuple[float, list[tuple]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            import_batch_id = stage_batch(db, rows)
+            selected = list(range(2, rows + 2))
+
+            started = time.perf_counter()
+            if mode == "orm":
+                confirm_orm(db, import_batch_id, selected)
+            else:
+                ImportService(db, confirm_mode=mode).confirm_import(
+                    import_batch_id, selected
+                )
+            elapsed = time.perf_counter() - started
+
+            imported = db.execute(
+                select(
+                    Transaction.transaction_date,
+                    Transaction.posted_date,
+                    Transaction.amount,
+                    Transaction.description,
+                    Transaction.transaction_type,
+                ).order_by(Transaction.transaction_id)
+            ).all()
+        engine.dispose()
+    return elapsed, [tuple(row) for row in imported]
+
+
+def main(rows: int = 100_000) -> None:
+    print(f"Confirming {rows:,} staged rows\n")
+    print(f"{'path':<16}{'time':>10}{'rows/s':>12}")
+    baseline = None
+    for mode in ("orm", "executemany", "insert_select"):
+        elapsed, imported = time_confirm(mode, rows)
+        assert len(imported) == rows, f"{mode}: imported {len(imported)} rows"
+        if baseline is None:
+            baseline = imported
+        assert imported == baseline, f"{mode}: transactions differ"
+        print(f"{mode:<16}{elapsed:>9.2f}s{rows / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
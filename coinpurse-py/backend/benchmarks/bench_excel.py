@@ -0,0 +1,122 @@
+"""
+Benchmark: pandas.read_excel vs the streaming Excel readers
+
+Writes a synthetic bank export workbook with a few columns no template maps
+and parses it with:
+
+- "read_excel": ExcelParser(fast=False), every cell through pandas/openpyxl
+- "openpyxl": the read-only streaming reader, mapped columns only
+- "calamine": the same with python-calamine, if it is installed
+
+Each fast path is checked against read_excel for identical output.
+
+Usage: python -m benchmarks.bench_excel [rows]
+"""
+
+import io
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import openpyxl
+
+from services.parsers import ExcelParser
+from services.parsers.excel_parser import CalamineWorkbook
+
+CONFIG = {
+    "column_mappings": {
+        "transaction_date": "Transaction Date",
+        "posted_date": "Post Date",
+        "description": "Description",
+        "category": "Category",
+        "amount": "Amount",
+    },
+    "amount_config": {"sign_convention": "bank_standard", "decimal_places": 2},
+}
+
+HEADER = [
+    "Card No.",
+    "Transaction Date",
+    "Post Date",
+    "Description",
+    "Category",
+    "Type",
+    "Amount",
+    "Memo",
+    "Reference",
+]
+
+MERCHANTS = ["AMAZON MKTP", "STARBUCKS #1234", "SHELL OIL", "PAYROLL", "NETFLIX"]
+CATEGORIES = ["Shopping", "Food & Drink", "Gas", None, "Entertainment"]
+
+
+def make_workbook(rows: int, seed: int = 42) -> bytes:
+    """A one-sheet .xlsx export with text dates and numeric amounts"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+
+    # Not write_only: Excel itself stores text in the shared string table,
+    # write_only mode would inline every string instead
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Transactions"
+    sheet.append(HEADER)
+    for i in range(rows):
+        day = start + timedelta(days=rng.randrange(730))
+        text = day.strftime("%m/%d/%Y")
+        cents = rng.randrange(-50_000, 50_000)
+        sheet.append(
+            [
+                "1111",
+                text,
+                text,
+                f"{rng.choice(MERCHANTS)} {rng.randrange(100)}",
+                rng.choice(CATEGORIES),
+                "Sale" if cents < 0 else "Payment",
+                cents / 100,
+                "",
+                f"REF{i:08d}",
+            ]
+        )
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def timed(parser: ExcelParser, content: bytes) -> tuple[float, list]:
+    started = time.perf_counter()
+    rows = parser.parse(io.BytesIO(content))
+    return time.perf_counter() - started, rows
+
+
+def main(rows: int = 100_000) -> None:
+    content = make_workbook(rows)
+    parsers = {
+        "read_excel": ExcelParser(**CONFIG, fast=False),
+        "openpyxl": ExcelParser(**CONFIG, engine="openpyxl"),
+    }
+    if CalamineWorkbook is not None:
+        parsers["calamine"] = ExcelParser(**CONFIG, engine="calamine")
+
+    print(f"Excel parsing, {rows:,} rows x {len(HEADER)} columns")
+    print(f"workbook: {len(content) / 1e6:.1f} MB\n")
+
+    baseline_time, baseline = None, None
+    for name, parser in parsers.items():
+        elapsed, parsed = timed(parser, content)
+        if baseline is None:
+            baseline_time, baseline = elapsed, parsed
+            print(f"{name:<12}{elapsed:>8.2f}s")
+            continue
+        same = parsed == baseline
+        print(
+            f"{name:<12}{elapsed:>8.2f}s  {baseline_time / elapsed:>5.1f}x"
+            f"  identical: {same}"
+        )
+    if CalamineWorkbook is None:
+        print("calamine    skipped (install the excel-fast extra)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,103 @@
+"""
+Benchmark: memory and lookup cost of duplicate-detection sets
+
+Builds the same synthetic account history three ways and measures the
+memory each holds with tracemalloc:
+
+- "hash set": set of TransactionHash, what the detector cached before fingerprints
+- "int set": set of 64-bit fingerprints, the cache's non-compact mode
+- "packed": PackedFingerprints, the cache's compact mode
+
+Usage: python -m benchmarks.bench_fingerprints [transactions]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from models import transaction_fingerprint
+from models.transaction import direction_of
+from services.duplicate_detector import TransactionHash
+from services.fingerprint_cache import PackedFingerprints, contains_many
+
+MERCHANTS = [
+    "AMAZON MKTPLACE PMTS",
+    "STARBUCKS STORE 01234",
+    "SHELL OIL 57444",
+    "WHOLE FOODS MARKET #10",
+    "NETFLIX.COM",
+    "UBER TRIP HELP.UBER.COM",
+]
+
+
+def make_rows(count: int, seed: int = 42) -> list[tuple[date, str, int]]:
+    """Synthetic (date, description, amount) history for one account"""
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    return [
+        (
+            start + timedelta(days=rng.randrange(365 * 10)),
+            f"{rng.choice(MERCHANTS)} {rng.randrange(10_000)}",
+            rng.randrange(-50_000, 20_000),
+        )
+        for _ in range(count)
+    ]
+
+
+def fingerprint(txn_date: date, description: str, amount: int) -> int:
+    return transaction_fingerprint(
+        1, txn_date, description, direction_of(amount), amount
+    )
+
+
+def measure(build: Callable[[], object]) -> tuple[object, int, float]:
+    """Build a structure, returning it with the bytes it holds and build time"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - started
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, size, elapsed
+
+
+def main(count: int = 200_000) -> None:
+    rows = make_rows(count)
+    # Half the probes exist, half do not
+    probe_rows = make_rows(count // 2, seed=7) + rows[: count // 2]
+    probes = [TransactionHash.from_columns(1, *row) for row in probe_rows]
+    probe_fingerprints = [fingerprint(*row) for row in probe_rows]
+
+    # Each structure is built from the raw columns, as when loaded from the DB
+    builders = {
+        "hash set": lambda: {TransactionHash.from_columns(1, *row) for row in rows},
+        "int set": lambda: {fingerprint(*row) for row in rows},
+        "packed": lambda: PackedFingerprints(fingerprint(*row) for row in rows),
+    }
+
+    print(f"Duplicate sets for {count:,} transactions, {len(probes):,} lookups\n")
+    print(
+        f"{'structure':<12}{'memory':>12}{'bytes/row':>12}{'build':>10}{'lookup':>10}"
+    )
+    for name, build in builders.items():
+        built, size, build_time = measure(build)
+
+        started = time.perf_counter()
+        if name == "hash set":
+            hits = sum(h in built for h in probes)
+        else:
+            hits = sum(contains_many(built, probe_fingerprints))
+        lookup_time = time.perf_counter() - started
+
+        assert hits >= count // 2, f"{name}: found {hits} of {count // 2}"
+        print(
+            f"{name:<12}{size / 1024 / 1024:>10.1f}MB{size / count:>12.0f}"
+            f"{build_time:>9.2f}s{lookup_time:>9.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,123 @@
+"""
+Benchmark: row-wise vs vectorized DataFrame processing in BaseParser
+
+Generates a synthetic bank export for each sign convention, parses it with
+both paths, checks that the output is identical and prints the timings.
+
+Usage: python -m benchmarks.bench_parsers [rows]
+"""
+
+import io
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from services.parsers import CsvParser
+
+CONFIGS = {
+    "bank_standard": {
+        "column_mappings": {
+            "transaction_date": "Transaction Date",
+            "posted_date": "Post Date",
+            "description": "Description",
+            "category": "Category",
+            "amount": "Amount",
+        },
+        "amount_config": {"sign_convention": "bank_standard", "decimal_places": 2},
+    },
+    "inverted": {
+        "column_mappings": {
+            "transaction_date": "Transaction Date",
+            "posted_date": "Post Date",
+            "description": "Description",
+            "category": "Category",
+            "amount": "Amount",
+        },
+        "amount_config": {"sign_convention": "inverted", "decimal_places": 2},
+    },
+    "split_columns": {
+        "column_mappings": {
+            "transaction_date": "Transaction Date",
+            "posted_date": "Post Date",
+            "description": "Description",
+            "category": "Category",
+            "debit": "Debit",
+            "credit": "Credit",
+        },
+        "amount_config": {
+            "sign_convention": "split_columns",
+            "debit_column": "Debit",
+            "credit_column": "Credit",
+            "decimal_places": 2,
+        },
+    },
+    "amount_with_type_column": {
+        "column_mappings": {
+            "transaction_date": "Transaction Date",
+            "posted_date": "Post Date",
+            "description": "Description",
+            "category": "Category",
+            "amount": "Amount",
+            "transaction_type": "Type",
+        },
+        "amount_config": {
+            "sign_convention": "amount_with_type_column",
+            "credit_indicator": "credit",
+            "decimal_places": 2,
+        },
+    },
+}
+
+MERCHANTS = ["AMAZON MKTPLACE", "STARBUCKS #1234", "SHELL OIL", "WHOLE FOODS"]
+CATEGORIES = ["Shopping", "Food & drink", "Gas", "Groceries", "Entertainment", ""]
+
+
+def make_csv(rows: int, seed: int = 42) -> bytes:
+    """Build a synthetic export with every column any convention needs"""
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    lines = ["Transaction Date,Post Date,Description,Category,Type,Amount,Debit,Credit"]
+    for _ in range(rows):
+        txn_date = start + timedelta(days=rng.randrange(365 * 5))
+        post_date = txn_date + timedelta(days=rng.randrange(3))
+        cents = rng.randrange(-50_000, 20_000)
+        amount = f"{cents / 100:.2f}"
+        debit = f"{-cents / 100:.2f}" if cents < 0 else ""
+        credit = f"{cents / 100:.2f}" if cents >= 0 else ""
+        txn_type = "Credit" if cents >= 0 else "Debit"
+        lines.append(
+            f"{txn_date:%m/%d/%Y},{post_date:%m/%d/%Y},{rng.choice(MERCHANTS)},"
+            f"{rng.choice(CATEGORIES)},{txn_type},{amount},{debit},{credit}"
+        )
+    return "\n".join(lines).encode("utf-8")
+
+
+def time_parse(data: bytes, config: dict, vectorized: bool) -> tuple[float, list]:
+    parser = CsvParser(
+        column_mappings=config["column_mappings"],
+        amount_config=config["amount_config"],
+        date_format="%m/%d/%Y",
+        vectorized=vectorized,
+    )
+    started = time.perf_counter()
+    rows = parser.parse(io.BytesIO(data))
+    return time.perf_counter() - started, rows
+
+
+def main(rows: int = 50_000) -> None:
+    data = make_csv(rows)
+    print(f"Parsing {rows:,} rows ({len(data) / 1_000_000:.1f} MB)\n")
+    print(f"{'convention':<26}{'row-wise':>12}{'vectorized':>12}{'speedup':>10}")
+    for name, config in CONFIGS.items():
+        row_wise_time, row_wise = time_parse(data, config, vectorized=False)
+        vectorized_time, vectorized = time_parse(data, config, vectorized=True)
+        assert vectorized == row_wise, f"{name}: outputs differ"
+        print(
+            f"{name:<26}{row_wise_time:>11.3f}s{vectorized_time:>11.3f}s"
+            f"{row_wise_time / vectorized_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
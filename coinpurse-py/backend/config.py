@@ -0,0 +1,67 @@
+"""
+Application configuration for CoinPurse.
+Each value can be overridden with an environment variable (or a .env file).
+"""
+
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Largest request body accepted by the import upload endpoint
+MAX_UPLOAD_BYTES = int(os.getenv("COINPURSE_MAX_UPLOAD_BYTES", 50 * 1024 * 1024))
+
+# Where uploads wait on disk until their background import job has run
+IMPORT_JOB_DIR = Path(
+    os.getenv(
+        "COINPURSE_IMPORT_JOB_DIR", Path(__file__).resolve().parent / "import_jobs"
+    )
+)
+
+# Content-addressed store of uploaded import files and their memoized parses
+IMPORT_FILE_DIR = Path(
+    os.getenv(
+        "COINPURSE_IMPORT_FILE_DIR", Path(__file__).resolve().parent / "import_files"
+    )
+)
+
+# Number of import jobs run concurrently (SQLite allows one writer at a time)
+IMPORT_JOB_WORKERS = int(os.getenv("COINPURSE_IMPORT_JOB_WORKERS", 1))
+
+# Worker processes used to parse files of a bulk upload in parallel
+IMPORT_PARSE_WORKERS = int(
+    os.getenv("COINPURSE_IMPORT_PARSE_WORKERS", min(os.cpu_count() or 1, 8))
+)
+
+# Rows of a preview returned with the upload response and per page by default
+PREVIEW_PAGE_SIZE = int(os.getenv("COINPURSE_PREVIEW_PAGE_SIZE", 100))
+
+# Seconds between runs of the stale preview reaper; 0 turns it off
+PREVIEW_REAP_INTERVAL_SECONDS = float(
+    os.getenv("COINPURSE_PREVIEW_REAP_INTERVAL_SECONDS", 60 * 60)
+)
+
+# Previews not confirmed within this many hours are deleted by the reaper
+PREVIEW_MAX_AGE_HOURS = int(os.getenv("COINPURSE_PREVIEW_MAX_AGE_HOURS", 24))
+
+# Rows a confirm imports between commits; an interrupted confirm keeps them
+CONFIRM_COMMIT_ROWS = int(os.getenv("COINPURSE_CONFIRM_COMMIT_ROWS", 5000))
+
+# Seconds between updates on a background job's event stream
+JOB_EVENT_INTERVAL = float(os.getenv("COINPURSE_JOB_EVENT_INTERVAL", 0.5))
+
+# A job event stream whose job shows no change for this many seconds ends
+# with an "error" event, so a stuck job does not hold the connection forever
+JOB_EVENT_STALL_SECONDS = float(os.getenv("COINPURSE_JOB_EVENT_STALL_SECONDS", 300))
+
+# Memory budget for the process-wide duplicate-detection fingerprint cache
+FINGERPRINT_CACHE_BYTES = int(
+    os.getenv("COINPURSE_FINGERPRINT_CACHE_BYTES", 64 * 1024 * 1024)
+)
+
+# Pack cached fingerprints into int64 arrays (8 bytes each) instead of int sets
+FINGERPRINT_CACHE_COMPACT = os.getenv(
+    "COINPURSE_FINGERPRINT_CACHE_COMPACT", "true"
+).lower() in ("1", "true", "yes")
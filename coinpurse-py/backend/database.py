@@ -5,7 +5,7 @@ This module sets up the SQLite database, creates tables, and seeds initial data.
 
 from pathlib import Path
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import bindparam, create_engine, inspect, select, text, update
 from sqlalchemy.orm import sessionmaker
 
 from models import (
@@ -16,7 +16,10 @@ from models import (
     FileFormat,
     ImportTemplate,
     Institution,
+    Transaction,
+    transaction_fingerprint,
 )
+from models.transaction import direction_of
 
 BASE_DIR = Path(__file__).resolve().parent
 DATABASE_PATH = BASE_DIR / "coinpurse.db"
@@ -30,13 +33,141 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Transactions fingerprinted per UPDATE when backfilling an older database
+BACKFILL_CHUNK_SIZE = 5000
+
 
 def init_db():
     """Create all tables in the database"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    _add_fingerprint_columns()
+    _add_content_hash_column()
+    _add_all_sheets_column()
+    _add_category_override_column()
     print("Completed creating database tables.")
     seed_data()
+    _backfill_fingerprints()
+
+
+def _add_fingerprint_columns():
+    """Add the fingerprint columns to databases created before they existed"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in ("transactions", "import_staging_rows"):
+            columns = {c["name"] for c in inspector.get_columns(table)}
+            if "fingerprint" not in columns:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN fingerprint BIGINT"))
+                print(f"Added fingerprint column to '{table}'.")
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_transactions_fingerprint "
+                "ON transactions (fingerprint)"
+            )
+        )
+
+
+def _add_content_hash_column():
+    """Add import_batches.content_hash to databases created before it existed"""
+    columns = {c["name"] for c in inspect(engine).get_columns("import_batches")}
+    with engine.begin() as conn:
+        if "content_hash" not in columns:
+            conn.execute(
+                text("ALTER TABLE import_batches ADD COLUMN content_hash VARCHAR(64)")
+            )
+            print("Added content_hash column to 'import_batches'.")
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_import_batches_content_hash "
+                "ON import_batches (content_hash)"
+            )
+        )
+
+
+def _add_all_sheets_column():
+    """Add import_templates.all_sheets to databases created before it existed"""
+    columns = {c["name"] for c in inspect(engine).get_columns("import_templates")}
+    if "all_sheets" not in columns:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "ALTER TABLE import_templates "
+                    "ADD COLUMN all_sheets BOOLEAN NOT NULL DEFAULT 0"
+                )
+            )
+        print("Added all_sheets column to 'import_templates'.")
+
+
+def _add_category_override_column():
+    """Add import_staging_rows.has_category_override to older databases"""
+    columns = {c["name"] for c in inspect(engine).get_columns("import_staging_rows")}
+    if "has_category_override" not in columns:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "ALTER TABLE import_staging_rows "
+                    "ADD COLUMN has_category_override BOOLEAN NOT NULL DEFAULT 0"
+                )
+            )
+        print("Added has_category_override column to 'import_staging_rows'.")
+
+
+def _backfill_fingerprints():
+    """Compute fingerprints for transactions stored without one"""
+    # Page through only the hashed columns by id and write each chunk with one
+    # executemany. Each page is fetched in full before it is updated, so no
+    # SELECT on the table is still open while its rows change.
+    missing = (
+        select(
+            Transaction.transaction_id,
+            Transaction.account_id,
+            Transaction.transaction_date,
+            Transaction.description,
+            Transaction.amount,
+        )
+        .where(Transaction.fingerprint.is_(None))
+        .order_by(Transaction.transaction_id)
+        .limit(BACKFILL_CHUNK_SIZE)
+    )
+    table = Transaction.__table__
+    set_fingerprint = (
+        update(table)
+        .where(table.c.transaction_id == bindparam("b_transaction_id"))
+        .values(fingerprint=bindparam("b_fingerprint"))
+    )
+
+    db = SessionLocal()
+    try:
+        backfilled = 0
+        last_id = 0
+        while rows := db.execute(
+            missing.where(Transaction.transaction_id > last_id)
+        ).all():
+            db.execute(
+                set_fingerprint,
+                [
+                    {
+                        "b_transaction_id": row.transaction_id,
+                        "b_fingerprint": transaction_fingerprint(
+                            row.account_id,
+                            row.transaction_date,
+                            row.description,
+                            direction_of(row.amount),
+                            row.amount,
+                        ),
+                    }
+                    for row in rows
+                ],
+            )
+            backfilled += len(rows)
+            last_id = rows[-1].transaction_id
+        if not backfilled:
+            return
+
+        db.commit()
+        print(f"Backfilled fingerprints for {backfilled} transactions.")
+    finally:
+        db.close()
 
 
 def seed_data():
@@ -299,6 +430,8 @@ def _seed_settings(db):
     """Seed default application settings"""
     defaults = [
         ("balance_checkin_frequency_days", "7"),
+        ("duplicate_date_tolerance_days", "0"),
+        ("duplicate_match_posted_date", "false"),
     ]
 
     for key, value in defaults:
@@ -3,6 +3,9 @@ Main FastAPI application entry point
 Run with: uvicorn main:app --reload --port 8000
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from scalar_fastapi import AgentScalarConfig, get_scalar_api_reference
@@ -14,12 +17,35 @@ from routers.import_router import router as import_router
 from routers.institutions_router import router as institutions_router
 from routers.settings_router import router as settings_router
 from routers.transactions_router import router as transactions_router
+from services.import_job_runner import get_import_job_runner
+from services.parsers.parallel import shutdown_parse_executor
+from services.preview_reaper import get_preview_reaper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Resume import jobs interrupted by the last shutdown and start reaping
+    stale previews; stop workers on exit
+    """
+    runner = app.dependency_overrides.get(
+        get_import_job_runner, get_import_job_runner
+    )()
+    runner.resume_unfinished()
+    reaper = app.dependency_overrides.get(get_preview_reaper, get_preview_reaper)()
+    reaper.start()
+    yield
+    reaper.stop()
+    runner.shutdown()
+    shutdown_parse_executor()
+
 
 # FastAPI application instance
 app = FastAPI(
     title="CoinPurse API",
     description="Personal finance tracking application",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS for Svelte frontend
@@ -2,8 +2,20 @@
 This file makes 'models' a package and exposes all models for easy import.
 """
 
+# isort: skip_file
+# Imports follow foreign key dependency order rather than the alphabet
+
 # first import base (no dependencies)
-from .base import AccountType, Base, FileFormat, ImportStatus, TaxTreatmentType, TransactionType
+from .base import (
+    AccountType,
+    Base,
+    FileFormat,
+    ImportStatus,
+    JobStatus,
+    JobType,
+    TaxTreatmentType,
+    TransactionType,
+)
 
 # import models with no foreign keys first
 from .app_setting import AppSetting
@@ -17,11 +29,17 @@ from .category_mapping import CategoryMapping
 # import models that depend on Institution and ImportTemplate
 from .account import Account
 from .balance import AccountBalance
-from .transaction import Transaction
+from .transaction import Transaction, transaction_fingerprint
 
 # import models that depend on Account and ImportTemplate
 from .import_batch import ImportBatch
 
+# import models that depend on ImportBatch
+from .import_staging_row import ImportStagingRow
+
+# import models that depend on Account and ImportBatch
+from .background_job import BackgroundJob
+
 # Export everything so you can do: from models import Institution, Account, etc.
 __all__ = [
     "Base",
@@ -30,13 +48,18 @@ __all__ = [
     "TransactionType",
     "FileFormat",
     "ImportStatus",
+    "JobType",
+    "JobStatus",
     "AppSetting",
     "Institution",
     "Account",
     "Category",
     "Transaction",
+    "transaction_fingerprint",
     "AccountBalance",
     "ImportTemplate",
     "CategoryMapping",
     "ImportBatch",
+    "ImportStagingRow",
+    "BackgroundJob",
 ]
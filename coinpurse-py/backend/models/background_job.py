@@ -0,0 +1,44 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import JSON, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, JobStatus, JobType
+
+
+class BackgroundJob(Base):
+    """Durable record of work (e.g. an import preview or confirm) run off the request"""
+
+    __tablename__ = "background_jobs"
+
+    job_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_type: Mapped[JobType]
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.QUEUED)
+    account_id: Mapped[int | None] = mapped_column(
+        ForeignKey("accounts.account_id"), nullable=True
+    )
+    import_batch_id: Mapped[int | None] = mapped_column(
+        ForeignKey("import_batches.import_batch_id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    file_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Uploaded file kept on disk until the job finishes, so it can be re-run
+    file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    parameters: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    progress_current: Mapped[int] = mapped_column(default=0)
+    progress_total: Mapped[int | None] = mapped_column(nullable=True)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+    modified_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC)
+    )
+
+    def __repr__(self):
+        return (
+            f"<BackgroundJob(id={self.job_id}, type={self.job_type.value}, "
+            f"status={self.status.value})>"
+        )
@@ -53,3 +53,20 @@ class ImportStatus(str, PyEnum):
     PREVIEW = "preview"
     COMPLETED = "completed"
     FAILED = "failed"
+
+
+class JobType(str, PyEnum):
+    """Kinds of background jobs"""
+
+    IMPORT_PREVIEW = "import_preview"
+    IMPORT_CONFIRM = "import_confirm"
+    DUPLICATE_SWEEP = "duplicate_sweep"
+
+
+class JobStatus(str, PyEnum):
+    """Lifecycle state of a background job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -1,7 +1,7 @@
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, ForeignKey, String
+from sqlalchemy import ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, FileFormat, ImportStatus
@@ -23,13 +23,16 @@ class ImportBatch(Base):
         ForeignKey("import_templates.template_id"), nullable=True
     )
     file_name: Mapped[str] = mapped_column(String(255))
+    # SHA-256 of the uploaded file, which is kept in the import file store
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     file_format: Mapped[FileFormat]
     total_rows: Mapped[int] = mapped_column(default=0)
     imported_count: Mapped[int] = mapped_column(default=0)
     skipped_count: Mapped[int] = mapped_column(default=0)
     duplicate_count: Mapped[int] = mapped_column(default=0)
     status: Mapped[ImportStatus] = mapped_column(default=ImportStatus.PREVIEW)
-    parsed_transactions: Mapped[list[dict[str, Any]] | None] = mapped_column(JSON, nullable=True)
     imported_at: Mapped[datetime | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
     modified_at: Mapped[datetime] = mapped_column(
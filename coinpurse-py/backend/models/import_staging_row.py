@@ -0,0 +1,57 @@
+from datetime import date
+
+from sqlalchemy import JSON, BigInteger, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ImportStagingRow(Base):
+    """One parsed row of a PREVIEW import batch, waiting to be confirmed"""
+
+    __tablename__ = "import_staging_rows"
+    __table_args__ = (
+        # Supports the is_duplicate / has_errors counts and filters per batch
+        Index(
+            "ix_import_staging_rows_batch_status",
+            "import_batch_id",
+            "is_duplicate",
+            "has_errors",
+        ),
+        # Supports filtering a batch's rows by category
+        Index(
+            "ix_import_staging_rows_batch_category",
+            "import_batch_id",
+            "coinpurse_category_id",
+        ),
+    )
+
+    import_batch_id: Mapped[int] = mapped_column(
+        ForeignKey("import_batches.import_batch_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    row_number: Mapped[int] = mapped_column(primary_key=True)
+    transaction_date: Mapped[date | None] = mapped_column(nullable=True)
+    posted_date: Mapped[date | None] = mapped_column(nullable=True)
+    description: Mapped[str] = mapped_column(default="")
+    amount: Mapped[int] = mapped_column(default=0)  # Amount in cents
+    transaction_type: Mapped[str] = mapped_column(String(10))  # CREDIT or DEBIT
+    bank_category: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    coinpurse_category_id: Mapped[int | None] = mapped_column(
+        ForeignKey("categories.category_id"), nullable=True
+    )
+    candidate_category_ids: Mapped[list[int]] = mapped_column(JSON, default=list)
+    # Category picked by the user, kept when the batch is recategorized
+    has_category_override: Mapped[bool] = mapped_column(default=False)
+    is_duplicate: Mapped[bool] = mapped_column(default=False)
+    has_errors: Mapped[bool] = mapped_column(default=False)
+    validation_errors: Mapped[list[str]] = mapped_column(JSON, default=list)
+    # Fingerprint the row will be stored with once imported (see Transaction)
+    fingerprint: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Set from the confirm request just before the selected rows are imported
+    is_selected: Mapped[bool] = mapped_column(default=False)
+
+    def __repr__(self):
+        return (
+            f"<ImportStagingRow(batch={self.import_batch_id}, row={self.row_number})>"
+        )
@@ -24,6 +24,8 @@ class ImportTemplate(Base):
     amount_config: Mapped[dict[str, Any]] = mapped_column(JSON)
     header_row: Mapped[int] = mapped_column(default=1)
     skip_rows: Mapped[int] = mapped_column(default=0)
+    # Excel only: read every sheet whose header row has the mapped columns
+    all_sheets: Mapped[bool] = mapped_column(default=False)
     date_format: Mapped[str] = mapped_column(String(50), default="%m/%d/%Y")
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
@@ -1,7 +1,8 @@
+import hashlib
 from datetime import UTC, date, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import BigInteger, ForeignKey, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TransactionType
@@ -12,10 +13,44 @@ if TYPE_CHECKING:
     from .category import Category
 
 
+def transaction_fingerprint(
+    account_id: int,
+    transaction_date: date,
+    description: str,
+    transaction_type: str,
+    amount: int,
+) -> int:
+    """
+    64-bit fingerprint of the fields used for duplicate detection
+
+    Args:
+        account_id: Account ID
+        transaction_date: Transaction date
+        description: Description (normalized here: lowercase, trimmed)
+        transaction_type: Direction, CREDIT or DEBIT
+        amount: Amount in cents
+
+    Returns:
+        Signed 64-bit integer, so it fits an SQLite INTEGER column
+    """
+    key = (
+        f"{account_id}|{transaction_date.isoformat()}|"
+        f"{description.lower().strip()}|{transaction_type}|{amount}"
+    )
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def direction_of(amount: int) -> str:
+    """Direction of a stored amount: CREDIT for money in, DEBIT for money out"""
+    return "CREDIT" if amount >= 0 else "DEBIT"
+
+
 class Transaction(Base):
     """Individual transactions for checking/credit card accounts"""
 
     __tablename__ = "transactions"
+    __table_args__ = (Index("ix_transactions_fingerprint", "fingerprint"),)
 
     transaction_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.account_id"))
@@ -28,6 +63,8 @@ class Transaction(Base):
     notes: Mapped[str]
     imported_date: Mapped[datetime | None] = mapped_column(nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
+    # Duplicate-detection fingerprint, kept current on insert and update
+    fingerprint: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
     modified_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC)
@@ -39,3 +76,20 @@ class Transaction(Base):
 
     def __repr__(self):
         return f"<Transaction(id={self.transaction_id}, amount=${self.amount / 100:.2f}, desc='{self.description[:30]}')>"
+
+    def compute_fingerprint(self) -> int:
+        """Fingerprint of this transaction's current duplicate-detection fields"""
+        return transaction_fingerprint(
+            self.account_id,
+            self.transaction_date,
+            self.description,
+            direction_of(self.amount),
+            self.amount,
+        )
+
+
+@event.listens_for(Transaction, "before_insert")
+@event.listens_for(Transaction, "before_update")
+def _set_fingerprint(mapper, connection, target: Transaction) -> None:
+    """Keep the stored fingerprint in step with the fields it is built from"""
+    target.fingerprint = target.compute_fingerprint()
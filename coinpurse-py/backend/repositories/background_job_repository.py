@@ -0,0 +1,83 @@
+"""
+Repository layer for BackgroundJob model
+Handles all database operations for background jobs
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.background_job import BackgroundJob
+from models.base import JobStatus
+
+
+class BackgroundJobRepository:
+    """Repository for BackgroundJob database operations"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, job_id: int) -> BackgroundJob | None:
+        """Get job by ID"""
+        return self.db.get(BackgroundJob, job_id)
+
+    def get_unfinished(self) -> list[BackgroundJob]:
+        """Get all QUEUED or RUNNING jobs, oldest first"""
+        stmt = (
+            select(BackgroundJob)
+            .where(BackgroundJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+            .order_by(BackgroundJob.job_id)
+        )
+        return list(self.db.scalars(stmt))
+
+    def create(self, job: BackgroundJob) -> BackgroundJob:
+        """Create a new job"""
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def update(self, job: BackgroundJob) -> BackgroundJob:
+        """Update an existing job"""
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def mark_running(self, job: BackgroundJob) -> BackgroundJob:
+        """Mark a job as started"""
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(UTC)
+        return self.update(job)
+
+    def mark_completed(
+        self,
+        job: BackgroundJob,
+        result: dict[str, Any],
+        import_batch_id: int | None,
+        progress: tuple[int, int | None] | None = None,
+    ) -> BackgroundJob:
+        """
+        Mark a job as completed with its result
+
+        Args:
+            job: The job to update
+            result: JSON-serializable result payload
+            import_batch_id: The batch created or confirmed by the job
+            progress: Final (current, total) progress, if known
+        """
+        job.status = JobStatus.COMPLETED
+        job.result = result
+        job.import_batch_id = import_batch_id
+        if progress is not None:
+            job.progress_current, job.progress_total = progress
+        job.finished_at = datetime.now(UTC)
+        return self.update(job)
+
+    def mark_failed(self, job: BackgroundJob, error: str) -> BackgroundJob:
+        """Mark a job as failed with an error message"""
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.finished_at = datetime.now(UTC)
+        return self.update(job)
@@ -3,12 +3,14 @@ Repository layer for AccountBalance model
 Handles all database operations for account balances
 """
 
+from collections.abc import Sequence
 from datetime import date
 
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
 from models.balance import AccountBalance
+from repositories.bulk import bulk_set_active
 
 
 class BalanceRepository:
@@ -132,6 +134,33 @@ class BalanceRepository:
         balance.is_active = False
         return self.update(balance)
 
+    def bulk_soft_delete(self, balance_ids: Sequence[int]) -> int:
+        """
+        Soft delete many balances in one UPDATE
+
+        Does not commit.
+
+        Returns:
+            Number of balances deactivated
+        """
+        return bulk_set_active(
+            self.db, AccountBalance.balance_id, balance_ids, is_active=False
+        )
+
+    def bulk_restore(self, balance_ids: Sequence[int]) -> int:
+        """
+        Restore many soft-deleted balances in one UPDATE
+
+        Does not commit. The one-balance-per-account-per-date constraint
+        means a restored balance never conflicts with an active one.
+
+        Returns:
+            Number of balances reactivated
+        """
+        return bulk_set_active(
+            self.db, AccountBalance.balance_id, balance_ids, is_active=True
+        )
+
     def hard_delete(self, balance: AccountBalance) -> None:
         """Permanently delete a balance (use with caution!)"""
         self.db.delete(balance)
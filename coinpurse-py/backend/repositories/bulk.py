@@ -0,0 +1,46 @@
+"""
+Set-based helpers shared by the repositories
+Soft deletes and restores many rows with one UPDATE instead of loading and
+changing each ORM object
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+
+def bulk_set_active(
+    db: Session,
+    id_column: InstrumentedAttribute[Any],
+    ids: Sequence[int],
+    is_active: bool,
+) -> int:
+    """
+    Set is_active on many rows of a soft-deletable model in one UPDATE
+
+    Does not commit, and bypasses ORM events: callers invalidate any cached
+    state derived from the rows themselves. Rows already in the requested
+    state are left untouched, so their modified_at is kept.
+
+    Args:
+        db: Session to execute in
+        id_column: Primary key column of the model (e.g. Transaction.transaction_id)
+        ids: Primary keys of the rows to change
+        is_active: False to soft delete, True to restore
+
+    Returns:
+        Number of rows changed
+    """
+    if not ids:
+        return 0
+
+    model = id_column.class_
+    result = db.execute(
+        update(model)
+        .where(id_column.in_(ids), model.is_active.is_(not is_active))
+        .values(is_active=is_active, modified_at=datetime.now(UTC))
+    )
+    return result.rowcount
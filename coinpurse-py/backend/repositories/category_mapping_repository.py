@@ -3,7 +3,9 @@ Repository layer for CategoryMapping model
 Handles all database operations for category mappings
 """
 
-from sqlalchemy import select
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
 from models.category_mapping import CategoryMapping
@@ -159,9 +161,15 @@ class CategoryMappingRepository:
         desired_cat_ids = set(coinpurse_category_ids)
 
         # Delete mappings no longer in the desired set
-        for m in existing:
-            if m.coinpurse_category_id not in desired_cat_ids:
-                self.db.delete(m)
+        if existing_cat_ids - desired_cat_ids:
+            self.db.execute(
+                delete(CategoryMapping).where(
+                    CategoryMapping.institution_id == institution_id,
+                    CategoryMapping.bank_category_name == lookup_name,
+                    CategoryMapping.is_active,
+                    CategoryMapping.coinpurse_category_id.not_in(desired_cat_ids),
+                )
+            )
 
         # Update retained mappings if name changed
         if old_bank_category_name and old_bank_category_name != bank_category_name:
@@ -183,23 +191,42 @@ class CategoryMappingRepository:
         # Return the updated group
         return self.get_active_by_group(institution_id, bank_category_name)
 
-    def soft_delete_group(self, institution_id: int, bank_category_name: str) -> None:
-        """Soft-delete all active mappings in a group by setting is_active=False"""
+    def soft_delete_group(self, institution_id: int, bank_category_name: str) -> int:
+        """
+        Soft-delete all active mappings in a group by setting is_active=False
+
+        Returns:
+            Number of mappings deactivated
+        """
         # Only targets active mappings — inactive ones are already soft-deleted
-        for m in self.get_active_by_group(institution_id, bank_category_name):
-            m.is_active = False
+        result = self.db.execute(
+            update(CategoryMapping)
+            .where(
+                CategoryMapping.institution_id == institution_id,
+                CategoryMapping.bank_category_name == bank_category_name,
+                CategoryMapping.is_active,
+            )
+            .values(is_active=False, modified_at=datetime.now(UTC))
+        )
         self.db.commit()
+        return result.rowcount
 
-    def delete_group(self, institution_id: int, bank_category_name: str) -> None:
-        """Permanently remove all mappings (active and inactive) in a group"""
-        # Queries without is_active filter so previously soft-deleted rows are also removed
-        stmt = select(CategoryMapping).where(
-            CategoryMapping.institution_id == institution_id,
-            CategoryMapping.bank_category_name == bank_category_name,
+    def delete_group(self, institution_id: int, bank_category_name: str) -> int:
+        """
+        Permanently remove all mappings (active and inactive) in a group
+
+        Returns:
+            Number of mappings deleted
+        """
+        # No is_active filter so previously soft-deleted rows are also removed
+        result = self.db.execute(
+            delete(CategoryMapping).where(
+                CategoryMapping.institution_id == institution_id,
+                CategoryMapping.bank_category_name == bank_category_name,
+            )
         )
-        for m in self.db.scalars(stmt):
-            self.db.delete(m)
         self.db.commit()
+        return result.rowcount
 
     def mapping_exists(
         self,
@@ -3,13 +3,24 @@ Repository layer for ImportBatch model
 Handles all database operations for import batches
 """
 
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
 
 from models.base import ImportStatus
 from models.import_batch import ImportBatch
+from models.import_staging_row import ImportStagingRow
+
+
+@dataclass(frozen=True)
+class ReapedPreviews:
+    """What deleting stale preview batches reclaimed"""
+
+    batches: int = 0
+    rows: int = 0  # Staged rows deleted with the batches
+    bytes: int = 0  # Text and JSON data held by those staged rows
 
 
 class ImportBatchRepository:
@@ -64,10 +75,39 @@ class ImportBatchRepository:
         )
         return list(self.db.scalars(stmt))
 
+    def get_completed_by_content_hash(
+        self, account_id: int, content_hash: str
+    ) -> ImportBatch | None:
+        """
+        Get the most recent completed import of a file into an account
+
+        Args:
+            account_id: The account the file was imported into
+            content_hash: SHA-256 of the file's content
+        """
+        stmt = (
+            select(ImportBatch)
+            .where(
+                ImportBatch.account_id == account_id,
+                ImportBatch.content_hash == content_hash,
+                ImportBatch.status == ImportStatus.COMPLETED,
+            )
+            .order_by(ImportBatch.imported_at.desc())
+            .limit(1)
+        )
+        return self.db.scalar(stmt)
+
     def get_pending_previews(self, limit: int = 100) -> list[ImportBatch]:
         """Get all batches in PREVIEW status (not yet confirmed)"""
         return self.get_by_status(ImportStatus.PREVIEW, limit)
 
+    def get_content_hashes(self) -> set[str]:
+        """Content hashes of the stored files that existing batches were read from"""
+        stmt = select(ImportBatch.content_hash).where(
+            ImportBatch.content_hash.is_not(None)
+        )
+        return set(self.db.scalars(stmt))
+
     def create(self, batch: ImportBatch) -> ImportBatch:
         """Create a new import batch"""
         self.db.add(batch)
@@ -98,17 +138,17 @@ class ImportBatchRepository:
         batch.skipped_count = skipped_count
         batch.duplicate_count = duplicate_count
         batch.imported_at = datetime.now(UTC)
-        batch.parsed_transactions = None  # Clear parsed data after import
         return self.update(batch)
 
     def mark_failed(self, batch: ImportBatch) -> ImportBatch:
         """Mark a batch as failed"""
         batch.status = ImportStatus.FAILED
-        batch.parsed_transactions = None  # Clear parsed data on failure
+        self._delete_staged_rows(batch.import_batch_id)
         return self.update(batch)
 
     def delete(self, batch: ImportBatch) -> None:
-        """Permanently delete a batch"""
+        """Permanently delete a batch and its staged rows"""
+        self._delete_staged_rows(batch.import_batch_id)
         self.db.delete(batch)
         self.db.commit()
 
@@ -126,13 +166,56 @@ class ImportBatchRepository:
         Returns:
             Number of batches deleted
         """
+        return self.reap_old_previews(hours).batches
+
+    def reap_old_previews(self, hours: int = 24) -> ReapedPreviews:
+        """
+        Delete preview batches older than specified hours, measuring them first
+
+        Nothing is loaded into the session: the staged rows are sized with
+        one aggregate query, then rows and batches go with one DELETE each.
+
+        Args:
+            hours: Delete previews older than this many hours
+
+        Returns:
+            The batches, staged rows and bytes of row data deleted
+        """
         cutoff = datetime.now(UTC) - timedelta(hours=hours)
-        stmt = select(ImportBatch).where(
+        old_batch_ids = select(ImportBatch.import_batch_id).where(
             ImportBatch.status == ImportStatus.PREVIEW, ImportBatch.created_at < cutoff
         )
-        old_batches = list(self.db.scalars(stmt))
-        count = len(old_batches)
-        for batch in old_batches:
-            self.db.delete(batch)
+
+        s = ImportStagingRow
+        row_bytes = sum(
+            func.coalesce(func.length(column), 0)
+            for column in (
+                s.description,
+                s.bank_category,
+                s.candidate_category_ids,
+                s.validation_errors,
+            )
+        )
+        row_count, byte_count = self.db.execute(
+            select(func.count(), func.coalesce(func.sum(row_bytes), 0)).where(
+                s.import_batch_id.in_(old_batch_ids)
+            )
+        ).one()
+
+        # Staged rows first, then the batches themselves, one statement each
+        self.db.execute(delete(s).where(s.import_batch_id.in_(old_batch_ids)))
+        result = self.db.execute(
+            delete(ImportBatch).where(ImportBatch.import_batch_id.in_(old_batch_ids))
+        )
         self.db.commit()
-        return count
+        return ReapedPreviews(
+            batches=result.rowcount, rows=row_count, bytes=int(byte_count)
+        )
+
+    def _delete_staged_rows(self, import_batch_id: int) -> None:
+        """Delete the staged preview rows of a batch (not committed)"""
+        self.db.execute(
+            delete(ImportStagingRow).where(
+                ImportStagingRow.import_batch_id == import_batch_id
+            )
+        )
@@ -0,0 +1,519 @@
+"""
+Repository layer for ImportStagingRow model
+Handles all database operations for preview rows awaiting confirmation
+"""
+
+from collections.abc import Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    Select,
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from models.base import TransactionType
+from models.import_staging_row import ImportStagingRow
+from models.transaction import Transaction
+
+# imports the pipeline's batch type only during type checking
+if TYPE_CHECKING:
+    from services.parsers import ParsedBatch
+
+
+class ImportStagingRepository:
+    """Repository for ImportStagingRow database operations"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_row(self, import_batch_id: int, row_number: int) -> ImportStagingRow | None:
+        """Get a single staged row by its key"""
+        return self.db.get(ImportStagingRow, (import_batch_id, row_number))
+
+    def get_page(
+        self,
+        import_batch_id: int,
+        offset: int = 0,
+        limit: int = 100,
+        after_row: int | None = None,
+        is_duplicate: bool | None = None,
+        has_errors: bool | None = None,
+        category_id: int | None = None,
+    ) -> tuple[list[ImportStagingRow], int, bool]:
+        """
+        Get one page of a batch's rows, in file order
+
+        Args:
+            import_batch_id: The batch to read
+            offset: Number of matching rows to skip
+            limit: Maximum number of rows to return
+            after_row: Keyset cursor; only rows after this row number
+            is_duplicate: Optional filter on the duplicate flag
+            has_errors: Optional filter on whether the row has validation errors
+            category_id: Optional filter on the mapped CoinPurse category
+
+        Returns:
+            (rows, total rows matching the filters, whether more rows follow)
+        """
+        s = ImportStagingRow
+        conditions = [s.import_batch_id == import_batch_id]
+        if is_duplicate is not None:
+            conditions.append(s.is_duplicate.is_(is_duplicate))
+        if has_errors is not None:
+            conditions.append(s.has_errors.is_(has_errors))
+        if category_id is not None:
+            conditions.append(s.coinpurse_category_id == category_id)
+
+        total = self.db.scalar(select(func.count()).select_from(s).where(*conditions))
+
+        if after_row is not None:
+            conditions.append(s.row_number > after_row)
+        stmt = (
+            select(s)
+            .where(*conditions)
+            .order_by(s.row_number)
+            .offset(offset)
+            .limit(limit + 1)  # One extra row tells us whether another page exists
+        )
+        rows = list(self.db.scalars(stmt))
+        return (rows[:limit], total, len(rows) > limit)
+
+    def add_batch(self, import_batch_id: int, batch: "ParsedBatch") -> None:
+        """
+        Insert a parsed batch's rows for a batch in a single executemany
+
+        Reads the batch column by column; does not commit, the caller
+        commits together with the batch.
+
+        Args:
+            import_batch_id: The batch the rows belong to
+            batch: Parsed rows with categories and duplicates already set
+        """
+        if not len(batch):
+            return
+
+        self.db.execute(
+            insert(ImportStagingRow),
+            [
+                {
+                    "import_batch_id": import_batch_id,
+                    "row_number": row_number,
+                    "transaction_date": transaction_date,
+                    "posted_date": posted_date,
+                    "description": description,
+                    "amount": amount,
+                    "transaction_type": transaction_type,
+                    "bank_category": bank_category,
+                    "coinpurse_category_id": coinpurse_category_id,
+                    "candidate_category_ids": candidate_category_ids,
+                    "is_duplicate": is_duplicate,
+                    "has_errors": bool(validation_errors),
+                    "validation_errors": validation_errors,
+                    "fingerprint": fingerprint,
+                    "is_selected": False,
+                }
+                for (
+                    row_number,
+                    transaction_date,
+                    posted_date,
+                    description,
+                    amount,
+                    transaction_type,
+                    bank_category,
+                    coinpurse_category_id,
+                    candidate_category_ids,
+                    is_duplicate,
+                    validation_errors,
+                    fingerprint,
+                ) in zip(
+                    batch.row_numbers,
+                    batch.transaction_dates,
+                    batch.posted_dates,
+                    batch.descriptions,
+                    batch.amounts,
+                    batch.transaction_types,
+                    batch.bank_categories,
+                    batch.coinpurse_category_ids,
+                    batch.candidate_category_ids,
+                    batch.is_duplicate,
+                    batch.validation_errors,
+                    batch.fingerprints,
+                    strict=True,
+                )
+            ],
+        )
+
+    def set_category(
+        self, import_batch_id: int, row_number: int, coinpurse_category_id: int
+    ) -> ImportStagingRow | None:
+        """
+        Change the category of one staged row
+
+        Returns:
+            The updated row, or None if it does not exist
+        """
+        row = self.get_row(import_batch_id, row_number)
+        if row is None:
+            return None
+        row.coinpurse_category_id = coinpurse_category_id
+        row.has_category_override = True
+        self.db.commit()
+        self.db.refresh(row)
+        return row
+
+    def set_categories(self, import_batch_id: int, overrides: dict[int, int]) -> None:
+        """
+        Apply row_number -> coinpurse_category_id overrides in one executemany
+
+        Does not commit.
+        """
+        if not overrides:
+            return
+
+        table = ImportStagingRow.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.import_batch_id == import_batch_id,
+                table.c.row_number == bindparam("b_row_number"),
+            )
+            .values(
+                coinpurse_category_id=bindparam("b_category_id"),
+                has_category_override=True,
+            )
+        )
+        self.db.execute(
+            stmt,
+            [
+                {"b_row_number": row_number, "b_category_id": category_id}
+                for row_number, category_id in overrides.items()
+            ],
+        )
+
+    def get_category_groups(self, import_batch_id: int) -> list[tuple[str, list[int]]]:
+        """
+        Get each bank category of a batch with its stored candidate_category_ids
+
+        Rows of one bank category are always mapped together, so they share
+        their candidates; the batch is grouped by bank category alone and the
+        candidates are read from the group's first row.
+
+        Rows without a bank category are left out; they always map to
+        Uncategorized.
+        """
+        s = ImportStagingRow
+        first_rows = (
+            select(s.bank_category, func.min(s.row_number).label("row_number"))
+            .where(
+                s.import_batch_id == import_batch_id,
+                s.bank_category.is_not(None),
+                s.bank_category != "",
+            )
+            .group_by(s.bank_category)
+            .subquery()
+        )
+        stmt = select(s.bank_category, s.candidate_category_ids).join(
+            first_rows,
+            and_(
+                s.import_batch_id == import_batch_id,
+                s.row_number == first_rows.c.row_number,
+            ),
+        )
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def remap_categories(
+        self, import_batch_id: int, mappings: dict[str, tuple[int, list[int]]]
+    ) -> int:
+        """
+        Re-map every row of a batch with one of the given bank categories
+
+        Rows whose category the user picked keep it; only their candidates
+        are updated. Does not commit.
+
+        Args:
+            import_batch_id: The batch to update
+            mappings: bank_category -> (coinpurse_category_id, candidate_category_ids)
+
+        Returns:
+            Number of rows updated
+        """
+        if not mappings:
+            return 0
+
+        table = ImportStagingRow.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.import_batch_id == import_batch_id,
+                table.c.bank_category == bindparam("b_bank_category"),
+            )
+            .values(
+                coinpurse_category_id=case(
+                    (table.c.has_category_override, table.c.coinpurse_category_id),
+                    else_=bindparam("b_category_id"),
+                ),
+                candidate_category_ids=bindparam("b_candidates"),
+            )
+        )
+        result = self.db.execute(
+            stmt,
+            [
+                {
+                    "b_bank_category": bank_category,
+                    "b_category_id": category_id,
+                    "b_candidates": candidates,
+                }
+                for bank_category, (category_id, candidates) in mappings.items()
+            ],
+        )
+        return result.rowcount
+
+    def set_duplicates(self, import_batch_id: int, flags: dict[int, bool]) -> None:
+        """
+        Apply row_number -> is_duplicate flags in one executemany
+
+        Does not commit.
+        """
+        if not flags:
+            return
+
+        table = ImportStagingRow.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.import_batch_id == import_batch_id,
+                table.c.row_number == bindparam("b_row_number"),
+            )
+            .values(is_duplicate=bindparam("b_is_duplicate"))
+        )
+        self.db.execute(
+            stmt,
+            [
+                {"b_row_number": row_number, "b_is_duplicate": is_duplicate}
+                for row_number, is_duplicate in flags.items()
+            ],
+        )
+
+    def select_rows(self, import_batch_id: int, row_numbers: Sequence[int]) -> None:
+        """
+        Mark exactly the given rows of a batch as selected for import
+
+        Does not commit.
+        """
+        self.db.execute(
+            update(ImportStagingRow)
+            .where(ImportStagingRow.import_batch_id == import_batch_id)
+            .values(is_selected=False)
+        )
+        if not row_numbers:
+            return
+
+        table = ImportStagingRow.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.import_batch_id == import_batch_id,
+                table.c.row_number == bindparam("b_row_number"),
+            )
+            .values(is_selected=True)
+        )
+        self.db.execute(
+            stmt, [{"b_row_number": row_number} for row_number in set(row_numbers)]
+        )
+
+    def count_outcomes(self, import_batch_id: int) -> dict[str, int]:
+        """
+        Count how the selected rows of a batch will be handled on confirm
+
+        Returns:
+            Dict with total, importable, duplicate and skipped row counts
+        """
+        s = ImportStagingRow
+        importable = and_(*self._importable_conditions())
+        duplicate = and_(s.is_selected, s.is_duplicate)
+        stmt = select(
+            func.count(),
+            func.count(case((importable, 1))),
+            func.count(case((duplicate, 1))),
+        ).where(s.import_batch_id == import_batch_id)
+        total, importable_count, duplicate_count = self.db.execute(stmt).one()
+        return {
+            "total": total,
+            "importable": importable_count,
+            "duplicate": duplicate_count,
+            "skipped": total - importable_count - duplicate_count,
+        }
+
+    def get_row_number_range(self, import_batch_id: int) -> tuple[int, int] | None:
+        """Get the (first, last) row number of a batch, or None if it is empty"""
+        stmt = select(
+            func.min(ImportStagingRow.row_number), func.max(ImportStagingRow.row_number)
+        ).where(ImportStagingRow.import_batch_id == import_batch_id)
+        first, last = self.db.execute(stmt).one()
+        if first is None:
+            return None
+        return (first, last)
+
+    def insert_transactions(
+        self,
+        import_batch_id: int,
+        account_id: int,
+        imported_date: datetime,
+        row_range: tuple[int, int] | None = None,
+    ) -> int:
+        """
+        Copy the importable selected rows into transactions with INSERT ... SELECT
+
+        Does not commit.
+
+        Args:
+            import_batch_id: The batch to import from
+            account_id: Account the transactions belong to
+            imported_date: Timestamp recorded on every new transaction
+            row_range: Optional inclusive (first, last) row numbers to limit to
+
+        Returns:
+            Number of transactions inserted
+        """
+        source = self._importable_rows(
+            import_batch_id, account_id, imported_date, row_range
+        )
+        result = self.db.execute(
+            insert(Transaction).from_select(source.selected_columns.keys(), source)
+        )
+        return result.rowcount
+
+    def get_importable_values(
+        self,
+        import_batch_id: int,
+        account_id: int,
+        imported_date: datetime,
+        row_range: tuple[int, int] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get the importable selected rows as transaction column values
+
+        Same rows and values that insert_transactions() would copy, for
+        callers that insert them from Python instead.
+
+        Args:
+            import_batch_id: The batch to import from
+            account_id: Account the transactions belong to
+            imported_date: Timestamp recorded on every new transaction
+            row_range: Optional inclusive (first, last) row numbers to limit to
+
+        Returns:
+            One dict per row, keyed by Transaction column name
+        """
+        source = self._importable_rows(
+            import_batch_id, account_id, imported_date, row_range
+        )
+        return [dict(row) for row in self.db.execute(source).mappings()]
+
+    def get_importable_fingerprints(
+        self, import_batch_id: int, row_range: tuple[int, int] | None = None
+    ) -> list[int]:
+        """Get the fingerprints of the importable selected rows of a batch"""
+        s = ImportStagingRow
+        stmt = select(s.fingerprint).where(
+            s.import_batch_id == import_batch_id,
+            s.fingerprint.is_not(None),
+            *self._importable_conditions(),
+        )
+        if row_range is not None:
+            stmt = stmt.where(s.row_number.between(*row_range))
+        return list(self.db.scalars(stmt))
+
+    def delete_importable(
+        self, import_batch_id: int, row_range: tuple[int, int]
+    ) -> int:
+        """
+        Delete the importable selected rows in a range, once they are imported
+
+        Does not commit.
+
+        Returns:
+            Number of rows deleted
+        """
+        s = ImportStagingRow
+        result = self.db.execute(
+            delete(s).where(
+                s.import_batch_id == import_batch_id,
+                s.row_number.between(*row_range),
+                *self._importable_conditions(),
+            )
+        )
+        return result.rowcount
+
+    def delete_for_batch(self, import_batch_id: int) -> int:
+        """
+        Delete every staged row of a batch in one statement
+
+        Does not commit.
+
+        Returns:
+            Number of rows deleted
+        """
+        result = self.db.execute(
+            delete(ImportStagingRow).where(
+                ImportStagingRow.import_batch_id == import_batch_id
+            )
+        )
+        return result.rowcount
+
+    def _importable_rows(
+        self,
+        import_batch_id: int,
+        account_id: int,
+        imported_date: datetime,
+        row_range: tuple[int, int] | None,
+    ) -> Select:
+        """SELECT producing transaction column values from importable rows"""
+        s = ImportStagingRow
+        transaction_type_column = Transaction.__table__.c.transaction_type
+        transaction_type = case(
+            (
+                s.transaction_type == "CREDIT",
+                literal(TransactionType.PAYMENT, transaction_type_column.type),
+            ),
+            else_=literal(TransactionType.PURCHASE, transaction_type_column.type),
+        )
+
+        stmt = select(
+            literal(account_id).label("account_id"),
+            s.coinpurse_category_id.label("category_id"),
+            s.transaction_date,
+            func.coalesce(s.posted_date, s.transaction_date).label("posted_date"),
+            s.amount,
+            s.description,
+            transaction_type.label("transaction_type"),
+            literal("").label("notes"),
+            literal(imported_date, Transaction.__table__.c.imported_date.type).label(
+                "imported_date"
+            ),
+            s.fingerprint,
+        ).where(s.import_batch_id == import_batch_id, *self._importable_conditions())
+        if row_range is not None:
+            stmt = stmt.where(s.row_number.between(*row_range))
+        return stmt.order_by(s.row_number)
+
+    @staticmethod
+    def _importable_conditions() -> tuple:
+        """Conditions a staged row must meet to be imported on confirm"""
+        s = ImportStagingRow
+        return (
+            s.is_selected,
+            s.is_duplicate.is_(False),
+            s.has_errors.is_(False),
+            s.coinpurse_category_id.is_not(None),
+        )
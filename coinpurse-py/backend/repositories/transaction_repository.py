@@ -3,12 +3,15 @@ Repository layer for Transaction model
 Handles all database operations for transactions
 """
 
-from datetime import date
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session, joinedload
 
 from models.transaction import Transaction
+from repositories.bulk import bulk_set_active
 
 
 class TransactionRepository:
@@ -141,6 +144,30 @@ class TransactionRepository:
         self.db.refresh(transaction)
         return transaction
 
+    def bulk_create(self, rows: Sequence[dict[str, Any]]) -> int:
+        """
+        Insert many transactions with one Core executemany
+
+        Skips the unit of work entirely: no ORM objects are built and the
+        timestamp defaults are computed once for the whole batch instead of
+        once per row. Does not commit.
+
+        Args:
+            rows: Column values for each transaction (without timestamps)
+
+        Returns:
+            Number of transactions inserted
+        """
+        if not rows:
+            return 0
+
+        now = datetime.now(UTC)
+        shared = {"is_active": True, "created_at": now, "modified_at": now}
+        self.db.execute(
+            insert(Transaction.__table__), [{**shared, **row} for row in rows]
+        )
+        return len(rows)
+
     def update(self, transaction: Transaction) -> Transaction:
         """Update an existing transaction"""
         self.db.commit()
@@ -152,6 +179,46 @@ class TransactionRepository:
         transaction.is_active = False
         return self.update(transaction)
 
+    def bulk_soft_delete(self, transaction_ids: Sequence[int]) -> int:
+        """
+        Soft delete many transactions in one UPDATE
+
+        Does not commit, and bypasses ORM events: callers invalidate any
+        cached state for the affected accounts themselves.
+
+        Returns:
+            Number of transactions deactivated
+        """
+        return bulk_set_active(
+            self.db, Transaction.transaction_id, transaction_ids, is_active=False
+        )
+
+    def bulk_restore(self, transaction_ids: Sequence[int]) -> int:
+        """
+        Restore many soft-deleted transactions in one UPDATE
+
+        Does not commit, and bypasses ORM events: callers invalidate any
+        cached state for the affected accounts themselves.
+
+        Returns:
+            Number of transactions reactivated
+        """
+        return bulk_set_active(
+            self.db, Transaction.transaction_id, transaction_ids, is_active=True
+        )
+
+    def get_account_ids(self, transaction_ids: Sequence[int]) -> set[int]:
+        """Get the accounts the given transactions belong to"""
+        if not transaction_ids:
+            return set()
+
+        stmt = (
+            select(Transaction.account_id)
+            .where(Transaction.transaction_id.in_(transaction_ids))
+            .distinct()
+        )
+        return set(self.db.scalars(stmt))
+
     def hard_delete(self, transaction: Transaction) -> None:
         """Permanently delete a transaction (use with caution!)"""
         self.db.delete(transaction)
@@ -15,6 +15,8 @@ from repositories.balance_repository import BalanceRepository
 from schemas.balance import (
     BalanceBatchCreate,
     BalanceBatchResponse,
+    BalanceBulkRequest,
+    BalanceBulkResponse,
     BalanceCreate,
     BalanceResponse,
     BalanceUpdate,
@@ -94,6 +96,30 @@ def create_or_update_balances_batch(
     )
 
 
+@router.post("/bulk-delete", response_model=BalanceBulkResponse)
+def bulk_delete_balances(request: BalanceBulkRequest, db: Session = Depends(get_db)):
+    """
+    Soft delete many balances in one statement
+
+    - **balance_ids**: Balances to deactivate; inactive or unknown IDs are skipped
+    """
+    updated = BalanceRepository(db).bulk_soft_delete(request.balance_ids)
+    db.commit()
+    return BalanceBulkResponse(updated_count=updated)
+
+
+@router.post("/bulk-restore", response_model=BalanceBulkResponse)
+def bulk_restore_balances(request: BalanceBulkRequest, db: Session = Depends(get_db)):
+    """
+    Restore many soft-deleted balances in one statement
+
+    - **balance_ids**: Balances to reactivate; active or unknown IDs are skipped
+    """
+    updated = BalanceRepository(db).bulk_restore(request.balance_ids)
+    db.commit()
+    return BalanceBulkResponse(updated_count=updated)
+
+
 @router.get("/", response_model=list[BalanceResponse])
 def list_balances(
     account_id: int | None = Query(None, description="Filter by account ID"),
@@ -3,15 +3,31 @@ API endpoints for Transaction Import
 Handles file upload, preview, confirmation, and template/mapping management
 """
 
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine
+from typing import Any, BinaryIO
+
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
 from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Message
 
+import config
 from database import get_db
-from models import CategoryMapping, ImportTemplate
+from models import Account, CategoryMapping, ImportStatus, ImportTemplate, JobStatus
 from repositories.account_repository import AccountRepository
+from repositories.background_job_repository import BackgroundJobRepository
 from repositories.category_mapping_repository import CategoryMappingRepository
+from repositories.category_repository import CategoryRepository
 from repositories.import_batch_repository import ImportBatchRepository
+from repositories.import_staging_repository import ImportStagingRepository
 from repositories.import_template_repository import ImportTemplateRepository
+from schemas.background_job import BackgroundJobResponse
 from schemas.category_mapping import (
     CategoryMappingCreate,
     CategoryMappingGroupDelete,
@@ -20,28 +36,123 @@ from schemas.category_mapping import (
     CategoryMappingUpdate,
 )
 from schemas.import_batch import (
+    BulkImportPreviewResponse,
     ImportBatchDetailResponse,
     ImportBatchResponse,
     ImportConfirmRequest,
     ImportConfirmResponse,
     ImportPreviewResponse,
+    ImportRecategorizeResponse,
+    ParsedTransaction,
+    ParsedTransactionPage,
+    ParsedTransactionUpdate,
 )
 from schemas.import_template import (
     ImportTemplateCreate,
     ImportTemplateResponse,
     ImportTemplateUpdate,
+    TemplateDetectResponse,
+    TemplateMatchResponse,
 )
-from services import ImportService
+from services import BulkImportFile, ImportService
+from services.import_job_runner import ImportJobRunner, get_import_job_runner
+from services.template_index import best_match
 
 router = APIRouter(prefix="/import", tags=["import"])
 
 
+# =============================================================================
+# Upload Size Limits
+# =============================================================================
+
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the maximum size of {config.MAX_UPLOAD_BYTES} bytes",
+    )
+
+
+class SizeLimitedRequest(Request):
+    """Request whose body stream fails once more than max_bytes have arrived"""
+
+    def __init__(self, request: Request, max_bytes: int):
+        super().__init__(request.scope, self._limited_receive)
+        self._inner_receive = request.receive
+        self._max_bytes = max_bytes
+        self._received_bytes = 0
+
+    async def _limited_receive(self) -> Message:
+        message = await self._inner_receive()
+        if message["type"] == "http.request":
+            self._received_bytes += len(message.get("body", b""))
+            if self._received_bytes > self._max_bytes:
+                raise _upload_too_large()
+        return message
+
+
+class SizeLimitedUploadRoute(APIRoute):
+    """
+    Route that rejects bodies larger than config.MAX_UPLOAD_BYTES.
+
+    The declared Content-Length is checked before anything is read, and the
+    running total is checked again while the multipart body streams into its
+    spooled temp file, so an oversized upload never lands in full.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            max_bytes = config.MAX_UPLOAD_BYTES
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                raise _upload_too_large()
+            return await original_handler(SizeLimitedRequest(request, max_bytes))
+
+        return handler
+
+
+# Upload endpoints are registered here and merged into the main router below
+upload_router = APIRouter(route_class=SizeLimitedUploadRoute)
+
+
 # =============================================================================
 # Import Operations
 # =============================================================================
 
 
-@router.post("/upload", response_model=ImportPreviewResponse)
+def _get_import_account(account_id: int, db: Session) -> Account:
+    """Get the target account, ensuring it exists"""
+    account = AccountRepository(db).get_by_id(account_id)
+
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
+
+    return account
+
+
+def _resolve_template_id(account: Account, file: BinaryIO, db: Session) -> int:
+    """
+    Get the template to parse a file with: the account's own, or else the
+    one template whose columns match the file's header row
+    """
+    if account.template_id:
+        return account.template_id
+
+    match = best_match(ImportService(db).detect_templates(file))
+    if match is None:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"Account '{account.account_name}' has no import template configured "
+                "and no single template matches the file's header row."
+            ),
+        )
+    return match.template_id
+
+
+@upload_router.post("/upload", response_model=ImportPreviewResponse)
 async def upload_and_preview(
     file: UploadFile = File(..., description="CSV or Excel file to import"),
     account_id: int = Form(..., description="Target account ID"),
@@ -50,49 +161,102 @@ async def upload_and_preview(
     """
     Upload a file and preview transactions before importing.
 
-    - **file**: The CSV or Excel file to import
-    - **account_id**: The account to import transactions into (must have template configured)
+    - **file**: The CSV or Excel file to import (at most COINPURSE_MAX_UPLOAD_BYTES)
+    - **account_id**: The account to import transactions into; if it has no
+      template, the template is picked from the file's header row
 
     Returns a preview with:
     - import_batch_id: Use this to confirm the import
     - summary: Counts of total, valid, duplicate, and error rows
     - transactions: List of parsed transactions with validation status
+    - already_imported_batch_id: Set if this file was imported into the account before
     """
-    # Validate account exists and has a template
-    account_repo = AccountRepository(db)
-    account = account_repo.get_by_id(account_id)
+    account = _get_import_account(account_id, db)
+    await file.seek(0)
+    template_id = await run_in_threadpool(_resolve_template_id, account, file.file, db)
+    service = ImportService(db)
 
-    if not account:
-        raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
+    try:
+        # Parse straight from the spooled upload (memory up to a small
+        # threshold, then a temp file on disk) instead of copying it into RAM
+        await file.seek(0)
+
+        # Parsing is synchronous; keep it off the event loop
+        result = await run_in_threadpool(
+            service.upload_and_preview,
+            file=file.file,
+            file_name=file.filename or "unknown",
+            account_id=account_id,
+            template_id=template_id,
+        )
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error processing file: {str(e)}"
+        ) from e
+
+
+@upload_router.post("/upload/bulk", response_model=BulkImportPreviewResponse)
+async def bulk_upload_and_preview(
+    files: list[UploadFile] = File(..., description="CSV or Excel files to import"),
+    account_ids: list[int] = Form(
+        ..., description="Target account ID for each file, in the same order"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload several files and preview them together, one batch per file.
+
+    - **files**: The CSV or Excel files to import (at most
+      COINPURSE_MAX_UPLOAD_BYTES in total)
+    - **account_ids**: One account per file, in the same order; files for an
+      account without a template use the template matching their header row
 
-    if not account.template_id:
+    Files are parsed in parallel, so the request takes about as long as the
+    slowest file. Returns combined totals plus, for each file, its
+    import_batch_id, summary and transactions, or an error if it could not be parsed.
+    """
+    if len(files) != len(account_ids):
         raise HTTPException(
             status_code=422,
-            detail=f"Account '{account.account_name}' has no import template configured.",
+            detail=f"Got {len(files)} files but {len(account_ids)} account IDs",
+        )
+
+    accounts = {
+        account_id: _get_import_account(account_id, db)
+        for account_id in set(account_ids)
+    }
+
+    bulk_files = []
+    for file, account_id in zip(files, account_ids, strict=True):
+        await file.seek(0)
+        template_id = await run_in_threadpool(
+            _resolve_template_id, accounts[account_id], file.file, db
+        )
+        await file.seek(0)
+        bulk_files.append(
+            BulkImportFile(
+                file=file.file,
+                file_name=file.filename or "unknown",
+                account_id=account_id,
+                template_id=template_id,
+            )
         )
 
     service = ImportService(db)
 
     try:
-        # Read file contents
-        contents = await file.read()
-        import io
 
-        file_obj = io.BytesIO(contents)
-
-        result = service.upload_and_preview(
-            file=file_obj,
-            file_name=file.filename or "unknown",
-            account_id=account_id,
-            template_id=account.template_id,
-        )
-        return result
+        return await run_in_threadpool(service.bulk_upload_and_preview, bulk_files)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Error processing file: {str(e)}"
+            status_code=500, detail=f"Error processing files: {str(e)}"
         ) from e
 
 
@@ -127,6 +291,164 @@ def confirm_import(
         ) from e
 
 
+# =============================================================================
+# Background Import Jobs
+# =============================================================================
+
+
+@upload_router.post(
+    "/jobs/upload", response_model=BackgroundJobResponse, status_code=202
+)
+async def queue_upload_and_preview(
+    file: UploadFile = File(..., description="CSV or Excel file to import"),
+    account_id: int = Form(..., description="Target account ID"),
+    db: Session = Depends(get_db),
+    runner: ImportJobRunner = Depends(get_import_job_runner),
+):
+    """
+    Upload a file and build its preview in the background.
+
+    - **file**: The CSV or Excel file to import (at most COINPURSE_MAX_UPLOAD_BYTES)
+    - **account_id**: The account to import transactions into; if it has no
+      template, the template is picked from the file's header row
+
+    Returns the queued job immediately. Poll GET /import/jobs/{job_id} until
+    its status is completed; the result then holds the preview summary and
+    import_batch_id points at the new batch.
+    """
+    account = _get_import_account(account_id, db)
+
+    await file.seek(0)
+    template_id = await run_in_threadpool(_resolve_template_id, account, file.file, db)
+    await file.seek(0)
+    job = await run_in_threadpool(
+        runner.submit_preview,
+        db,
+        file=file.file,
+        file_name=file.filename or "unknown",
+        account_id=account_id,
+        template_id=template_id,
+    )
+    return _job_response(job.job_id, db, runner)
+
+
+@router.post("/jobs/confirm", response_model=BackgroundJobResponse, status_code=202)
+def queue_confirm_import(
+    request: ImportConfirmRequest,
+    db: Session = Depends(get_db),
+    runner: ImportJobRunner = Depends(get_import_job_runner),
+):
+    """
+    Confirm an import in the background.
+
+    - **import_batch_id**: The batch ID from the preview
+    - **selected_rows**: List of row numbers to import (from preview)
+
+    Returns the queued job immediately. Its result holds the final counts.
+    """
+    try:
+        job = runner.submit_confirm(
+            db,
+            import_batch_id=request.import_batch_id,
+            selected_rows=request.selected_rows,
+            category_overrides=request.category_overrides,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+    return _job_response(job.job_id, db, runner)
+
+
+@router.get("/jobs/{job_id}", response_model=BackgroundJobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    runner: ImportJobRunner = Depends(get_import_job_runner),
+):
+    """
+    Get the status, progress, and result of a background import job.
+
+    - **job_id**: The job ID returned when the job was queued
+    """
+    return _job_response(job_id, db, runner)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    runner: ImportJobRunner = Depends(get_import_job_runner),
+):
+    """
+    Stream a background import job's progress as Server-Sent Events.
+
+    - **job_id**: The job ID returned when the job was queued
+
+    Sends a "progress" event, holding the same fields as GET
+    /import/jobs/{job_id}, whenever the job's status, stage or row count
+    changes (checked every COINPURSE_JOB_EVENT_INTERVAL seconds), then one
+    "done" event once the job has completed or failed, and closes. If the job
+    does not change for COINPURSE_JOB_EVENT_STALL_SECONDS, an "error" event
+    is sent instead and the stream closes; poll the job to keep watching.
+    """
+    await run_in_threadpool(_job_response, job_id, db, runner)
+    return StreamingResponse(
+        _job_events(job_id, runner, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def _job_events(
+    job_id: int, runner: ImportJobRunner, request: Request
+) -> AsyncIterator[str]:
+    """Poll a job and yield an SSE message for each change until it ends"""
+    last = None
+    last_change = time.monotonic()
+    while not await request.is_disconnected():
+        response = await run_in_threadpool(_load_job_response, job_id, runner)
+        data = response.model_dump_json()
+        if response.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            yield f"event: done\ndata: {data}\n\n"
+            return
+        if data != last:
+            yield f"event: progress\ndata: {data}\n\n"
+            last = data
+            last_change = time.monotonic()
+        elif time.monotonic() - last_change >= config.JOB_EVENT_STALL_SECONDS:
+            stalled = config.JOB_EVENT_STALL_SECONDS
+            detail = f"Job {job_id} made no progress for {stalled:g} seconds"
+            yield f"event: error\ndata: {json.dumps({'detail': detail})}\n\n"
+            return
+        await asyncio.sleep(config.JOB_EVENT_INTERVAL)
+
+
+def _load_job_response(job_id: int, runner: ImportJobRunner) -> BackgroundJobResponse:
+    """Build a job response with a session of its own, for long-lived streams"""
+    with runner.session_factory() as db:
+        return _job_response(job_id, db, runner)
+
+
+def _job_response(
+    job_id: int, db: Session, runner: ImportJobRunner
+) -> BackgroundJobResponse:
+    """Build a job response, overlaying live progress while it runs"""
+    job = BackgroundJobRepository(db).get_by_id(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    # Refresh in case the worker finished the job since this session loaded it
+    db.refresh(job)
+    response = BackgroundJobResponse.model_validate(job)
+    progress = runner.get_progress(job_id)
+    if progress is not None:
+        response.progress_current, response.progress_total = progress
+    response.progress_stage = runner.get_stage(job_id)
+    return response
+
+
 # =============================================================================
 # Import Batch History
 # =============================================================================
@@ -173,6 +495,7 @@ def get_batch(import_batch_id: int, db: Session = Depends(get_db)):
         template_id=batch.template_id,
         file_name=batch.file_name,
         file_format=batch.file_format,
+        content_hash=batch.content_hash,
         total_rows=batch.total_rows,
         imported_count=batch.imported_count,
         skipped_count=batch.skipped_count,
@@ -187,6 +510,190 @@ def get_batch(import_batch_id: int, db: Session = Depends(get_db)):
     return response
 
 
+@router.get(
+    "/batches/{import_batch_id}/rows", response_model=ParsedTransactionPage
+)
+def list_batch_rows(
+    import_batch_id: int,
+    offset: int = Query(0, ge=0, description="Number of matching rows to skip"),
+    limit: int | None = Query(
+        None, ge=1, le=1000, description="Maximum number of rows to return"
+    ),
+    after_row: int | None = Query(
+        None, description="Only rows after this row number (next_cursor)"
+    ),
+    is_duplicate: bool | None = Query(None, description="Filter by duplicate flag"),
+    has_errors: bool | None = Query(
+        None, description="Filter by whether the row has validation errors"
+    ),
+    category_id: int | None = Query(None, description="Filter by mapped category"),
+    db: Session = Depends(get_db),
+):
+    """
+    Page through the rows of a preview batch.
+
+    - **import_batch_id**: The preview batch
+    - **offset** / **limit**: Offset paging (limit defaults to
+      COINPURSE_PREVIEW_PAGE_SIZE)
+    - **after_row**: Cursor paging; pass the previous page's next_cursor
+    - **is_duplicate**, **has_errors**, **category_id**: Optional filters
+
+    Rows are returned in file order. next_cursor is null on the last page.
+    """
+    batch = ImportBatchRepository(db).get_by_id(import_batch_id)
+
+    if not batch:
+        raise HTTPException(
+            status_code=404, detail=f"Batch {import_batch_id} not found"
+        )
+
+    limit = limit or config.PREVIEW_PAGE_SIZE
+    rows, total, has_more = ImportStagingRepository(db).get_page(
+        import_batch_id,
+        offset=offset,
+        limit=limit,
+        after_row=after_row,
+        is_duplicate=is_duplicate,
+        has_errors=has_errors,
+        category_id=category_id,
+    )
+
+    return ParsedTransactionPage(
+        transactions=[ParsedTransaction.model_validate(row) for row in rows],
+        total=total,
+        offset=offset,
+        limit=limit,
+        next_cursor=rows[-1].row_number if rows and has_more else None,
+    )
+
+
+@router.patch(
+    "/batches/{import_batch_id}/rows/{row_number}", response_model=ParsedTransaction
+)
+def update_batch_row(
+    import_batch_id: int,
+    row_number: int,
+    row_data: ParsedTransactionUpdate,
+    db: Session = Depends(get_db),
+):
+    """
+    Edit one row of a preview batch before confirming it.
+
+    - **import_batch_id**: The preview batch
+    - **row_number**: The row to edit (from preview)
+    - **coinpurse_category_id**: Category to import the row with
+    """
+    batch = ImportBatchRepository(db).get_by_id(import_batch_id)
+
+    if not batch:
+        raise HTTPException(
+            status_code=404, detail=f"Batch {import_batch_id} not found"
+        )
+
+    if batch.status != ImportStatus.PREVIEW:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch {import_batch_id} is not in PREVIEW status",
+        )
+
+    if not CategoryRepository(db).exists(row_data.coinpurse_category_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Category {row_data.coinpurse_category_id} not found",
+        )
+
+    row = ImportStagingRepository(db).set_category(
+        import_batch_id, row_number, row_data.coinpurse_category_id
+    )
+
+    if not row:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Row {row_number} not found in batch {import_batch_id}",
+        )
+
+    return row
+
+
+@router.post(
+    "/batches/{import_batch_id}/reparse", response_model=ImportPreviewResponse
+)
+def reparse_batch(
+    import_batch_id: int,
+    template_id: int | None = Query(
+        None, description="Template to parse with instead of the batch's own"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Parse a batch's stored file again, e.g. after fixing its template.
+
+    - **import_batch_id**: The batch whose file to parse; its upload is kept
+      in the import file store, so it need not be uploaded again
+    - **template_id**: Optional template to use instead of the batch's own
+
+    Returns the preview of a new batch. A batch still in PREVIEW status is
+    replaced by the new one.
+    """
+    batch = ImportBatchRepository(db).get_by_id(import_batch_id)
+
+    if not batch:
+        raise HTTPException(
+            status_code=404, detail=f"Batch {import_batch_id} not found"
+        )
+
+    service = ImportService(db)
+
+    try:
+        return service.reparse_batch(import_batch_id, template_id=template_id)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error processing file: {str(e)}"
+        ) from e
+
+
+@router.post(
+    "/batches/{import_batch_id}/recategorize",
+    response_model=ImportRecategorizeResponse,
+)
+def recategorize_batch(
+    import_batch_id: int,
+    detect_duplicates: bool = Query(
+        False, description="Also check every row for duplicates again"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Re-apply category mappings to a preview batch, e.g. after editing one.
+
+    - **import_batch_id**: The preview batch; its staged rows are updated
+      in place, without parsing the file again
+    - **detect_duplicates**: Also re-run duplicate detection on every row
+
+    Only rows whose bank category now maps to different categories are
+    changed; categories picked by hand on other rows are kept.
+    """
+    batch = ImportBatchRepository(db).get_by_id(import_batch_id)
+
+    if not batch:
+        raise HTTPException(
+            status_code=404, detail=f"Batch {import_batch_id} not found"
+        )
+
+    service = ImportService(db)
+
+    try:
+        return service.recategorize_batch(
+            import_batch_id, detect_duplicates=detect_duplicates
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
 # =============================================================================
 # Import Templates
 # =============================================================================
@@ -206,6 +713,41 @@ def list_templates(
     return repo.get_all(include_inactive=include_inactive)
 
 
+@upload_router.post("/templates/detect", response_model=TemplateDetectResponse)
+async def detect_template(
+    file: UploadFile = File(..., description="CSV or Excel file to match"),
+    db: Session = Depends(get_db),
+):
+    """
+    Pick the import template for a file from its header row.
+
+    - **file**: The CSV or Excel file (at most COINPURSE_MAX_UPLOAD_BYTES)
+
+    Only the header row is read. Every active template whose mapped columns
+    are all present matches, most specific first, with the accounts using
+    it so that a drop of mixed bank files can be routed. template_id is the
+    single best match, or null if nothing matches or the best ones tie.
+    """
+    await file.seek(0)
+    matches = await run_in_threadpool(ImportService(db).detect_templates, file.file)
+
+    account_repo = AccountRepository(db)
+    return TemplateDetectResponse(
+        template_id=(best.template_id if (best := best_match(matches)) else None),
+        matches=[
+            TemplateMatchResponse(
+                template_id=m.template_id,
+                template_name=m.template_name,
+                matched_columns=m.matched_columns,
+                account_ids=[
+                    a.account_id for a in account_repo.get_by_template(m.template_id)
+                ],
+            )
+            for m in matches
+        ],
+    )
+
+
 @router.get("/templates/{template_id}", response_model=ImportTemplateResponse)
 def get_template(template_id: int, db: Session = Depends(get_db)):
     """
@@ -237,6 +779,8 @@ def create_template(
     - **date_format**: strptime format string (default: %m/%d/%Y)
     - **header_row**: Row number where headers are (1-indexed)
     - **skip_rows**: Rows to skip after header
+    - **all_sheets**: Excel only; read every sheet with the mapped columns
+      instead of just the first
     """
     repo = ImportTemplateRepository(db)
 
@@ -410,9 +954,8 @@ def delete_category_mapping_group(
     """
     repo = CategoryMappingRepository(db)
 
-    # Check active mappings exist before attempting delete
-    existing = repo.get_active_by_group(data.institution_id, data.bank_category_name)
-    if not existing:
+    # Check an active mapping exists before attempting delete
+    if repo.get_by_bank_category(data.institution_id, data.bank_category_name) is None:
         raise HTTPException(
             status_code=404,
             detail=f"No mappings found for '{data.bank_category_name}'",
@@ -546,3 +1089,7 @@ def delete_category_mapping(
         repo.soft_delete(mapping)
 
     return None
+
+
+# Register the size-limited upload routes on the main import router
+router.include_router(upload_router)
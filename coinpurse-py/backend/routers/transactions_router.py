@@ -9,16 +9,27 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from database import get_db
+from models.base import JobStatus, JobType
 from models.transaction import Transaction
 from repositories.account_repository import AccountRepository
+from repositories.background_job_repository import BackgroundJobRepository
 from repositories.category_repository import CategoryRepository
 from repositories.transaction_repository import TransactionRepository
+from schemas.background_job import BackgroundJobResponse
 from schemas.transaction import (
+    DuplicateResolveRequest,
+    DuplicateResolveResponse,
+    DuplicateSweepResult,
+    TransactionBulkRequest,
+    TransactionBulkResponse,
     TransactionCreate,
     TransactionResponse,
     TransactionUpdate,
     TransactionWithNamesResponse,
 )
+from services.duplicate_sweep import DuplicateSweepService
+from services.fingerprint_cache import get_fingerprint_cache
+from services.import_job_runner import ImportJobRunner, get_import_job_runner
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
@@ -173,6 +184,111 @@ def search_transactions(
     return repo.search_by_description(q, include_inactive=include_inactive)
 
 
+@router.post("/duplicates/sweep", response_model=BackgroundJobResponse, status_code=202)
+def queue_duplicate_sweep(
+    account_id: int = Query(..., description="Account whose ledger is swept"),
+    db: Session = Depends(get_db),
+    runner: ImportJobRunner = Depends(get_import_job_runner),
+):
+    """
+    Scan an account's existing transactions for duplicates in the background
+
+    - **account_id**: The account to sweep
+
+    Returns the queued job immediately. Poll GET /import/jobs/{job_id} for
+    progress, then fetch the groups from GET /transactions/duplicates/sweep/{job_id}.
+    """
+    if not AccountRepository(db).exists(account_id):
+        raise HTTPException(
+            status_code=404, detail=f"Account with ID {account_id} not found"
+        )
+
+    job = runner.submit_duplicate_sweep(db, account_id)
+    db.refresh(job)
+    return job
+
+
+@router.get("/duplicates/sweep/{job_id}", response_model=DuplicateSweepResult)
+def get_duplicate_sweep(job_id: int, db: Session = Depends(get_db)):
+    """
+    Get the candidate duplicate groups found by a completed sweep
+
+    - **job_id**: The job ID returned when the sweep was queued
+    """
+    job = BackgroundJobRepository(db).get_by_id(job_id)
+    if not job or job.job_type != JobType.DUPLICATE_SWEEP:
+        raise HTTPException(
+            status_code=404, detail=f"Duplicate sweep {job_id} not found"
+        )
+
+    db.refresh(job)
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Duplicate sweep {job_id} is {job.status.value}",
+        )
+
+    return job.result
+
+
+@router.post("/duplicates/resolve", response_model=DuplicateResolveResponse)
+def resolve_duplicates(request: DuplicateResolveRequest, db: Session = Depends(get_db)):
+    """
+    Soft delete confirmed duplicate groups, keeping the oldest transaction of each
+
+    - **groups**: Transaction IDs of each confirmed group (from a sweep)
+    """
+    try:
+        deleted = DuplicateSweepService(db).resolve(request.groups)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return DuplicateResolveResponse(deleted_count=deleted)
+
+
+@router.post("/bulk-delete", response_model=TransactionBulkResponse)
+def bulk_delete_transactions(
+    request: TransactionBulkRequest, db: Session = Depends(get_db)
+):
+    """
+    Soft delete many transactions in one statement
+
+    - **transaction_ids**: Transactions to deactivate; inactive or unknown IDs
+      are skipped
+    """
+    return _bulk_set_active(db, request.transaction_ids, is_active=False)
+
+
+@router.post("/bulk-restore", response_model=TransactionBulkResponse)
+def bulk_restore_transactions(
+    request: TransactionBulkRequest, db: Session = Depends(get_db)
+):
+    """
+    Restore many soft-deleted transactions in one statement
+
+    - **transaction_ids**: Transactions to reactivate; active or unknown IDs are skipped
+    """
+    return _bulk_set_active(db, request.transaction_ids, is_active=True)
+
+
+def _bulk_set_active(
+    db: Session, transaction_ids: list[int], is_active: bool
+) -> TransactionBulkResponse:
+    repo = TransactionRepository(db)
+    account_ids = repo.get_account_ids(transaction_ids)
+    if is_active:
+        updated = repo.bulk_restore(transaction_ids)
+    else:
+        updated = repo.bulk_soft_delete(transaction_ids)
+    db.commit()
+
+    # The bulk UPDATE skipped the ORM events that keep the cache current
+    fingerprint_cache = get_fingerprint_cache()
+    for account_id in account_ids:
+        fingerprint_cache.invalidate(account_id)
+    return TransactionBulkResponse(updated_count=updated)
+
+
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 def get_transaction(transaction_id: int, db: Session = Depends(get_db)):
     """
@@ -0,0 +1,36 @@
+"""
+Pydantic schemas for BackgroundJob API
+These are DTOs (Data Transfer Objects) for request/response validation
+"""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from models.base import JobStatus, JobType
+
+
+class BackgroundJobResponse(BaseModel):
+    """Schema for returning a job's state and progress"""
+
+    # Allow pydantic to work with SQLAlchemy models
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: int
+    job_type: JobType
+    status: JobStatus
+    account_id: int | None = None
+    import_batch_id: int | None = None
+    file_name: str | None = None
+    progress_current: int
+    progress_total: int | None = None
+    # Pipeline stage while an import job runs: parsed, categorized,
+    # deduplicated or inserted
+    progress_stage: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    created_at: datetime
+    modified_at: datetime
@@ -96,3 +96,15 @@ class BalanceBatchResponse(BaseModel):
     created: int
     updated: int
     balances: list[BalanceResponse]
+
+
+class BalanceBulkRequest(BaseModel):
+    """Schema for soft-deleting or restoring many balances"""
+
+    balance_ids: list[int] = Field(..., min_length=1)
+
+
+class BalanceBulkResponse(BaseModel):
+    """Response from bulk balance soft delete or restore"""
+
+    updated_count: int
@@ -5,7 +5,7 @@ These are DTOs (Data Transfer Objects) for request/response validation
 
 from datetime import date, datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 from models.base import FileFormat, ImportStatus
 
@@ -13,13 +13,19 @@ from models.base import FileFormat, ImportStatus
 class ParsedTransaction(BaseModel):
     """Schema for a single parsed transaction in preview"""
 
+    # Allow pydantic to work with SQLAlchemy models (staged preview rows)
+    model_config = ConfigDict(from_attributes=True)
+
     row_number: int
     transaction_date: date | None = None
     posted_date: date | None = None
     description: str
     amount: int  # Amount in cents
     transaction_type: str  # CREDIT or DEBIT
-    category_name: str | None = None
+    category_name: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices("category_name", "bank_category"),
+    )
     coinpurse_category_id: int | None = None
     candidate_category_ids: list[int] = Field(default_factory=list)
     is_duplicate: bool = False
@@ -43,7 +49,46 @@ class ImportPreviewResponse(BaseModel):
 
     import_batch_id: int
     summary: ImportPreviewSummary
+    transactions: list[ParsedTransaction]  # First page only
+    next_cursor: int | None = None  # Pass as after_row to fetch the next page
+    # Set when an earlier batch already imported the same file into the account
+    already_imported_batch_id: int | None = None
+
+
+class ParsedTransactionPage(BaseModel):
+    """One page of a preview batch's rows"""
+
     transactions: list[ParsedTransaction]
+    total: int  # Rows matching the filters, across all pages
+    offset: int
+    limit: int
+    next_cursor: int | None = None  # Pass as after_row to fetch the next page
+
+
+class BulkImportFilePreview(BaseModel):
+    """Preview of one file in a bulk upload"""
+
+    file_name: str
+    account_id: int
+    import_batch_id: int | None = None
+    summary: ImportPreviewSummary | None = None
+    transactions: list[ParsedTransaction] = Field(default_factory=list)
+    next_cursor: int | None = None
+    already_imported_batch_id: int | None = None
+    error: str | None = None  # Set instead of a batch when the file failed
+
+
+class BulkImportPreviewResponse(BaseModel):
+    """Response from the bulk upload endpoint, with one batch per file"""
+
+    summary: ImportPreviewSummary  # Totals across all files
+    files: list[BulkImportFilePreview]
+
+
+class ParsedTransactionUpdate(BaseModel):
+    """Schema for editing a staged preview row before confirming"""
+
+    coinpurse_category_id: int
 
 
 class ImportConfirmRequest(BaseModel):
@@ -70,6 +115,15 @@ class ImportConfirmResponse(BaseModel):
     status: ImportStatus
 
 
+class ImportRecategorizeResponse(BaseModel):
+    """Response from re-applying category mappings to a preview batch"""
+
+    import_batch_id: int
+    recategorized_rows: int  # Rows whose bank category now maps differently
+    duplicate_changes: int = 0  # Rows whose duplicate flag flipped, if checked
+    duplicate_count: int  # Duplicate rows in the batch afterwards
+
+
 class ImportBatchBase(BaseModel):
     """Shared fields"""
 
@@ -86,6 +140,7 @@ class ImportBatchResponse(ImportBatchBase):
     model_config = ConfigDict(from_attributes=True)
 
     import_batch_id: int
+    content_hash: str | None = None  # SHA-256 of the stored upload
     total_rows: int
     imported_count: int
     skipped_count: int
@@ -50,6 +50,7 @@ class ImportTemplateBase(BaseModel):
     amount_config: dict[str, Any]
     header_row: int = Field(1, ge=1)
     skip_rows: int = Field(0, ge=0)
+    all_sheets: bool = Field(False, description="Excel: read every matching sheet")
     date_format: str = Field("%m/%d/%Y", max_length=50)
     is_active: bool = True
 
@@ -80,6 +81,7 @@ class ImportTemplateUpdate(BaseModel):
     amount_config: dict[str, Any] | None = None
     header_row: int | None = Field(None, ge=1)
     skip_rows: int | None = Field(None, ge=0)
+    all_sheets: bool | None = None
     date_format: str | None = Field(None, max_length=50)
     is_active: bool | None = None
 
@@ -106,3 +108,23 @@ class ImportTemplateResponse(ImportTemplateBase):
     template_id: int
     created_at: datetime
     modified_at: datetime
+
+
+class TemplateMatchResponse(BaseModel):
+    """A template whose mapped columns are all in an uploaded file's header"""
+
+    template_id: int
+    template_name: str
+    matched_columns: int = Field(..., description="Number of mapped columns found")
+    account_ids: list[int] = Field(
+        default_factory=list, description="Active accounts using this template"
+    )
+
+
+class TemplateDetectResponse(BaseModel):
+    """Schema for automatic template selection"""
+
+    template_id: int | None = Field(
+        None, description="The best match, or null if none or several tie"
+    )
+    matches: list[TemplateMatchResponse]
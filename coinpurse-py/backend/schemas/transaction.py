@@ -61,3 +61,48 @@ class TransactionWithNamesResponse(TransactionResponse):
     account_name: str
     category_name: str
 
+
+
+class DuplicateGroup(BaseModel):
+    """Active transactions of one account sharing amount, date and description"""
+
+    amount: int = Field(..., description="Amount in cents")
+    transaction_date: date
+    description: str = Field(..., description="Normalized description")
+    transaction_ids: list[int] = Field(..., description="Oldest transaction first")
+
+
+class DuplicateSweepResult(BaseModel):
+    """Candidate duplicate groups found by a sweep of an account's ledger"""
+
+    account_id: int
+    transactions_scanned: int
+    groups: list[DuplicateGroup]
+
+
+class DuplicateResolveRequest(BaseModel):
+    """Schema for soft-deleting confirmed duplicate groups"""
+
+    groups: list[list[int]] = Field(
+        ...,
+        min_length=1,
+        description="Transaction IDs of each confirmed group; the oldest is kept",
+    )
+
+
+class DuplicateResolveResponse(BaseModel):
+    """Schema for the result of resolving duplicate groups"""
+
+    deleted_count: int
+
+
+class TransactionBulkRequest(BaseModel):
+    """Schema for soft-deleting or restoring many transactions"""
+
+    transaction_ids: list[int] = Field(..., min_length=1)
+
+
+class TransactionBulkResponse(BaseModel):
+    """Schema for the result of a bulk soft delete or restore"""
+
+    updated_count: int
@@ -4,9 +4,10 @@ Services package for business logic
 
 from .category_mapper import CategoryMapper
 from .duplicate_detector import DuplicateDetector, TransactionHash
-from .import_service import ImportService
+from .import_service import BulkImportFile, ImportService
 
 __all__ = [
+    "BulkImportFile",
     "CategoryMapper",
     "DuplicateDetector",
     "TransactionHash",
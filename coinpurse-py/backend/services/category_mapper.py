@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from models import Category, CategoryMapping
+from services.parsers import ParsedBatch
 
 
 class CategoryMapper:
@@ -142,6 +143,43 @@ class CategoryMapper:
 
         return parsed_transactions
 
+    def map_batch(self, institution_id: int, batch: ParsedBatch) -> ParsedBatch:
+        """
+        Map categories for a parsed batch, column by column.
+
+        Each distinct bank category is looked up once; its rows share the
+        resulting candidate list.
+
+        Args:
+            institution_id: The institution ID
+            batch: Parsed rows from an import file
+
+        Returns:
+            Same batch with coinpurse_category_ids and candidate_category_ids set
+        """
+        uncategorized_id = self.get_uncategorized_category_id()
+        mappings = self.get_mappings_for_institution(institution_id)
+
+        resolved: dict[str | None, tuple[int, list[int]]] = {}
+        category_ids: list[int | None] = []
+        candidate_ids: list[list[int]] = []
+        for bank_category in batch.bank_categories:
+            mapped = resolved.get(bank_category)
+            if mapped is None:
+                candidates = (
+                    list(mappings.get(bank_category.lower().strip(), []))
+                    if bank_category
+                    else []
+                )
+                mapped = (candidates[0] if candidates else uncategorized_id, candidates)
+                resolved[bank_category] = mapped
+            category_ids.append(mapped[0])
+            candidate_ids.append(mapped[1])
+
+        batch.coinpurse_category_ids = category_ids
+        batch.candidate_category_ids = candidate_ids
+        return batch
+
     def clear_cache(self):
         """Clear the mapping cache"""
         self._mapping_cache = None
@@ -2,13 +2,26 @@
 Duplicate detection service for transaction imports
 """
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from models import Transaction
+from models import Transaction, transaction_fingerprint
+from models.transaction import direction_of
+from services.fingerprint_cache import (
+    FingerprintCache,
+    FingerprintSet,
+    contains_many,
+    get_fingerprint_cache,
+)
+from services.parsers import ParsedBatch
+
+# Fingerprints per IN (...) lookup, well under SQLite's bound-parameter limit
+FINGERPRINT_LOOKUP_BATCH = 500
 
 
 @dataclass(frozen=True)
@@ -33,12 +46,21 @@ class TransactionHash:
     @classmethod
     def from_transaction(cls, txn: Transaction) -> "TransactionHash":
         """Create a hash from an existing Transaction model"""
+        return cls.from_columns(
+            txn.account_id, txn.transaction_date, txn.description, txn.amount
+        )
+
+    @classmethod
+    def from_columns(
+        cls, account_id: int, transaction_date: date, description: str, amount: int
+    ) -> "TransactionHash":
+        """Create a hash from the hashed columns of a stored transaction"""
         return cls(
-            account_id=txn.account_id,
-            transaction_date=txn.transaction_date,
-            description=txn.description.lower().strip(),
-            transaction_type="CREDIT" if txn.amount >= 0 else "DEBIT",
-            amount=txn.amount,
+            account_id=account_id,
+            transaction_date=transaction_date,
+            description=description.lower().strip(),
+            transaction_type=direction_of(amount),
+            amount=amount,
         )
 
     @classmethod
@@ -59,41 +81,124 @@ class TransactionHash:
             amount=amount,
         )
 
+    @property
+    def fingerprint(self) -> int:
+        """64-bit fingerprint, comparable with Transaction.fingerprint"""
+        return transaction_fingerprint(
+            self.account_id,
+            self.transaction_date,
+            self.description,
+            self.transaction_type,
+            self.amount,
+        )
 
-class DuplicateDetector:
-    """Service for detecting duplicate transactions"""
 
-    def __init__(self, db: Session):
-        self.db = db
-        self._hash_cache: set[TransactionHash] | None = None
-        self._cached_account_id: int | None = None
+class DateToleranceIndex:
+    """
+    Existing transactions bucketed by amount, each bucket sorted by date.
 
-    def build_hash_set(self, account_id: int) -> set[TransactionHash]:
-        """
-        Build a set of transaction hashes for an account.
+    A row is matched by binary-searching its amount's bucket for dates within
+    the tolerance and comparing normalized descriptions, so checking n rows
+    against m transactions costs O((n + m) log m) rather than O(n * m).
+    Each existing transaction absorbs at most one row, so two real
+    purchases a day apart are not both hidden by one stored transaction.
+    """
 
-        Args:
-            account_id: The account to load transactions for
+    def __init__(self, tolerance_days: int, match_posted_date: bool):
+        self.tolerance = timedelta(days=tolerance_days)
+        self.match_posted_date = match_posted_date
+        # amount -> (sorted dates, transaction index per date)
+        self._buckets: dict[int, tuple[list[date], list[int]]] = {}
+        self._descriptions: list[str] = []
+        self._used: set[int] = set()
+
+    @classmethod
+    def build(
+        cls,
+        rows: Iterable[tuple[date, date | None, str, int]],
+        tolerance_days: int,
+        match_posted_date: bool,
+    ) -> "DateToleranceIndex":
+        """Index (transaction_date, posted_date, description, amount) rows"""
+        index = cls(tolerance_days, match_posted_date)
+        entries: dict[int, list[tuple[date, int]]] = {}
+        for txn_date, posted_date, description, amount in rows:
+            position = len(index._descriptions)
+            index._descriptions.append(description.lower().strip())
+            bucket = entries.setdefault(amount, [])
+            bucket.append((txn_date, position))
+            if match_posted_date and posted_date not in (None, txn_date):
+                bucket.append((posted_date, position))
+
+        for amount, bucket in entries.items():
+            bucket.sort()
+            index._buckets[amount] = (
+                [entry_date for entry_date, _ in bucket],
+                [position for _, position in bucket],
+            )
+        return index
+
+    def claim(
+        self,
+        transaction_date: date,
+        posted_date: date | None,
+        description: str,
+        amount: int,
+    ) -> bool:
+        """
+        Match a row to the nearest unclaimed transaction and claim it
 
         Returns:
-            Set of TransactionHash objects for duplicate checking
+            True if a matching transaction was found
         """
-        # Return cached set if available for same account
-        if self._hash_cache is not None and self._cached_account_id == account_id:
-            return self._hash_cache
+        bucket = self._buckets.get(amount)
+        if bucket is None:
+            return False
+        dates, positions = bucket
+        description = description.lower().strip()
 
-        stmt = select(Transaction).where(
-            Transaction.account_id == account_id,
-            Transaction.is_active.is_(True),
-        )
-        transactions = list(self.db.scalars(stmt))
+        row_dates = [transaction_date]
+        if self.match_posted_date and posted_date not in (None, transaction_date):
+            row_dates.append(posted_date)
 
-        self._hash_cache = {
-            TransactionHash.from_transaction(txn) for txn in transactions
-        }
-        self._cached_account_id = account_id
+        best: tuple[timedelta, int] | None = None
+        for row_date in row_dates:
+            lo = bisect_left(dates, row_date - self.tolerance)
+            hi = bisect_right(dates, row_date + self.tolerance)
+            for i in range(lo, hi):
+                position = positions[i]
+                if (
+                    position in self._used
+                    or self._descriptions[position] != description
+                ):
+                    continue
+                distance = abs(dates[i] - row_date)
+                if best is None or distance < best[0]:
+                    best = (distance, position)
 
-        return self._hash_cache
+        if best is None:
+            return False
+        self._used.add(best[1])
+        return True
+
+
+class DuplicateDetector:
+    """Service for detecting duplicate transactions"""
+
+    def __init__(
+        self,
+        db: Session,
+        fingerprint_cache: FingerprintCache | None = None,
+        date_tolerance_days: int = 0,
+        match_posted_date: bool = False,
+    ):
+        self.db = db
+        # Tolerance mode: also match rows whose dates are up to this many days
+        # off, and optionally rows whose posted and transaction dates are swapped
+        self.date_tolerance_days = date_tolerance_days
+        self.match_posted_date = match_posted_date
+        # Shared across requests
+        self.fingerprint_cache = fingerprint_cache or get_fingerprint_cache()
 
     def is_duplicate(
         self,
@@ -116,7 +221,6 @@ class DuplicateDetector:
         Returns:
             True if this transaction already exists
         """
-        hash_set = self.build_hash_set(account_id)
         txn_hash = TransactionHash.from_parsed_row(
             account_id=account_id,
             transaction_date=transaction_date,
@@ -124,7 +228,84 @@ class DuplicateDetector:
             transaction_type=transaction_type,
             amount=amount,
         )
-        return txn_hash in hash_set
+        return txn_hash in self.find_existing(account_id, [txn_hash])
+
+    def known_fingerprints(
+        self, account_id: int, start: date = date.min, end: date = date.max
+    ) -> FingerprintSet:
+        """
+        Fingerprints of the account's active transactions, from the shared cache
+
+        Args:
+            account_id: Account ID
+            start: First transaction date needed
+            end: Last transaction date needed
+
+        Returns:
+            At least the fingerprints of transactions dated start through end
+        """
+        return self.fingerprint_cache.get(
+            account_id,
+            lambda start, end: self._load_fingerprints(account_id, start, end),
+            start,
+            end,
+        )
+
+    def _load_fingerprints(self, account_id: int, start: date, end: date) -> list[int]:
+        stmt = select(Transaction.fingerprint).where(
+            Transaction.account_id == account_id,
+            Transaction.is_active.is_(True),
+            Transaction.fingerprint.is_not(None),
+            Transaction.transaction_date.between(start, end),
+        )
+        return list(self.db.scalars(stmt))
+
+    def find_existing(
+        self, account_id: int, hashes: Iterable[TransactionHash]
+    ) -> set[TransactionHash]:
+        """
+        Find which of the given hashes already exist as active transactions.
+
+        Looks candidates up by the indexed fingerprint column, a batch of
+        fingerprints per query, then compares the full hashed fields so a
+        fingerprint collision can never mark a row as a duplicate.
+
+        Args:
+            account_id: Account ID to check against
+            hashes: Hashes of the rows being checked
+
+        Returns:
+            The subset of hashes that match an existing transaction
+        """
+        by_fingerprint: dict[int, list[TransactionHash]] = {}
+        for txn_hash in hashes:
+            by_fingerprint.setdefault(txn_hash.fingerprint, []).append(txn_hash)
+
+        fingerprints = list(by_fingerprint)
+        existing: set[TransactionHash] = set()
+        for start in range(0, len(fingerprints), FINGERPRINT_LOOKUP_BATCH):
+            stmt = select(
+                Transaction.transaction_date,
+                Transaction.description,
+                Transaction.amount,
+            ).where(
+                Transaction.fingerprint.in_(
+                    fingerprints[start : start + FINGERPRINT_LOOKUP_BATCH]
+                ),
+                Transaction.account_id == account_id,
+                Transaction.is_active.is_(True),
+            )
+            existing.update(
+                TransactionHash.from_columns(account_id, txn_date, description, amount)
+                for txn_date, description, amount in self.db.execute(stmt)
+            )
+
+        return {
+            txn_hash
+            for candidates in by_fingerprint.values()
+            for txn_hash in candidates
+            if txn_hash in existing
+        }
 
     def check_duplicates(
         self,
@@ -139,27 +320,174 @@ class DuplicateDetector:
             parsed_transactions: List of parsed transaction dicts
 
         Returns:
-            Same list with 'is_duplicate' field updated
+            Same list with 'is_duplicate' and 'fingerprint' fields updated;
+            the fingerprint is the one the row will be stored with
+        """
+        fingerprints, flags = self._flag_duplicates(
+            account_id,
+            [
+                self._normalize_date(t.get("transaction_date"))
+                for t in parsed_transactions
+            ],
+            [self._normalize_date(t.get("posted_date")) for t in parsed_transactions],
+            [t.get("description", "") for t in parsed_transactions],
+            [t.get("amount", 0) for t in parsed_transactions],
+            [t.get("transaction_type", "DEBIT") for t in parsed_transactions],
+        )
+        for txn, fingerprint, is_duplicate in zip(
+            parsed_transactions, fingerprints, flags, strict=True
+        ):
+            txn["fingerprint"] = fingerprint
+            txn["is_duplicate"] = is_duplicate
+        return parsed_transactions
+
+    def check_batch(self, account_id: int, batch: ParsedBatch) -> ParsedBatch:
         """
-        hash_set = self.build_hash_set(account_id)
+        Check a parsed batch for duplicates, column by column.
 
-        for txn in parsed_transactions:
+        Args:
+            account_id: Account ID to check against
+            batch: Parsed rows from an import file
+
+        Returns:
+            Same batch with is_duplicate and fingerprints set; the fingerprint
+            is the one the row will be stored with
+        """
+        batch.fingerprints, batch.is_duplicate = self._flag_duplicates(
+            account_id,
+            batch.transaction_dates,
+            batch.posted_dates,
+            batch.descriptions,
+            batch.amounts,
+            batch.transaction_types,
+        )
+        return batch
+
+    def _flag_duplicates(
+        self,
+        account_id: int,
+        transaction_dates: Sequence[date | None],
+        posted_dates: Sequence[date | None],
+        descriptions: Sequence[str],
+        amounts: Sequence[int],
+        transaction_types: Sequence[str],
+    ) -> tuple[list[int | None], list[bool]]:
+        """
+        Fingerprint rows given as columns and flag those already imported
+
+        Returns:
+            Tuple of (fingerprint of each row, None if it has no transaction
+            date; whether each row is a duplicate)
+        """
+        fingerprints: list[int | None] = []
+        row_hashes: list[TransactionHash | None] = []
+        for txn_date, description, amount, transaction_type in zip(
+            transaction_dates, descriptions, amounts, transaction_types, strict=True
+        ):
             # Skip if no valid transaction date
-            txn_date = self._normalize_date(txn.get("transaction_date"))
             if txn_date is None:
-                txn["is_duplicate"] = False
+                fingerprints.append(None)
+                row_hashes.append(None)
                 continue
 
-            txn_hash = TransactionHash.from_parsed_row(
-                account_id=account_id,
-                transaction_date=txn_date,
-                description=txn.get("description", ""),
-                transaction_type=txn.get("transaction_type", "DEBIT"),
-                amount=txn.get("amount", 0),
+            fingerprints.append(
+                transaction_fingerprint(
+                    account_id, txn_date, description, direction_of(amount), amount
+                )
+            )
+            row_hashes.append(
+                TransactionHash.from_parsed_row(
+                    account_id=account_id,
+                    transaction_date=txn_date,
+                    description=description,
+                    transaction_type=transaction_type,
+                    amount=amount,
+                )
             )
-            txn["is_duplicate"] = txn_hash in hash_set
 
-        return parsed_transactions
+        # The cached fingerprints rule out most rows without touching the database;
+        # only rows whose fingerprint is known are confirmed with a query
+        dated = [h for h in row_hashes if h is not None]
+        if not dated:
+            return fingerprints, [False] * len(row_hashes)
+        # Only the statement's dates are needed; the tolerance margin lets the
+        # cached window cover neighbouring statements of the same account too
+        tolerance = timedelta(days=self.date_tolerance_days)
+        known = self.known_fingerprints(
+            account_id,
+            min(h.transaction_date for h in dated) - tolerance,
+            max(h.transaction_date for h in dated) + tolerance,
+        )
+        found = contains_many(known, [h.fingerprint for h in dated])
+        candidates = [h for h, hit in zip(dated, found, strict=True) if hit]
+        existing = self.find_existing(account_id, candidates)
+        flags = [
+            txn_hash is not None and txn_hash in existing for txn_hash in row_hashes
+        ]
+
+        if self.tolerance_enabled:
+            self._check_with_tolerance(
+                account_id,
+                transaction_dates,
+                posted_dates,
+                descriptions,
+                amounts,
+                flags,
+            )
+
+        return fingerprints, flags
+
+    @property
+    def tolerance_enabled(self) -> bool:
+        """Whether rows are also matched with shifted or swapped dates"""
+        return self.date_tolerance_days > 0 or self.match_posted_date
+
+    def _check_with_tolerance(
+        self,
+        account_id: int,
+        transaction_dates: Sequence[date | None],
+        posted_dates: Sequence[date | None],
+        descriptions: Sequence[str],
+        amounts: Sequence[int],
+        flags: list[bool],
+    ) -> None:
+        """Flag rows that match an existing transaction within the date tolerance"""
+        rows = [
+            i for i, txn_date in enumerate(transaction_dates) if txn_date is not None
+        ]
+        if not rows:
+            return
+
+        # Any match lies within the tolerance of some date in this chunk
+        tolerance = timedelta(days=self.date_tolerance_days)
+        row_dates = [
+            d for i in rows for d in (transaction_dates[i], posted_dates[i]) if d
+        ]
+        start, end = min(row_dates) - tolerance, max(row_dates) + tolerance
+        date_match = Transaction.transaction_date.between(start, end)
+        if self.match_posted_date:
+            date_match = date_match | Transaction.posted_date.between(start, end)
+        stmt = select(
+            Transaction.transaction_date,
+            Transaction.posted_date,
+            Transaction.description,
+            Transaction.amount,
+        ).where(
+            Transaction.account_id == account_id,
+            Transaction.is_active.is_(True),
+            date_match,
+        )
+        index = DateToleranceIndex.build(
+            self.db.execute(stmt), self.date_tolerance_days, self.match_posted_date
+        )
+
+        # Exact duplicates claim their transaction first so a shifted copy
+        # of the same purchase is not matched against it a second time
+        for i in sorted(rows, key=lambda i: not flags[i]):
+            claimed = index.claim(
+                transaction_dates[i], posted_dates[i], descriptions[i], amounts[i]
+            )
+            flags[i] = flags[i] or claimed
 
     @staticmethod
     def _normalize_date(value: date | datetime | str | None) -> date | None:
@@ -176,8 +504,3 @@ class DuplicateDetector:
             except ValueError:
                 return None
         return None
-
-    def clear_cache(self):
-        """Clear the hash cache"""
-        self._hash_cache = None
-        self._cached_account_id = None
@@ -0,0 +1,165 @@
+"""
+Historical duplicate sweep over an account's existing transactions
+Finds transactions that were stored twice (imported before duplicate detection
+existed, or entered by hand) and soft-deletes the groups a user confirms
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import Transaction
+from repositories.transaction_repository import TransactionRepository
+from schemas.transaction import DuplicateGroup, DuplicateSweepResult
+from services.fingerprint_cache import get_fingerprint_cache
+from services.import_service import ProgressCallback
+
+# Rows fetched per round trip while streaming the ledger
+SWEEP_BATCH_SIZE = 1000
+
+
+class DuplicateSweepService:
+    """Finds and resolves duplicate transactions already in the ledger"""
+
+    def __init__(self, db: Session, batch_size: int = SWEEP_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.transaction_repo = TransactionRepository(db)
+
+    def find_duplicates(
+        self, account_id: int, progress_callback: ProgressCallback | None = None
+    ) -> DuplicateSweepResult:
+        """
+        Sort-merge an account's active transactions into duplicate groups.
+
+        The database sorts the ledger by (amount, date) and the rows are
+        streamed with yield_per, so only the current run of equal amount and
+        date is held in memory. Descriptions are normalized and compared in
+        Python within that run, the same way resolve() compares them.
+
+        Args:
+            account_id: The account to sweep
+            progress_callback: Optional callback reporting rows scanned
+
+        Returns:
+            DuplicateSweepResult with every group of two or more transactions
+        """
+        conditions = (
+            Transaction.account_id == account_id,
+            Transaction.is_active.is_(True),
+        )
+        total = self.db.scalar(
+            select(func.count()).select_from(Transaction).where(*conditions)
+        )
+        stmt = (
+            select(
+                Transaction.transaction_id,
+                Transaction.amount,
+                Transaction.transaction_date,
+                Transaction.description,
+            )
+            .where(*conditions)
+            .order_by(
+                Transaction.amount,
+                Transaction.transaction_date,
+                Transaction.transaction_id,
+            )
+            .execution_options(yield_per=self.batch_size)
+        )
+
+        groups: list[DuplicateGroup] = []
+        run_key: tuple[int, date] | None = None
+        run: dict[str, list[int]] = {}
+        scanned = 0
+        for transaction_id, amount, transaction_date, description in self.db.execute(
+            stmt
+        ):
+            key = (amount, transaction_date)
+            if key != run_key:
+                self._close_run(groups, run_key, run)
+                run_key, run = key, {}
+            run.setdefault(description.lower().strip(), []).append(transaction_id)
+
+            scanned += 1
+            if progress_callback is not None and scanned % self.batch_size == 0:
+                progress_callback(scanned, total)
+        self._close_run(groups, run_key, run)
+
+        if progress_callback is not None:
+            progress_callback(scanned, total)
+        return DuplicateSweepResult(
+            account_id=account_id, transactions_scanned=scanned, groups=groups
+        )
+
+    def resolve(self, groups: Sequence[Sequence[int]]) -> int:
+        """
+        Soft-delete confirmed duplicate groups, keeping the oldest of each
+
+        Args:
+            groups: Transaction IDs of each confirmed group
+
+        Returns:
+            Number of transactions soft-deleted
+
+        Raises:
+            ValueError: If a transaction does not exist, or a group's
+                transactions do not share account, amount, date and description
+        """
+        requested = {transaction_id for group in groups for transaction_id in group}
+        stmt = select(
+            Transaction.transaction_id,
+            Transaction.account_id,
+            Transaction.amount,
+            Transaction.transaction_date,
+            Transaction.description,
+        ).where(Transaction.transaction_id.in_(requested))
+        keys = {
+            transaction_id: (account_id, amount, txn_date, description.lower().strip())
+            for transaction_id, account_id, amount, txn_date, description in (
+                self.db.execute(stmt)
+            )
+        }
+
+        missing = sorted(requested - keys.keys())
+        if missing:
+            raise ValueError(f"Transactions not found: {missing}")
+
+        to_delete: list[int] = []
+        for group in groups:
+            if len({keys[transaction_id] for transaction_id in group}) > 1:
+                raise ValueError(f"Transactions {list(group)} are not duplicates")
+            to_delete.extend(sorted(group)[1:])
+
+        deleted = self.transaction_repo.bulk_soft_delete(to_delete)
+        self.db.commit()
+
+        # The bulk UPDATE skipped the ORM events that keep the cache current
+        fingerprint_cache = get_fingerprint_cache()
+        for account_id in {keys[transaction_id][0] for transaction_id in to_delete}:
+            fingerprint_cache.invalidate(account_id)
+        return deleted
+
+    @staticmethod
+    def _close_run(
+        groups: list[DuplicateGroup],
+        key: tuple[int, date] | None,
+        run: dict[str, list[int]],
+    ) -> None:
+        """Record the descriptions of a finished run that hold a duplicate"""
+        if key is None:
+            return
+        amount, transaction_date = key
+        for description in sorted(run):
+            transaction_ids = run[description]
+            if len(transaction_ids) < 2:
+                continue
+            groups.append(
+                DuplicateGroup(
+                    amount=amount,
+                    transaction_date=transaction_date,
+                    description=description,
+                    transaction_ids=transaction_ids,
+                )
+            )
@@ -0,0 +1,249 @@
+"""
+Content-addressed store for uploaded import files
+
+Every upload is saved once under the SHA-256 of its bytes, so re-uploading a
+statement stores nothing new and a batch can be parsed again later from its
+content_hash alone. Parse results are memoized next to the file, keyed by
+template ID and the template's modified_at, so an identical re-upload skips
+parsing until its template changes. reap() deletes uploads nobody has sent
+for a while, and memos that can no longer be used.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import time
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import BinaryIO
+
+import config
+from models import ImportTemplate
+from services.parsers import ParsedBatch
+
+# Bump when parser output changes so results memoized by older code are ignored
+PARSE_MEMO_VERSION = 2
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# {content_hash}.v{PARSE_MEMO_VERSION}.t{template_id}.{stamp}.parsed
+_MEMO_NAME = re.compile(
+    r"(?P<hash>[0-9a-f]+)\.v(?P<version>\d+)\.t(?P<template_id>\d+)"
+    r"\.(?P<stamp>[^.]+)\.parsed"
+)
+
+
+@dataclass(frozen=True)
+class ReapedFiles:
+    """What deleting stale stored files reclaimed"""
+
+    files: int = 0  # Uploads, memos and abandoned temporary files
+    bytes: int = 0
+
+
+class FileStore:
+    """Stores files by content hash, with memoized parse results per template"""
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Directory holding the files, fanned out by hash prefix
+        """
+        self.root = Path(root)
+
+    def put(self, file: BinaryIO) -> str:
+        """
+        Store a file's content if it is not stored already
+
+        Args:
+            file: Binary file object, read from the start and left at 0
+
+        Returns:
+            The content hash to open the file with later
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            file.seek(0)
+            with os.fdopen(fd, "wb") as out:
+                while chunk := file.read(_COPY_BUFFER_SIZE):
+                    digest.update(chunk)
+                    out.write(chunk)
+            content_hash = digest.hexdigest()
+            path = self.path(content_hash)
+            try:
+                # Ages count from the latest upload, see reap()
+                os.utime(path)
+            except FileNotFoundError:
+                path.parent.mkdir(exist_ok=True)
+                os.replace(tmp_name, path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+            file.seek(0)
+        return content_hash
+
+    def path(self, content_hash: str) -> Path:
+        """Where a file with this content hash is stored"""
+        return self.root / content_hash[:2] / content_hash
+
+    def exists(self, content_hash: str) -> bool:
+        """Check if a file is stored"""
+        return self.path(content_hash).is_file()
+
+    def open(self, content_hash: str) -> BinaryIO:
+        """
+        Open a stored file for reading
+
+        Raises:
+            FileNotFoundError: If no file with this hash is stored
+        """
+        return open(self.path(content_hash), "rb")
+
+    def load_parsed(
+        self, content_hash: str, template: ImportTemplate
+    ) -> Iterator[ParsedBatch] | None:
+        """
+        Get the memoized parse of a file with a template, if there is one
+
+        Returns:
+            The parsed batches in the chunks they were saved in, or None if the
+            file has not been parsed with this version of the template
+        """
+        path = self._memo_path(content_hash, template)
+        if not path.is_file():
+            return None
+        return self._read_chunks(path)
+
+    def memoize_parsed(
+        self,
+        content_hash: str,
+        template: ImportTemplate,
+        chunks: Iterable[ParsedBatch],
+    ) -> Iterator[ParsedBatch]:
+        """
+        Pass parsed chunks through, saving them as the file's memoized parse
+
+        The memo is written chunk by chunk and only kept once every chunk has
+        been read, so a failed or abandoned parse leaves nothing behind.
+        Memos of older versions of the template are replaced.
+        """
+        path = self._memo_path(content_hash, template)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chunks:
+                    pickle.dump(chunk, out, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield chunk
+            for stale in path.parent.glob(
+                f"{content_hash}.*.t{template.template_id}.*.parsed"
+            ):
+                stale.unlink(missing_ok=True)
+            os.replace(tmp_name, path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def reap(
+        self,
+        max_age_hours: int,
+        keep: Collection[str],
+        templates: Iterable[ImportTemplate],
+    ) -> ReapedFiles:
+        """
+        Delete stored files that are no longer needed
+
+        Uploads not sent again for max_age_hours go, unless a batch still
+        needs them, and so do their memos. Memos of an older
+        PARSE_MEMO_VERSION or of a template that has changed or is gone are
+        deleted whatever their age.
+
+        Args:
+            max_age_hours: Uploads older than this many hours are deleted
+            keep: Content hashes of uploads to keep regardless of age
+            templates: Every existing template
+
+        Returns:
+            The number of files and bytes deleted
+        """
+        if not self.root.is_dir():
+            return ReapedFiles()
+        cutoff = time.time() - max_age_hours * 60 * 60
+        stamps = {t.template_id: _memo_stamp(t) for t in templates}
+
+        # Temporary files of put() sit at the top, the rest one level down
+        stale = [p for p in self.root.glob("*.tmp") if p.stat().st_mtime < cutoff]
+        for directory in self.root.iterdir():
+            if directory.is_dir():
+                stale += self._stale_in(directory, cutoff, keep, stamps)
+
+        files = 0
+        size = 0
+        for path in stale:
+            try:
+                size += path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            files += 1
+        return ReapedFiles(files=files, bytes=size)
+
+    @staticmethod
+    def _stale_in(
+        directory: Path,
+        cutoff: float,
+        keep: Collection[str],
+        stamps: dict[int, str],
+    ) -> list[Path]:
+        """Files of one hash-prefix directory that reap() should delete"""
+        stale: list[Path] = []
+        kept: set[str] = set()
+        memos: list[Path] = []
+        for path in directory.iterdir():
+            if path.suffix == ".parsed":
+                memos.append(path)
+            elif path.name in keep or path.stat().st_mtime >= cutoff:
+                kept.add(path.name)
+            else:
+                stale.append(path)
+
+        for path in memos:
+            memo = _MEMO_NAME.fullmatch(path.name)
+            if (
+                memo is None
+                or memo["hash"] not in kept
+                or int(memo["version"]) != PARSE_MEMO_VERSION
+                or stamps.get(int(memo["template_id"])) != memo["stamp"]
+            ):
+                stale.append(path)
+        return stale
+
+    def _memo_path(self, content_hash: str, template: ImportTemplate) -> Path:
+        return self.path(content_hash).with_name(
+            f"{content_hash}.v{PARSE_MEMO_VERSION}"
+            f".t{template.template_id}.{_memo_stamp(template)}.parsed"
+        )
+
+    @staticmethod
+    def _read_chunks(path: Path) -> Iterator[ParsedBatch]:
+        with open(path, "rb") as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    return
+
+
+def _memo_stamp(template: ImportTemplate) -> str:
+    """The version of a template its memos are keyed by"""
+    return template.modified_at.strftime("%Y%m%dT%H%M%S%f")
+
+
+@cache
+def get_file_store() -> FileStore:
+    """The process-wide import file store"""
+    return FileStore(config.IMPORT_FILE_DIR)
@@ -0,0 +1,327 @@
+"""
+Process-wide cache of transaction fingerprints for duplicate detection
+
+An account's active fingerprints are loaded for the dates a statement
+covers and shared by every request, so back-to-back previews for the same
+account skip the reload, and a later statement that reaches past the
+cached dates only loads the days it adds.
+Accounts are evicted least recently used first to stay within a memory
+budget. ORM writes to transactions keep cached accounts current through
+mapper events, applied once the session commits; Core bulk inserts call
+add() themselves after committing.
+
+In compact mode (the default) an account's fingerprints are packed into a
+sorted int64 array, 8 bytes each instead of a Python int in a set.
+
+Entries may hold fingerprints that no longer exist (rolled back or edited
+transactions). That is safe because matches are always confirmed against
+the database; a missing fingerprint is not, so every insert must reach
+the cache.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date, timedelta
+from functools import cache
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+import config
+from models import Transaction
+
+# Approximate size of one cached fingerprint: the int object plus its set slot
+BYTES_PER_FINGERPRINT = 48
+
+
+class PackedFingerprints:
+    """
+    Fingerprints packed into a sorted int64 array
+
+    Lookups binary-search the array. Fingerprints added later go into a small
+    set that is merged into the array once it grows past MERGE_THRESHOLD, so
+    write-through does not copy the array on every insert.
+    """
+
+    MERGE_THRESHOLD = 4096
+
+    def __init__(self, fingerprints: Iterable[int] = ()):
+        self._packed = np.unique(np.fromiter(fingerprints, dtype=np.int64))
+        self._recent: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._packed) + len(self._recent)
+
+    def __iter__(self) -> Iterator[int]:
+        yield from self._packed.tolist()
+        yield from self._recent
+
+    def __contains__(self, fingerprint: int) -> bool:
+        if fingerprint in self._recent:
+            return True
+        index = np.searchsorted(self._packed, fingerprint)
+        return index < len(self._packed) and self._packed[index] == fingerprint
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held by the array and the unmerged additions"""
+        recent = sys.getsizeof(self._recent) + BYTES_PER_FINGERPRINT * len(self._recent)
+        return self._packed.nbytes + recent
+
+    def update(self, fingerprints: Iterable[int]) -> None:
+        """Add fingerprints, merging them into the array in batches"""
+        self._recent.update(fingerprints)
+        if len(self._recent) > self.MERGE_THRESHOLD:
+            recent = np.fromiter(self._recent, dtype=np.int64, count=len(self._recent))
+            self._packed = np.union1d(self._packed, recent)
+            self._recent = set()
+
+    def contains_many(self, fingerprints: Sequence[int]) -> list[bool]:
+        """Vectorized membership test for many fingerprints at once"""
+        if not fingerprints:
+            return []
+        values = np.fromiter(fingerprints, dtype=np.int64, count=len(fingerprints))
+        if len(self._packed):
+            index = np.searchsorted(self._packed, values)
+            index[index == len(self._packed)] = 0
+            found = self._packed[index] == values
+        else:
+            found = np.zeros(len(values), dtype=bool)
+        if self._recent:
+            found |= np.fromiter(
+                (fp in self._recent for fp in fingerprints),
+                dtype=bool,
+                count=len(values),
+            )
+        return found.tolist()
+
+
+FingerprintSet = set[int] | PackedFingerprints
+
+# Loads an account's active fingerprints dated within [start, end]
+FingerprintLoader = Callable[[date, date], Iterable[int]]
+
+
+def contains_many(known: FingerprintSet, fingerprints: Sequence[int]) -> list[bool]:
+    """Which of the fingerprints are in a cached account's set"""
+    if isinstance(known, PackedFingerprints):
+        return known.contains_many(fingerprints)
+    return [fp in known for fp in fingerprints]
+
+
+class FingerprintCache:
+    """LRU cache of account_id -> active transaction fingerprints in a date window"""
+
+    def __init__(self, max_bytes: int, compact: bool = True):
+        self.max_bytes = max_bytes
+        # Store each account as PackedFingerprints instead of a set of ints
+        self.compact = compact
+        self._entries: OrderedDict[int, FingerprintSet] = OrderedDict()
+        self._sizes: dict[int, int] = {}
+        # Transaction dates each cached entry is complete for, inclusive
+        self._windows: dict[int, tuple[date, date]] = {}
+        # Bumped on every write so a load that raced with one is not stored
+        self._versions: dict[int, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Estimated memory held by all cached accounts"""
+        return self._total_bytes
+
+    def __contains__(self, account_id: int) -> bool:
+        return account_id in self._entries
+
+    def get(
+        self,
+        account_id: int,
+        loader: FingerprintLoader,
+        start: date = date.min,
+        end: date = date.max,
+    ) -> FingerprintSet:
+        """
+        Get an account's fingerprints for a date window, loading on a miss
+
+        A cached entry that overlaps the window is extended by loading only
+        the dates it lacks; one that does not is replaced.
+
+        Args:
+            account_id: The account to look up
+            loader: Returns the account's active fingerprints dated in a window
+            start: First transaction date needed
+            end: Last transaction date needed
+
+        Returns:
+            At least the account's fingerprints dated in the window; treat
+            as read-only
+        """
+        with self._lock:
+            entry = self._entries.get(account_id)
+            if entry is not None:
+                self._entries.move_to_end(account_id)
+                covered_start, covered_end = self._windows[account_id]
+                if covered_start <= start and end <= covered_end:
+                    return entry
+                if end < covered_start or covered_end < start:
+                    entry = None
+            version = self._versions.get(account_id, 0)
+
+        if entry is not None:
+            extended = self._extend(
+                account_id, entry, (covered_start, covered_end), loader, start, end
+            )
+            if extended is not None:
+                return extended
+
+        # Load outside the lock so other accounts are not blocked on the query
+        loaded = loader(start, end)
+        fingerprints = PackedFingerprints(loaded) if self.compact else set(loaded)
+        size = self._estimate(fingerprints)
+
+        with self._lock:
+            if self._versions.get(account_id, 0) != version or size > self.max_bytes:
+                return fingerprints
+            self._store(account_id, fingerprints, size, (start, end))
+            self._evict()
+        return fingerprints
+
+    def _extend(
+        self,
+        account_id: int,
+        entry: FingerprintSet,
+        covered: tuple[date, date],
+        loader: FingerprintLoader,
+        start: date,
+        end: date,
+    ) -> FingerprintSet | None:
+        """
+        Load the days of the window a cached entry does not cover yet
+
+        Returns:
+            The extended entry, or None if it was dropped during the load
+        """
+        covered_start, covered_end = covered
+        one_day = timedelta(days=1)
+        added: list[int] = []
+        if start < covered_start:
+            added.extend(loader(start, covered_start - one_day))
+        if covered_end < end:
+            added.extend(loader(covered_end + one_day, end))
+
+        with self._lock:
+            # Writes since the lookup went through add(), so the entry is
+            # still complete unless it was invalidated meanwhile
+            if self._entries.get(account_id) is not entry:
+                return None
+            entry.update(added)
+            self._windows[account_id] = (
+                min(start, covered_start),
+                max(end, covered_end),
+            )
+            self._resize(account_id)
+            self._evict()
+        return entry
+
+    def add(self, account_id: int, fingerprints: Iterable[int]) -> None:
+        """Record new fingerprints for an account, if it is cached"""
+        with self._lock:
+            self._versions[account_id] = self._versions.get(account_id, 0) + 1
+            entry = self._entries.get(account_id)
+            if entry is None:
+                return
+            entry.update(fingerprints)
+            self._resize(account_id)
+            self._evict()
+
+    def invalidate(self, account_id: int) -> None:
+        """Drop an account so its next lookup reloads from the database"""
+        with self._lock:
+            self._versions[account_id] = self._versions.get(account_id, 0) + 1
+            self._discard(account_id)
+
+    def clear(self) -> None:
+        """Drop every cached account"""
+        with self._lock:
+            for account_id in list(self._entries):
+                self._versions[account_id] = self._versions.get(account_id, 0) + 1
+                self._discard(account_id)
+
+    def _store(
+        self,
+        account_id: int,
+        fingerprints: FingerprintSet,
+        size: int,
+        window: tuple[date, date],
+    ) -> None:
+        self._discard(account_id)
+        self._entries[account_id] = fingerprints
+        self._windows[account_id] = window
+        self._sizes[account_id] = size
+        self._total_bytes += size
+
+    def _resize(self, account_id: int) -> None:
+        size = self._estimate(self._entries[account_id])
+        self._total_bytes += size - self._sizes[account_id]
+        self._sizes[account_id] = size
+
+    def _discard(self, account_id: int) -> None:
+        if self._entries.pop(account_id, None) is not None:
+            self._total_bytes -= self._sizes.pop(account_id)
+            del self._windows[account_id]
+
+    def _evict(self) -> None:
+        """Drop least recently used accounts until within the budget"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            self._discard(next(iter(self._entries)))
+
+    @staticmethod
+    def _estimate(fingerprints: FingerprintSet) -> int:
+        if isinstance(fingerprints, PackedFingerprints):
+            return fingerprints.nbytes
+        return sys.getsizeof(fingerprints) + BYTES_PER_FINGERPRINT * len(fingerprints)
+
+
+@cache
+def get_fingerprint_cache() -> FingerprintCache:
+    """The process-wide fingerprint cache"""
+    return FingerprintCache(
+        max_bytes=config.FINGERPRINT_CACHE_BYTES,
+        compact=config.FINGERPRINT_CACHE_COMPACT,
+    )
+
+
+# Session.info key of fingerprints flushed but not yet committed
+_PENDING_KEY = "pending_fingerprints"
+
+
+@event.listens_for(Transaction, "after_insert")
+@event.listens_for(Transaction, "after_update")
+def _record_write(mapper, connection, target: Transaction) -> None:
+    """Write-through for transactions saved with the ORM"""
+    if target.is_active and target.fingerprint is not None:
+        # Added on commit, so a concurrent load cannot miss the row and be cached
+        session = object_session(target)
+        pending = session.info.setdefault(_PENDING_KEY, [])
+        pending.append((target.account_id, target.fingerprint))
+    else:
+        # Soft-deleted: another transaction may share the fingerprint, so reload
+        get_fingerprint_cache().invalidate(target.account_id)
+
+
+@event.listens_for(Transaction, "after_delete")
+def _record_delete(mapper, connection, target: Transaction) -> None:
+    get_fingerprint_cache().invalidate(target.account_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    fingerprint_cache = get_fingerprint_cache()
+    for account_id, fingerprint in pending:
+        fingerprint_cache.add(account_id, [fingerprint])
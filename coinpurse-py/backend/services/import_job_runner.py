@@ -0,0 +1,307 @@
+"""
+Background runner for import jobs
+Runs ImportService previews and confirms (and duplicate sweeps) on a worker
+pool, off the event loop, and records their state in the background_jobs table
+so they survive a restart
+"""
+
+import shutil
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from sqlalchemy.orm import Session
+
+import config
+from database import SessionLocal
+from models import BackgroundJob, ImportStatus, JobStatus, JobType
+from repositories.background_job_repository import BackgroundJobRepository
+from repositories.import_batch_repository import ImportBatchRepository
+from schemas.import_batch import ImportConfirmResponse
+from services.duplicate_sweep import DuplicateSweepService
+from services.import_service import ImportService, ProgressCallback, ProgressStage
+
+
+class ImportJobRunner:
+    """Queues import jobs and executes them on a thread pool"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        upload_dir: Path,
+        max_workers: int = 1,
+        synchronous: bool = False,
+    ):
+        """
+        Args:
+            session_factory: Creates a new database session for each job
+            upload_dir: Directory where uploaded files wait for their job
+            max_workers: Number of jobs run concurrently
+            synchronous: If True, run jobs inline on submit (used by tests)
+        """
+        self.session_factory = session_factory
+        self.upload_dir = upload_dir
+        self._executor = (
+            None
+            if synchronous
+            else ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="import-job"
+            )
+        )
+        # Live progress of running jobs; confirms also persist theirs as each
+        # chunk commits, and every job when it finishes
+        self._progress: dict[int, tuple[int, int | None]] = {}
+        # Pipeline stage of running jobs that report one
+        self._stages: dict[int, ProgressStage] = {}
+        self._lock = threading.Lock()
+
+    def submit_preview(
+        self,
+        db: Session,
+        file: BinaryIO,
+        file_name: str,
+        account_id: int,
+        template_id: int,
+    ) -> BackgroundJob:
+        """
+        Save an upload to disk and queue a preview job for it
+
+        Args:
+            db: Session used to record the job
+            file: Binary file object (copied to upload_dir in chunks)
+            file_name: Original filename
+            account_id: Target account ID
+            template_id: Template used to parse the file
+
+        Returns:
+            The queued BackgroundJob
+        """
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.upload_dir / f"{uuid.uuid4().hex}.upload"
+        with open(file_path, "wb") as out:
+            shutil.copyfileobj(file, out)
+
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_PREVIEW,
+            account_id=account_id,
+            file_name=file_name,
+            file_path=str(file_path),
+            parameters={"template_id": template_id},
+        )
+        job = BackgroundJobRepository(db).create(job)
+        self._schedule(job.job_id)
+        return job
+
+    def submit_confirm(
+        self,
+        db: Session,
+        import_batch_id: int,
+        selected_rows: list[int],
+        category_overrides: dict[int, int] | None = None,
+    ) -> BackgroundJob:
+        """
+        Queue a confirm job for a PREVIEW batch
+
+        Args:
+            db: Session used to record the job
+            import_batch_id: The batch ID from preview
+            selected_rows: List of row numbers to import
+            category_overrides: Optional map of row_number -> coinpurse_category_id
+
+        Returns:
+            The queued BackgroundJob
+        """
+        batch = ImportBatchRepository(db).get_by_id(import_batch_id)
+        if batch is None:
+            raise ValueError(f"Batch {import_batch_id} not found")
+
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_CONFIRM,
+            account_id=batch.account_id,
+            import_batch_id=import_batch_id,
+            file_name=batch.file_name,
+            parameters={
+                "selected_rows": selected_rows,
+                "category_overrides": category_overrides or {},
+            },
+        )
+        job = BackgroundJobRepository(db).create(job)
+        self._schedule(job.job_id)
+        return job
+
+    def submit_duplicate_sweep(self, db: Session, account_id: int) -> BackgroundJob:
+        """
+        Queue a sweep of an account's ledger for duplicate transactions
+
+        Args:
+            db: Session used to record the job
+            account_id: The account to sweep
+
+        Returns:
+            The queued BackgroundJob
+        """
+        job = BackgroundJob(job_type=JobType.DUPLICATE_SWEEP, account_id=account_id)
+        job = BackgroundJobRepository(db).create(job)
+        self._schedule(job.job_id)
+        return job
+
+    def resume_unfinished(self) -> int:
+        """
+        Re-queue jobs left QUEUED or RUNNING by a previous process
+
+        Returns:
+            Number of jobs re-queued
+        """
+        with self.session_factory() as db:
+            jobs = BackgroundJobRepository(db).get_unfinished()
+            job_ids = [job.job_id for job in jobs]
+        for job_id in job_ids:
+            self._schedule(job_id)
+        return len(job_ids)
+
+    def get_progress(self, job_id: int) -> tuple[int, int | None] | None:
+        """Get live (current, total) progress for a job running in this process"""
+        with self._lock:
+            return self._progress.get(job_id)
+
+    def get_stage(self, job_id: int) -> ProgressStage | None:
+        """Get the pipeline stage of a job running in this process"""
+        with self._lock:
+            return self._stages.get(job_id)
+
+    def shutdown(self) -> None:
+        """Stop accepting work; queued jobs stay QUEUED and resume on next start"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, job_id: int) -> None:
+        """Execute a single job with its own session, recording the outcome"""
+        with self.session_factory() as db:
+            repo = BackgroundJobRepository(db)
+            job = repo.get_by_id(job_id)
+            if job is None or job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                return
+
+            # A RUNNING job here was interrupted by a restart
+            resumed = job.status == JobStatus.RUNNING
+            repo.mark_running(job)
+
+            try:
+                if job.job_type == JobType.IMPORT_PREVIEW:
+                    result, import_batch_id = self._run_preview(db, job)
+                elif job.job_type == JobType.DUPLICATE_SWEEP:
+                    result, import_batch_id = self._run_duplicate_sweep(db, job)
+                else:
+                    result, import_batch_id = self._run_confirm(db, job, resumed)
+            except Exception as e:
+                db.rollback()
+                repo.mark_failed(job, str(e))
+            else:
+                repo.mark_completed(
+                    job, result, import_batch_id, self.get_progress(job_id)
+                )
+            finally:
+                with self._lock:
+                    self._progress.pop(job_id, None)
+                    self._stages.pop(job_id, None)
+                # A finished job is never run again, whatever its outcome; a
+                # RUNNING one keeps its upload to resume after a restart
+                finished = job.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+                if finished and job.file_path:
+                    Path(job.file_path).unlink(missing_ok=True)
+
+    def _schedule(self, job_id: int) -> None:
+        if self._executor is None:
+            self.run(job_id)
+        else:
+            self._executor.submit(self.run, job_id)
+
+    def _progress_reporter(
+        self, job_id: int, job: BackgroundJob | None = None
+    ) -> ProgressCallback:
+        """
+        Build the progress callback of a job
+
+        Args:
+            job_id: The job reporting progress
+            job: The job's row in the session the work runs in; inserted rows
+                are recorded on it, so their count commits with each chunk
+                and a resumed confirm does not start from 0
+        """
+
+        def report(
+            current: int, total: int | None, stage: ProgressStage | None = None
+        ) -> None:
+            with self._lock:
+                self._progress[job_id] = (current, total)
+                if stage is not None:
+                    self._stages[job_id] = stage
+            if job is not None and stage == "inserted":
+                job.progress_current, job.progress_total = current, total
+
+        return report
+
+    def _run_preview(
+        self, db: Session, job: BackgroundJob
+    ) -> tuple[dict[str, Any], int]:
+        """Parse the saved upload into a PREVIEW batch"""
+        if not job.file_path or not Path(job.file_path).exists():
+            raise ValueError(f"Uploaded file for job {job.job_id} is missing")
+
+        service = ImportService(db)
+        with open(job.file_path, "rb") as file:
+            preview = service.upload_and_preview(
+                file=file,
+                file_name=job.file_name or "unknown",
+                account_id=job.account_id,
+                template_id=job.parameters["template_id"],
+                progress_callback=self._progress_reporter(job.job_id),
+            )
+        return (preview.summary.model_dump(mode="json"), preview.import_batch_id)
+
+    def _run_confirm(
+        self, db: Session, job: BackgroundJob, resumed: bool
+    ) -> tuple[dict[str, Any], int]:
+        """Import the selected rows of the job's batch"""
+        batch = ImportBatchRepository(db).get_by_id(job.import_batch_id)
+        if resumed and batch is not None and batch.status == ImportStatus.COMPLETED:
+            # The confirm committed before the restart; only the job was left behind
+            response = ImportConfirmResponse.model_validate(batch)
+            return (response.model_dump(mode="json"), batch.import_batch_id)
+
+        # JSON object keys come back as strings
+        overrides = {
+            int(row): category_id
+            for row, category_id in job.parameters.get("category_overrides", {}).items()
+        }
+        service = ImportService(db)
+        response = service.confirm_import(
+            import_batch_id=job.import_batch_id,
+            selected_rows=job.parameters.get("selected_rows", []),
+            category_overrides=overrides,
+            progress_callback=self._progress_reporter(job.job_id, job),
+        )
+        return (response.model_dump(mode="json"), response.import_batch_id)
+
+    def _run_duplicate_sweep(
+        self, db: Session, job: BackgroundJob
+    ) -> tuple[dict[str, Any], None]:
+        """Find candidate duplicate groups in the job's account"""
+        result = DuplicateSweepService(db).find_duplicates(
+            job.account_id, progress_callback=self._progress_reporter(job.job_id)
+        )
+        return (result.model_dump(mode="json"), None)
+
+
+@cache
+def get_import_job_runner() -> ImportJobRunner:
+    """FastAPI dependency that provides the process-wide import job runner"""
+    return ImportJobRunner(
+        session_factory=SessionLocal,
+        upload_dir=config.IMPORT_JOB_DIR,
+        max_workers=config.IMPORT_JOB_WORKERS,
+    )
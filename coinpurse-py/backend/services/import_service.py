@@ -3,43 +3,108 @@ Import orchestration service
 Coordinates file parsing, duplicate detection, category mapping, and transaction creation
 """
 
-from datetime import UTC, date, datetime
-from typing import Any, BinaryIO
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import BinaryIO, Literal, Protocol
 
 from sqlalchemy.orm import Session
 
+import config
 from models import (
     Account,
     FileFormat,
     ImportBatch,
     ImportStatus,
     ImportTemplate,
-    Transaction,
-    TransactionType,
 )
+from repositories.app_setting_repository import AppSettingRepository
 from repositories.import_batch_repository import ImportBatchRepository
+from repositories.import_staging_repository import ImportStagingRepository
 from repositories.import_template_repository import ImportTemplateRepository
+from repositories.transaction_repository import TransactionRepository
 from schemas.import_batch import (
+    BulkImportFilePreview,
+    BulkImportPreviewResponse,
     ImportConfirmResponse,
     ImportPreviewResponse,
     ImportPreviewSummary,
+    ImportRecategorizeResponse,
     ParsedTransaction,
 )
 from services.category_mapper import CategoryMapper
 from services.duplicate_detector import DuplicateDetector
-from services.parsers import CsvParser, ExcelParser
-from services.parsers.base_parser import ParsedRow
+from services.file_store import FileStore, get_file_store
+from services.parsers import (
+    DEFAULT_CHUNK_SIZE,
+    CsvParser,
+    ExcelParser,
+    get_template_plan,
+    parse_files,
+)
+from services.parsers.base_parser import BaseParser, ParsedBatch
+from services.template_index import TemplateMatch, get_template_index
+
+# Pipeline stage a progress report is about: a preview parses, categorizes
+# and deduplicates each chunk in turn, a confirm inserts the selected rows
+ProgressStage = Literal["parsed", "categorized", "deduplicated", "inserted"]
+
+
+class ProgressCallback(Protocol):
+    """Called with (rows processed so far, total rows or None while still unknown)"""
+
+    def __call__(
+        self, current: int, total: int | None, stage: ProgressStage | None = None
+    ) -> None: ...
+
+
+# How confirm_import copies staged rows into transactions:
+# - "insert_select": INSERT ... SELECT inside the database (default)
+# - "executemany": read the rows back and insert them with a Core executemany
+ConfirmMode = Literal["insert_select", "executemany"]
+
+
+@dataclass
+class BulkImportFile:
+    """One file of a bulk upload and the account it is imported into"""
+
+    file: BinaryIO
+    file_name: str
+    account_id: int
+    # Template to parse with instead of the account's own, e.g. a detected one
+    template_id: int | None = None
 
 
 class ImportService:
     """Orchestrates the transaction import process"""
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        page_size: int | None = None,
+        confirm_mode: ConfirmMode = "insert_select",
+        file_store: FileStore | None = None,
+        commit_rows: int | None = None,
+    ):
         self.db = db
+        self.confirm_mode = confirm_mode
+        self.chunk_size = chunk_size
+        # Rows a confirm inserts between commits
+        self.commit_rows = (
+            commit_rows if commit_rows is not None else config.CONFIRM_COMMIT_ROWS
+        )
+        # Rows returned with a preview; the rest are fetched page by page
+        self.page_size = (
+            page_size if page_size is not None else config.PREVIEW_PAGE_SIZE
+        )
         self.template_repo = ImportTemplateRepository(db)
         self.batch_repo = ImportBatchRepository(db)
+        self.staging_repo = ImportStagingRepository(db)
+        self.transaction_repo = TransactionRepository(db)
         self.duplicate_detector = DuplicateDetector(db)
         self.category_mapper = CategoryMapper(db)
+        self.file_store = file_store if file_store is not None else get_file_store()
 
     def upload_and_preview(
         self,
@@ -47,14 +112,21 @@ class ImportService:
         file_name: str,
         account_id: int,
         template_id: int,
+        progress_callback: ProgressCallback | None = None,
     ) -> ImportPreviewResponse:
         """
         Upload a file and generate a preview of transactions to import.
 
+        The file is kept in the file store. If it was already parsed with the
+        current version of the template, the memoized rows are used instead
+        of parsing it again.
+
         Args:
             file: Binary file object
             file_name: Original filename
             account_id: Target account ID
+            template_id: Template used to parse the file
+            progress_callback: Optional callback reporting rows processed
 
         Returns:
             ImportPreviewResponse with import_batch_id, summary, and transactions
@@ -69,44 +141,373 @@ class ImportService:
         if account is None:
             raise ValueError(f"Account {account_id} not found")
 
-        # Parse file
-        parsed_rows = self._parse_file(file, template)
+        content_hash = self.file_store.put(file)
+        return self._preview_stored_file(
+            account, template, file_name, content_hash, progress_callback
+        )
+
+    def reparse_batch(
+        self, import_batch_id: int, template_id: int | None = None
+    ) -> ImportPreviewResponse:
+        """
+        Parse a batch's stored file again into a new PREVIEW batch.
+
+        Used after its template was fixed, without uploading the file again.
+        A batch that was still a preview is replaced by the new one.
+
+        Args:
+            import_batch_id: The batch whose file to parse
+            template_id: Template to parse with; defaults to the batch's own
+
+        Returns:
+            ImportPreviewResponse for the new batch
+        """
+        batch = self.batch_repo.get_by_id(import_batch_id)
+        if batch is None:
+            raise ValueError(f"Batch {import_batch_id} not found")
+        if batch.content_hash is None or not self.file_store.exists(batch.content_hash):
+            raise ValueError(f"The file of batch {import_batch_id} is not stored")
+
+        template_id = template_id or batch.template_id
+        template = self.template_repo.get_by_id(template_id) if template_id else None
+        if template is None:
+            raise ValueError(f"Template {template_id} not found")
+
+        preview = self._preview_stored_file(
+            batch.account, template, batch.file_name, batch.content_hash
+        )
+        if batch.status == ImportStatus.PREVIEW:
+            self.batch_repo.delete(batch)
+        return preview
+
+    def recategorize_batch(
+        self, import_batch_id: int, detect_duplicates: bool = False
+    ) -> ImportRecategorizeResponse:
+        """
+        Re-apply category mappings to a preview's staged rows.
+
+        Used after a category mapping was changed while reviewing a preview,
+        without parsing the file again. Only rows whose bank category now
+        maps to different candidates are updated, so categories picked by
+        hand on the other rows are kept.
+
+        Args:
+            import_batch_id: The PREVIEW batch to update
+            detect_duplicates: Also check every row for duplicates again, e.g.
+                after other imports were confirmed
+
+        Returns:
+            ImportRecategorizeResponse with the number of rows changed
+        """
+        batch = self.batch_repo.get_by_id(import_batch_id)
+        if batch is None:
+            raise ValueError(f"Batch {import_batch_id} not found")
+
+        if batch.status != ImportStatus.PREVIEW:
+            raise ValueError(f"Batch {import_batch_id} is not in PREVIEW status")
+
+        # Map each distinct bank category once, not each row
+        groups = [
+            {"bank_category": bank_category, "stored": candidates}
+            for bank_category, candidates in self.staging_repo.get_category_groups(
+                import_batch_id
+            )
+        ]
+        groups = self.category_mapper.map_categories(
+            batch.account.institution_id, groups
+        )
+        changed = {
+            g["bank_category"]: (
+                g["coinpurse_category_id"],
+                g["candidate_category_ids"],
+            )
+            for g in groups
+            if g["candidate_category_ids"] != g["stored"]
+        }
+        recategorized = self.staging_repo.remap_categories(import_batch_id, changed)
+
+        duplicate_changes = 0
+        if detect_duplicates:
+            flags = self._recheck_duplicates(batch)
+            self.staging_repo.set_duplicates(import_batch_id, flags)
+            duplicate_changes = len(flags)
+            batch.duplicate_count += sum(1 if flag else -1 for flag in flags.values())
+
+        batch = self.batch_repo.update(batch)
+
+        return ImportRecategorizeResponse(
+            import_batch_id=batch.import_batch_id,
+            recategorized_rows=recategorized,
+            duplicate_changes=duplicate_changes,
+            duplicate_count=batch.duplicate_count,
+        )
+
+    def _recheck_duplicates(self, batch: ImportBatch) -> dict[int, bool]:
+        """
+        Check a batch's staged rows for duplicates again, chunk by chunk
+
+        Returns:
+            row_number -> is_duplicate for the rows whose flag changed
+        """
+        self._apply_duplicate_settings()
+        flags: dict[int, bool] = {}
+        after_row = None
+        has_more = True
+        while has_more:
+            rows, _total, has_more = self.staging_repo.get_page(
+                batch.import_batch_id, limit=self.chunk_size, after_row=after_row
+            )
+            if not rows:
+                break
+            after_row = rows[-1].row_number
+
+            chunk = self.duplicate_detector.check_duplicates(
+                batch.account_id,
+                [
+                    {
+                        "row_number": row.row_number,
+                        "transaction_date": row.transaction_date,
+                        "posted_date": row.posted_date,
+                        "description": row.description,
+                        "amount": row.amount,
+                        "transaction_type": row.transaction_type,
+                    }
+                    for row in rows
+                ],
+            )
+            for row, t in zip(rows, chunk, strict=True):
+                if t["is_duplicate"] != row.is_duplicate:
+                    flags[row.row_number] = t["is_duplicate"]
+        return flags
+
+    def bulk_upload_and_preview(
+        self, files: list[BulkImportFile]
+    ) -> BulkImportPreviewResponse:
+        """
+        Preview several files at once, creating one batch per file.
+
+        Files are parsed in parallel on the process pool, each with its own
+        template_id or else its account's template. Category mapping and
+        duplicate detection then run here, file by file. A file that fails to
+        parse is reported with an error and does not stop the others. Files
+        already parsed with their template use the memoized rows instead.
 
-        # Convert to transaction dicts for processing
-        transactions = self._rows_to_dicts(parsed_rows)
+        Args:
+            files: The files to import, each with its target account
 
-        # Map categories using the account's institution
-        transactions = self.category_mapper.map_categories(
-            account.institution_id, transactions
+        Returns:
+            BulkImportPreviewResponse with a preview per file and overall totals
+        """
+        # Resolve every account and template before any parsing starts
+        targets: list[tuple[Account, ImportTemplate]] = []
+        for f in files:
+            account = self.db.get(Account, f.account_id)
+            if account is None:
+                raise ValueError(f"Account {f.account_id} not found")
+            template_id = f.template_id or account.template_id
+            if template_id is None:
+                raise ValueError(
+                    f"Account '{account.account_name}' has no import template "
+                    "configured."
+                )
+            template = self.template_repo.get_by_id(template_id)
+            if template is None:
+                raise ValueError(f"Template {template_id} not found")
+            targets.append((account, template))
+
+        # Only files not parsed before with their template go to the pool
+        content_hashes = [self.file_store.put(f.file) for f in files]
+        memoized = [
+            self.file_store.load_parsed(content_hash, template)
+            for content_hash, (_, template) in zip(content_hashes, targets, strict=True)
+        ]
+        to_parse = [i for i, chunks in enumerate(memoized) if chunks is None]
+        parsed = dict(
+            zip(
+                to_parse,
+                parse_files(
+                    [
+                        (
+                            self._create_parser(targets[i][1]),
+                            self.file_store.path(content_hashes[i]),
+                        )
+                        for i in to_parse
+                    ]
+                ),
+                strict=True,
+            )
         )
 
-        # Detect duplicates
-        transactions = self.duplicate_detector.check_duplicates(
-            account_id, transactions
+        previews: list[BulkImportFilePreview] = []
+        for i, (f, (account, template)) in enumerate(zip(files, targets, strict=True)):
+            row_chunks = memoized[i]
+            if row_chunks is None:
+                rows = parsed[i]
+                if isinstance(rows, Exception):
+                    previews.append(
+                        BulkImportFilePreview(
+                            file_name=f.file_name,
+                            account_id=account.account_id,
+                            error=f"Error processing file: {rows}",
+                        )
+                    )
+                    continue
+                row_chunks = self.file_store.memoize_parsed(
+                    content_hashes[i],
+                    template,
+                    (
+                        rows.slice(start, start + self.chunk_size)
+                        for start in range(0, len(rows), self.chunk_size)
+                    ),
+                )
+
+            preview = self._build_preview(
+                account, template, f.file_name, content_hashes[i], row_chunks
+            )
+            previews.append(
+                BulkImportFilePreview(
+                    file_name=f.file_name,
+                    account_id=account.account_id,
+                    import_batch_id=preview.import_batch_id,
+                    summary=preview.summary,
+                    transactions=preview.transactions,
+                    next_cursor=preview.next_cursor,
+                    already_imported_batch_id=preview.already_imported_batch_id,
+                )
+            )
+
+        summaries = [p.summary for p in previews if p.summary is not None]
+        summary = ImportPreviewSummary(
+            total_rows=sum(s.total_rows for s in summaries),
+            valid_rows=sum(s.valid_rows for s in summaries),
+            duplicate_count=sum(s.duplicate_count for s in summaries),
+            validation_errors=sum(s.validation_errors for s in summaries),
         )
+        return BulkImportPreviewResponse(summary=summary, files=previews)
+
+    def detect_templates(self, file: BinaryIO) -> list[TemplateMatch]:
+        """
+        Find the active templates able to read a file from its header row
 
-        # Calculate summary
-        total_rows = len(transactions)
-        valid_rows = sum(
-            1
-            for t in transactions
-            if not t.get("validation_errors") and not t.get("is_duplicate")
+        Args:
+            file: Binary file object; left at position 0
+
+        Returns:
+            Matching templates, those mapping the most columns first
+        """
+        return get_template_index(self.db).detect(file)
+
+    def _preview_stored_file(
+        self,
+        account: Account,
+        template: ImportTemplate,
+        file_name: str,
+        content_hash: str,
+        progress_callback: ProgressCallback | None = None,
+    ) -> ImportPreviewResponse:
+        """Build a preview of a stored file, parsing it only if not memoized"""
+        row_chunks = self.file_store.load_parsed(content_hash, template)
+        if row_chunks is not None:
+            return self._build_preview(
+                account,
+                template,
+                file_name,
+                content_hash,
+                row_chunks,
+                progress_callback,
+            )
+
+        # Parse, map and check the file one chunk at a time so that only a
+        # single chunk of raw rows is held in memory alongside the results
+        parser = self._create_parser(template)
+        with self.file_store.open(content_hash) as file:
+            return self._build_preview(
+                account,
+                template,
+                file_name,
+                content_hash,
+                self.file_store.memoize_parsed(
+                    content_hash, template, parser.parse_batches(file, self.chunk_size)
+                ),
+                progress_callback,
+            )
+
+    def _build_preview(
+        self,
+        account: Account,
+        template: ImportTemplate,
+        file_name: str,
+        content_hash: str | None,
+        row_chunks: Iterable[ParsedBatch],
+        progress_callback: ProgressCallback | None = None,
+    ) -> ImportPreviewResponse:
+        """Map, deduplicate and stage parsed rows as a PREVIEW batch"""
+        previous = (
+            self.batch_repo.get_completed_by_content_hash(
+                account.account_id, content_hash
+            )
+            if content_hash is not None
+            else None
         )
-        duplicate_count = sum(1 for t in transactions if t.get("is_duplicate"))
-        validation_errors = sum(1 for t in transactions if t.get("validation_errors"))
 
-        # Create batch record with PREVIEW status
+        # Create the batch up front so each chunk can be staged under its ID;
+        # everything is committed together once the whole file is processed
         batch = ImportBatch(
-            account_id=account_id,
-            template_id=template_id,
+            account_id=account.account_id,
+            template_id=template.template_id,
             file_name=file_name,
+            content_hash=content_hash,
             file_format=template.file_format,
-            total_rows=total_rows,
-            duplicate_count=duplicate_count,
             status=ImportStatus.PREVIEW,
-            parsed_transactions=transactions,
         )
-        batch = self.batch_repo.create(batch)
+        self.db.add(batch)
+        self.db.flush()
+        self._apply_duplicate_settings()
+
+        first_page: list[ParsedTransaction] = []
+        total_rows = 0
+        valid_rows = 0
+        duplicate_count = 0
+        validation_errors = 0
+
+        # Each chunk stays a ParsedBatch from parsing to staging; only the
+        # rows of the first page are built as objects of their own
+        for chunk in row_chunks:
+            processed = total_rows + len(chunk)
+            self._report(progress_callback, processed, None, "parsed")
+
+            # Map categories using the account's institution
+            self.category_mapper.map_batch(account.institution_id, chunk)
+            self._report(progress_callback, processed, None, "categorized")
+
+            # Detect duplicates
+            self.duplicate_detector.check_batch(account.account_id, chunk)
+            self._report(progress_callback, processed, None, "deduplicated")
+
+            # Stage the chunk
+            self.staging_repo.add_batch(batch.import_batch_id, chunk)
+
+            # Accumulate summary
+            for is_duplicate, errors in zip(
+                chunk.is_duplicate, chunk.validation_errors, strict=True
+            ):
+                if is_duplicate:
+                    duplicate_count += 1
+                if errors:
+                    validation_errors += 1
+                elif not is_duplicate:
+                    valid_rows += 1
+
+            # Only the first page is returned; the rest stay in the staging table
+            room = self.page_size - len(first_page)
+            if room > 0:
+                first_page.extend(self._parsed_transactions(chunk, room))
+
+            total_rows += len(chunk)
+
+        batch.total_rows = total_rows
+        batch.duplicate_count = duplicate_count
+        batch = self.batch_repo.update(batch)
 
         # Build response
         summary = ImportPreviewSummary(
@@ -116,27 +517,19 @@ class ImportService:
             validation_errors=validation_errors,
         )
 
-        parsed_txns = [
-            ParsedTransaction(
-                row_number=t["row_number"],
-                transaction_date=t.get("transaction_date"),
-                posted_date=t.get("posted_date"),
-                description=t.get("description", ""),
-                amount=t.get("amount", 0),
-                transaction_type=t.get("transaction_type", "DEBIT"),
-                category_name=t.get("bank_category"),
-                coinpurse_category_id=t.get("coinpurse_category_id"),
-                candidate_category_ids=t.get("candidate_category_ids", []),
-                is_duplicate=t.get("is_duplicate", False),
-                validation_errors=t.get("validation_errors", []),
-            )
-            for t in transactions
-        ]
+        # Cursor for the rows after the first page, if there are any
+        next_cursor = None
+        if first_page and total_rows > len(first_page):
+            next_cursor = first_page[-1].row_number
 
         return ImportPreviewResponse(
             import_batch_id=batch.import_batch_id,
             summary=summary,
-            transactions=parsed_txns,
+            transactions=first_page,
+            next_cursor=next_cursor,
+            already_imported_batch_id=(
+                previous.import_batch_id if previous is not None else None
+            ),
         )
 
     def confirm_import(
@@ -144,13 +537,22 @@ class ImportService:
         import_batch_id: int,
         selected_rows: list[int],
         category_overrides: dict[int, int] | None = None,
+        progress_callback: ProgressCallback | None = None,
     ) -> ImportConfirmResponse:
         """
         Confirm and execute an import for selected rows.
 
+        Selection, overrides, counting and the copy into transactions all run
+        as set-based statements against the batch's staged rows. Rows are
+        committed every commit_rows imported rows, and each committed row
+        leaves the staging table, so a confirm that fails part-way keeps
+        what it imported and confirming the batch again resumes from there.
+
         Args:
             import_batch_id: The batch ID from preview
             selected_rows: List of row numbers to import
+            category_overrides: Optional map of row_number -> coinpurse_category_id
+            progress_callback: Optional callback reporting rows processed
 
         Returns:
             ImportConfirmResponse with final counts
@@ -163,133 +565,157 @@ class ImportService:
         if batch.status != ImportStatus.PREVIEW:
             raise ValueError(f"Batch {import_batch_id} is not in PREVIEW status")
 
-        if batch.parsed_transactions is None:
-            raise ValueError(f"Batch {import_batch_id} has no parsed transactions")
-
-        # Filter to selected rows
-        selected_set = set(selected_rows)
-        transactions_to_import = [
-            t
-            for t in batch.parsed_transactions
-            if t["row_number"] in selected_set
-            and not t.get("validation_errors")
-            and not t.get("is_duplicate")
-        ]
-
-        # Calculate counts
-        imported_count = 0
-        skipped_count = 0
-        duplicate_count = 0
+        # Record the selection and any category overrides on the staged rows
+        self.staging_repo.select_rows(import_batch_id, selected_rows)
+        self.staging_repo.set_categories(import_batch_id, category_overrides or {})
 
-        for t in batch.parsed_transactions:
-            if t["row_number"] not in selected_set:
-                skipped_count += 1
-            elif t.get("is_duplicate"):
-                duplicate_count += 1
-            elif t.get("validation_errors"):
-                skipped_count += 1
+        # Calculate counts; rows an earlier, interrupted confirm committed are
+        # no longer staged and are counted in the batch's imported_count
+        counts = self.staging_repo.count_outcomes(import_batch_id)
+        imported_count = batch.imported_count or 0
+        total_to_import = imported_count + counts["importable"]
 
-        # Create transactions
+        # Copy rows into transactions one window of row numbers at a time
         now = datetime.now(UTC)
-        overrides = category_overrides or {}
-        for t in transactions_to_import:
-            # Determine transaction type enum
-            txn_type = self._map_transaction_type(t.get("transaction_type", "DEBIT"))
-
-            # Parse dates from JSON (stored as ISO strings)
-            txn_date = self._parse_date_from_json(t["transaction_date"])
-            post_date = self._parse_date_from_json(t.get("posted_date")) or txn_date
-
-            # Apply category override if provided
-            category_id = overrides.get(t["row_number"], t.get("coinpurse_category_id"))
-            if category_id is None:
-                skipped_count += 1
-                continue
-
-            transaction = Transaction(
-                account_id=batch.account_id,
-                category_id=category_id,
-                transaction_date=txn_date,
-                posted_date=post_date,
-                amount=t["amount"],
-                description=t["description"],
-                transaction_type=txn_type,
-                notes="",
-                imported_date=now,
-            )
-            self.db.add(transaction)
-            imported_count += 1
-
-        # Update batch status
+        uncommitted = 0
+        fingerprints: list[int] = []
+        row_range = self.staging_repo.get_row_number_range(import_batch_id)
+        if row_range is not None:
+            first, last = row_range
+            for start in range(first, last + 1, self.chunk_size):
+                window = (start, min(start + self.chunk_size - 1, last))
+                fingerprints += self.staging_repo.get_importable_fingerprints(
+                    import_batch_id, window
+                )
+                inserted = self._insert_window(
+                    import_batch_id, batch.account_id, now, window
+                )
+                self.staging_repo.delete_importable(import_batch_id, window)
+                imported_count += inserted
+                uncommitted += inserted
+                # Reported before committing, so progress the callback records
+                # in this session commits along with the rows
+                self._report(
+                    progress_callback, imported_count, total_to_import, "inserted"
+                )
+                if uncommitted >= self.commit_rows:
+                    self._commit_imported(batch, imported_count, fingerprints)
+                    uncommitted = 0
+                    fingerprints = []
+
+        # Update batch status and drop its remaining staged rows
+        self._report(progress_callback, total_to_import, total_to_import, "inserted")
+        self.staging_repo.delete_for_batch(import_batch_id)
         batch = self.batch_repo.mark_completed(
             batch,
             imported_count=imported_count,
-            skipped_count=skipped_count,
-            duplicate_count=duplicate_count,
+            skipped_count=counts["skipped"],
+            duplicate_count=counts["duplicate"],
         )
+        # The inserts bypassed the ORM, so tell the shared cache once committed
+        self.duplicate_detector.fingerprint_cache.add(batch.account_id, fingerprints)
 
         return ImportConfirmResponse(
             import_batch_id=batch.import_batch_id,
             imported_count=imported_count,
-            skipped_count=skipped_count,
-            duplicate_count=duplicate_count,
+            skipped_count=counts["skipped"],
+            duplicate_count=counts["duplicate"],
             status=batch.status,
         )
 
-    def _parse_file(self, file: BinaryIO, template: ImportTemplate) -> list[ParsedRow]:
-        """Parse a file using the appropriate parser based on template"""
+    def _commit_imported(
+        self, batch: ImportBatch, imported_count: int, fingerprints: list[int]
+    ) -> None:
+        """Commit the rows a confirm has inserted so far"""
+        batch.imported_count = imported_count
+        self.db.commit()
+        self.duplicate_detector.fingerprint_cache.add(batch.account_id, fingerprints)
+
+    def _insert_window(
+        self,
+        import_batch_id: int,
+        account_id: int,
+        imported_date: datetime,
+        row_range: tuple[int, int],
+    ) -> int:
+        """Insert one window of a batch's importable rows using confirm_mode"""
+        if self.confirm_mode == "executemany":
+            rows = self.staging_repo.get_importable_values(
+                import_batch_id, account_id, imported_date, row_range
+            )
+            return self.transaction_repo.bulk_create(rows)
+
+        return self.staging_repo.insert_transactions(
+            import_batch_id, account_id, imported_date, row_range
+        )
+
+    @staticmethod
+    def _report(
+        progress_callback: ProgressCallback | None,
+        current: int,
+        total: int | None,
+        stage: ProgressStage,
+    ) -> None:
+        if progress_callback is not None:
+            progress_callback(current, total, stage)
+
+    def _apply_duplicate_settings(self) -> None:
+        """Configure the detector's date tolerance from the app settings"""
+        settings_repo = AppSettingRepository(self.db)
+        tolerance = settings_repo.get_by_key("duplicate_date_tolerance_days")
+        match_posted = settings_repo.get_by_key("duplicate_match_posted_date")
+        try:
+            tolerance_days = int(tolerance.setting_value) if tolerance else 0
+        except ValueError:
+            tolerance_days = 0
+        self.duplicate_detector.date_tolerance_days = max(tolerance_days, 0)
+        self.duplicate_detector.match_posted_date = (
+            match_posted is not None
+            and match_posted.setting_value.strip().lower() in ("1", "true", "yes")
+        )
+
+    def _create_parser(self, template: ImportTemplate) -> BaseParser:
+        """Create the appropriate parser based on template"""
         if template.file_format == FileFormat.CSV:
-            parser = CsvParser(
+            return CsvParser(
                 column_mappings=template.column_mappings,
                 amount_config=template.amount_config,
                 date_format=template.date_format,
                 header_row=template.header_row,
                 skip_rows=template.skip_rows,
+                plan=get_template_plan(template),
             )
         elif template.file_format == FileFormat.EXCEL:
-            parser = ExcelParser(
+            return ExcelParser(
                 column_mappings=template.column_mappings,
                 amount_config=template.amount_config,
                 date_format=template.date_format,
                 header_row=template.header_row,
                 skip_rows=template.skip_rows,
+                plan=get_template_plan(template),
+                # Exports split by month or card land on several sheets
+                sheet_name=None if template.all_sheets else 0,
             )
         else:
             raise ValueError(f"Unsupported file format: {template.file_format}")
 
-        return parser.parse(file)
-
-    def _rows_to_dicts(self, rows: list[ParsedRow]) -> list[dict[str, Any]]:
-        """Convert ParsedRow objects to dicts for storage"""
+    def _parsed_transactions(
+        self, batch: ParsedBatch, limit: int
+    ) -> list[ParsedTransaction]:
+        """Build the preview schema for the first limit rows of a batch"""
         return [
-            {
-                "row_number": row.row_number,
-                "transaction_date": row.transaction_date.isoformat()
-                if row.transaction_date
-                else None,
-                "posted_date": row.posted_date.isoformat() if row.posted_date else None,
-                "description": row.description,
-                "amount": row.amount,
-                "transaction_type": row.transaction_type,
-                "bank_category": row.bank_category,
-                "validation_errors": row.validation_errors,
-            }
-            for row in rows
+            ParsedTransaction(
+                row_number=batch.row_numbers[i],
+                transaction_date=batch.transaction_dates[i],
+                posted_date=batch.posted_dates[i],
+                description=batch.descriptions[i],
+                amount=batch.amounts[i],
+                transaction_type=batch.transaction_types[i],
+                category_name=batch.bank_categories[i],
+                coinpurse_category_id=batch.coinpurse_category_ids[i],
+                candidate_category_ids=batch.candidate_category_ids[i],
+                is_duplicate=batch.is_duplicate[i],
+                validation_errors=batch.validation_errors[i],
+            )
+            for i in range(min(limit, len(batch)))
         ]
-
-    def _map_transaction_type(self, type_str: str) -> TransactionType:
-        """Map CREDIT/DEBIT string to TransactionType enum"""
-        if type_str == "CREDIT":
-            return TransactionType.PAYMENT
-        else:
-            return TransactionType.PURCHASE
-
-    def _parse_date_from_json(self, date_value: str | date | None) -> date | None:
-        """Parse a date that may be an ISO string or already a date object"""
-        if date_value is None:
-            return None
-        if isinstance(date_value, date):
-            return date_value
-        if isinstance(date_value, str):
-            return date.fromisoformat(date_value)
-        return None
@@ -2,8 +2,29 @@
 Parsers package for file parsing utilities
 """
 
-from .base_parser import BaseParser, ParsedRow
+from .base_parser import DEFAULT_CHUNK_SIZE, BaseParser, ParsedBatch, ParsedRow
+from .converter_plan import (
+    ConverterPlan,
+    clear_template_plans,
+    compile_plan,
+    get_template_plan,
+    mapped_columns,
+)
 from .csv_parser import CsvParser
 from .excel_parser import ExcelParser
+from .parallel import parse_files
 
-__all__ = ["BaseParser", "ParsedRow", "CsvParser", "ExcelParser"]
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "BaseParser",
+    "ParsedBatch",
+    "ParsedRow",
+    "CsvParser",
+    "ExcelParser",
+    "ConverterPlan",
+    "clear_template_plans",
+    "compile_plan",
+    "get_template_plan",
+    "mapped_columns",
+    "parse_files",
+]
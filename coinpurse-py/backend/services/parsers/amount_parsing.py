@@ -0,0 +1,368 @@
+"""
+Exact fixed-point amount parsing for import files
+
+Amounts are converted straight from their text to integer minor units
+(cents for decimal_places=2) without going through float, so values such as
+0.29 or 90071992547409.93 come out exact. Accepted forms include:
+
+    1234.56   -1,234.56   $1,234.56   $-1,234.56   -$1,234.56
+    (1,234.56)   1234.56-   +12   .5   12.   1e3   1.5E+03
+
+Digits beyond decimal_places are rounded half away from zero. Blank and
+unparseable cells have no value (None for a single cell, 0 in a column).
+"""
+
+import math
+import re
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_AMOUNT = re.compile(
+    r"""
+    \s*(?P<open>\()?\s*
+    (?P<sign>[+-])?\s*
+    (?P<currency>[$€£¥])?\s*
+    (?P<sign2>[+-])?
+    (?P<whole>[\d,]*)
+    (?:\.(?P<frac>\d*))?
+    (?:[eE](?P<exp>[+-]?\d+))?
+    \s*(?P<trail>-)?\s*
+    (?P<close>\))?\s*
+    """,
+    re.VERBOSE | re.ASCII,
+)
+
+# Larger exponents are not amounts (and would build huge integers)
+_MAX_EXPONENT = 300
+
+# Decimal digits that always fit in an int64
+_MAX_INT64_DIGITS = 18
+
+# Longer cells are left to parse_cents; counts must also fit in _TALLY_BITS
+_MAX_VECTOR_WIDTH = 32
+
+# States of a character in the column parser. A digit after the dot moves
+# to the next state (fraction digit), as does a minus after the number
+(
+    _PAD,
+    _OPEN,
+    _PLUS,
+    _MINUS,
+    _TRAILING_MINUS,
+    _CURRENCY,
+    _DIGIT,
+    _FRAC_DIGIT,
+    _COMMA,
+    _DOT,
+    _CLOSE,
+    _ODD,
+) = range(12)
+
+# Initial state of each ASCII code point; index 128 stands for all others
+_CODE_STATES = np.full(129, _ODD, dtype=np.int8)
+_CODE_STATES[0] = _PAD
+_CODE_STATES[ord("0") : ord("9") + 1] = _DIGIT
+for _char, _state in {
+    "(": _OPEN,
+    "+": _PLUS,
+    "-": _MINUS,
+    "$": _CURRENCY,
+    ",": _COMMA,
+    ".": _DOT,
+    ")": _CLOSE,
+}.items():
+    _CODE_STATES[ord(_char)] = _state
+
+# Non-ASCII currency symbols, which the table above cannot index
+_CURRENCY_CODES = np.array([ord(c) for c in "€£¥"], dtype=np.uint32)
+
+# Where each state may appear in an amount; a comma after the dot ranks
+# below the dot and so breaks the order
+_STATE_RANKS = np.array([6, 0, 1, 1, 4, 1, 2, 3, 2, 3, 5, 0], dtype=np.int8)
+
+# Per-cell counts are summed in one int64, _TALLY_BITS bits per slot
+_TALLY_BITS = 6
+(
+    _OPEN_SLOT,
+    _SIGN_SLOT,
+    _NEGATIVE_SLOT,
+    _TRAIL_SLOT,
+    _CURRENCY_SLOT,
+    _DIGIT_SLOT,
+    _FRAC_SLOT,
+    _DOT_SLOT,
+    _CLOSE_SLOT,
+    _ODD_SLOT,
+) = range(10)
+_STATE_TALLIES = np.array(
+    [
+        sum(1 << (_TALLY_BITS * slot) for slot in slots)
+        for slots in [
+            (),
+            (_OPEN_SLOT,),
+            (_SIGN_SLOT,),
+            (_SIGN_SLOT, _NEGATIVE_SLOT),
+            (_TRAIL_SLOT, _NEGATIVE_SLOT),
+            (_CURRENCY_SLOT,),
+            (_DIGIT_SLOT,),
+            (_DIGIT_SLOT, _FRAC_SLOT),
+            (),
+            (_DOT_SLOT,),
+            (_CLOSE_SLOT,),
+            (_ODD_SLOT,),
+        ]
+    ],
+    dtype=np.int64,
+)
+
+_POWERS_OF_TEN = 10 ** np.arange(_MAX_INT64_DIGITS + 1, dtype=np.int64)
+
+# Column values whose cents do not fit are clipped to this magnitude
+CENTS_LIMIT = 2**62
+
+
+def check_decimal_places(decimal_places: Any) -> int:
+    """
+    Validate a template's decimal_places setting
+
+    Returns:
+        decimal_places, unchanged
+
+    Raises:
+        ValueError: If decimal_places is not a non-negative integer
+    """
+    if isinstance(decimal_places, bool) or not isinstance(decimal_places, int):
+        raise ValueError(f"decimal_places must be an integer, got {decimal_places!r}")
+    if decimal_places < 0:
+        raise ValueError(f"decimal_places must be >= 0, got {decimal_places}")
+    return decimal_places
+
+
+def _scale(whole: str, frac: str, decimal_places: int) -> int:
+    """Digits before and after the point as unsigned minor units"""
+    kept = frac[:decimal_places].ljust(decimal_places, "0")
+    cents = int(whole or "0") * 10**decimal_places + int(kept or "0")
+    # Round half away from zero on the first dropped digit
+    if frac[decimal_places : decimal_places + 1] >= "5":
+        cents += 1
+    return cents
+
+
+def _shift_point(whole: str, frac: str, exponent: int) -> tuple[str, str]:
+    """Move the decimal point of whole.frac by a scientific-notation exponent"""
+    digits = whole + frac
+    point = len(whole) + exponent
+    if point < 0:
+        return ("", "0" * -point + digits)
+    if point > len(digits):
+        return (digits + "0" * (point - len(digits)), "")
+    return (digits[:point], digits[point:])
+
+
+def _cents_from_match(match: re.Match, decimal_places: int) -> int | None:
+    whole = match["whole"].replace(",", "")
+    frac = match["frac"] or ""
+    if not whole and not frac:
+        return None
+    if (match["open"] is None) != (match["close"] is None):
+        return None
+    if match["exp"] is not None:
+        exponent = int(match["exp"])
+        if abs(exponent) > _MAX_EXPONENT:
+            return None
+        whole, frac = _shift_point(whole, frac, exponent)
+
+    cents = _scale(whole, frac, decimal_places)
+    negative = (
+        match["open"] is not None
+        or match["sign"] == "-"
+        or match["sign2"] == "-"
+        or match["trail"] is not None
+    )
+    return -cents if negative else cents
+
+
+def parse_cents(value: Any, decimal_places: int = 2) -> int | None:
+    """
+    Convert one cell to integer minor units
+
+    Args:
+        value: Cell value: text, int, float or NaN/None
+        decimal_places: Digits after the decimal point in the result unit
+
+    Returns:
+        The amount in minor units, or None for blank or unparseable cells
+
+    Raises:
+        ValueError: If decimal_places is not a non-negative integer
+    """
+    decimal_places = check_decimal_places(decimal_places)
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value) * 10**decimal_places
+    if isinstance(value, (float, np.floating)):
+        if not math.isfinite(value):
+            return None
+        # Shortest round-tripping digits: 4.35 parses as 4.35, not 4.3499999...
+        value = np.format_float_positional(value, trim="-")
+    if not isinstance(value, str):
+        return None
+
+    # Plain "-1234.56" needs no regex
+    whole, _, frac = value.partition(".")
+    negative = whole[:1] == "-"
+    if negative:
+        whole = whole[1:]
+    if (
+        (whole or frac)
+        and value.isascii()
+        and (not whole or whole.isdigit())
+        and (not frac or frac.isdigit())
+    ):
+        cents = _scale(whole, frac, decimal_places)
+        return -cents if negative else cents
+
+    match = _AMOUNT.fullmatch(value)
+    if match is None:
+        return None
+    return _cents_from_match(match, decimal_places)
+
+
+def parse_cents_column(values: pd.Series, decimal_places: int = 2) -> np.ndarray:
+    """
+    Convert a whole column to integer minor units at once
+
+    String columns are laid out as a character matrix and parsed with NumPy
+    integer arithmetic; cells it cannot vouch for (embedded spaces, doubled
+    signs, very long text) go through parse_cents. Other columns use
+    parse_cents once per distinct value.
+
+    Args:
+        values: The column
+        decimal_places: Digits after the decimal point in the result unit
+
+    Returns:
+        int64 array of amounts; 0 for blank or unparseable cells, and
+        +/-CENTS_LIMIT for amounts too large to hold
+
+    Raises:
+        ValueError: If decimal_places is not a non-negative integer
+    """
+    decimal_places = check_decimal_places(decimal_places)
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return _parse_distinct(values, decimal_places)
+
+    cents, fallback = _parse_text_matrix(values, decimal_places)
+    if fallback.any():
+        cents[fallback] = _parse_distinct(values[fallback], decimal_places)
+    return cents
+
+
+def _parse_text_matrix(
+    values: pd.Series, decimal_places: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the plainly shaped cells of a string column
+
+    Each cell must read: optional "(", at most one sign and one currency
+    symbol, digits and commas, an optional "." with digits, an optional
+    trailing "-", then ")" if opened. Every character gets a state ranked in
+    that order, so a cell has the shape when its ranks never decrease and
+    no state occurs too often.
+
+    Returns:
+        (int64 cents, mask of cells that still need parse_cents)
+    """
+    n = len(values)
+    cents = np.zeros(n, dtype=np.int64)
+    present = values.notna().to_numpy(dtype=bool)
+    if decimal_places > _MAX_INT64_DIGITS:
+        return (cents, present)
+
+    # One UTF-32 code point per column, zero-padded on the right
+    cells = np.where(present, values.to_numpy(dtype=object), "")
+    text = np.asarray(cells, dtype=str)
+    lengths = np.strings.str_len(text)
+    too_long = lengths > _MAX_VECTOR_WIDTH
+    if too_long.any():
+        text = np.asarray(np.where(too_long, "", cells), dtype=str)
+    if text.dtype.itemsize == 0 or not lengths.any():
+        return (cents, present & (lengths > 0))
+    codes = text.view(np.uint32).reshape(n, -1)
+
+    states = _CODE_STATES[np.minimum(codes, len(_CODE_STATES) - 1)]
+    if (codes > 127).any():
+        states[np.isin(codes, _CURRENCY_CODES)] = _CURRENCY
+    digit = states == _DIGIT
+    after_number = np.logical_or.accumulate(
+        (states >= _DIGIT) & (states <= _DOT), axis=1
+    )
+    after_dot = np.logical_or.accumulate(states == _DOT, axis=1)
+    # Digits after the dot become fraction digits, minus after the number trailing
+    states += digit & after_dot
+    states += (states == _MINUS) & after_number
+
+    ordered = (np.diff(_STATE_RANKS[states], axis=1) >= 0).all(axis=1)
+    tally = _STATE_TALLIES[states].sum(axis=1)
+
+    def count(slot: int) -> np.ndarray:
+        return (tally >> (_TALLY_BITS * slot)) & (2**_TALLY_BITS - 1)
+
+    digit_count = count(_DIGIT_SLOT)
+    frac_count = count(_FRAC_SLOT)
+    opening = count(_OPEN_SLOT)
+    odd = count(_ODD_SLOT) > 0
+    plain = (
+        ~too_long
+        & ~odd
+        & ordered
+        & (digit_count > 0)
+        & (opening <= 1)
+        & (opening == count(_CLOSE_SLOT))
+        & (count(_SIGN_SLOT) <= 1)
+        & (count(_TRAIL_SLOT) <= 1)
+        & (count(_CURRENCY_SLOT) <= 1)
+        & (count(_DOT_SLOT) <= 1)
+        & (digit_count - frac_count + decimal_places <= _MAX_INT64_DIGITS)
+        & (digit_count <= _MAX_INT64_DIGITS)
+    )
+    # Only allowed characters but no digits: blank or garbage, never a number
+    garbage = ~too_long & ~odd & (digit_count == 0)
+
+    # All digits of the cell as one integer, scaled by its fraction digits
+    number = np.zeros(n, dtype=np.int64)
+    for column in np.ascontiguousarray(
+        np.where(digit, (codes - 48).astype(np.int8), np.int8(-1)).T
+    ):
+        number = np.where(column >= 0, number * 10 + column, number)
+    number[~plain] = 0
+
+    shift = np.clip(decimal_places - frac_count, 0, _MAX_INT64_DIGITS)
+    drop = np.clip(frac_count - decimal_places, 0, _MAX_INT64_DIGITS)
+    kept, dropped = np.divmod(number, _POWERS_OF_TEN[drop])
+    # Round half away from zero on the first dropped digit
+    round_up = (drop > 0) & (dropped * 2 >= _POWERS_OF_TEN[drop])
+    value = kept * _POWERS_OF_TEN[shift] + round_up
+
+    negative = (count(_NEGATIVE_SLOT) > 0) | (opening > 0)
+    cents[plain] = np.where(negative, -value, value)[plain]
+    return (cents, present & (lengths > 0) & ~plain & ~garbage)
+
+
+def _parse_distinct(values: pd.Series, decimal_places: int) -> np.ndarray:
+    """parse_cents once per distinct value, broadcast back to the column"""
+    codes, uniques = pd.factorize(values)
+    # The extra trailing slot holds the result for NA cells (code -1)
+    results = np.zeros(len(uniques) + 1, dtype=np.int64)
+    for i, value in enumerate(uniques):
+        results[i] = _clip(parse_cents(value, decimal_places))
+    return results[codes]
+
+
+def _clip(cents: int | None) -> int:
+    if cents is None:
+        return 0
+    return max(-CENTS_LIMIT, min(CENTS_LIMIT, cents))
@@ -3,12 +3,22 @@ Base parser interface for file parsing
 """
 
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Any, BinaryIO
 
+import numpy as np
 import pandas as pd
 
+from .amount_parsing import CENTS_LIMIT, parse_cents, parse_cents_column
+from .converter_plan import ConverterPlan, compile_plan
+from .date_parsing import DateParser
+
+# Number of rows handled at a time when streaming a file in chunks
+DEFAULT_CHUNK_SIZE = 5000
+
 
 @dataclass
 class ParsedRow:
@@ -29,6 +39,115 @@ class ParsedRow:
         return len(self.validation_errors) == 0
 
 
+class ParsedBatch:
+    """
+    A chunk of parsed rows stored column by column
+
+    Parsers fill the parsed columns; category mapping and duplicate detection
+    then fill their own columns on the same batch, so a row only becomes an
+    object of its own when it is returned to a client.
+    """
+
+    __slots__ = (
+        "row_numbers",
+        "transaction_dates",
+        "posted_dates",
+        "descriptions",
+        "amounts",
+        "transaction_types",
+        "bank_categories",
+        "validation_errors",
+        "coinpurse_category_ids",
+        "candidate_category_ids",
+        "fingerprints",
+        "is_duplicate",
+    )
+
+    def __init__(
+        self,
+        row_numbers: Iterable[int],
+        transaction_dates: list[date | None],
+        posted_dates: list[date | None],
+        descriptions: list[str],
+        amounts: Iterable[int],
+        transaction_types: list[str],
+        bank_categories: list[str | None],
+        validation_errors: list[list[str]],
+    ):
+        self.row_numbers = array("q", row_numbers)
+        self.transaction_dates = transaction_dates
+        self.posted_dates = posted_dates
+        self.descriptions = descriptions
+        # Amounts in cents
+        self.amounts = array("q", amounts)
+        # CREDIT or DEBIT
+        self.transaction_types = transaction_types
+        self.bank_categories = bank_categories
+        self.validation_errors = validation_errors
+
+        n = len(self.row_numbers)
+        # Set by CategoryMapper.map_batch; rows of one bank category share
+        # their candidate list, so treat the lists as read-only
+        self.coinpurse_category_ids: list[int | None] = [None] * n
+        self.candidate_category_ids: list[list[int]] = [[]] * n
+        # Set by DuplicateDetector.check_batch
+        self.fingerprints: list[int | None] = [None] * n
+        self.is_duplicate: list[bool] = [False] * n
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[ParsedRow]) -> "ParsedBatch":
+        """Build a batch from ParsedRow objects"""
+        return cls(
+            row_numbers=[row.row_number for row in rows],
+            transaction_dates=[row.transaction_date for row in rows],
+            posted_dates=[row.posted_date for row in rows],
+            descriptions=[row.description for row in rows],
+            amounts=[row.amount for row in rows],
+            transaction_types=[row.transaction_type for row in rows],
+            bank_categories=[row.bank_category for row in rows],
+            validation_errors=[row.validation_errors for row in rows],
+        )
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ParsedBatch):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<ParsedBatch(rows={len(self)})>"
+
+    def row(self, i: int) -> ParsedRow:
+        """The parsed columns of row i as a ParsedRow"""
+        return ParsedRow(
+            row_number=self.row_numbers[i],
+            transaction_date=self.transaction_dates[i],
+            posted_date=self.posted_dates[i],
+            description=self.descriptions[i],
+            amount=self.amounts[i],
+            transaction_type=self.transaction_types[i],
+            bank_category=self.bank_categories[i],
+            validation_errors=self.validation_errors[i],
+        )
+
+    def to_rows(self) -> list[ParsedRow]:
+        """Every row as a ParsedRow"""
+        return [self.row(i) for i in range(len(self))]
+
+    def slice(self, start: int, stop: int) -> "ParsedBatch":
+        """Rows start to stop (exclusive) as a new batch, every column included"""
+        part = ParsedBatch.__new__(ParsedBatch)
+        for name in self.__slots__:
+            setattr(part, name, getattr(self, name)[start:stop])
+        return part
+
+
 class BaseParser(ABC):
     """Abstract base class for file parsers"""
 
@@ -39,6 +158,8 @@ class BaseParser(ABC):
         date_format: str = "%m/%d/%Y",
         header_row: int = 1,
         skip_rows: int = 0,
+        vectorized: bool = True,
+        plan: ConverterPlan | None = None,
     ):
         """
         Initialize the parser with template configuration
@@ -49,16 +170,37 @@ class BaseParser(ABC):
             date_format: strptime format string for parsing dates
             header_row: Row number where headers are located (1-indexed)
             skip_rows: Number of rows to skip after header
+            vectorized: If True, convert whole columns at once instead of row by row
+            plan: The template already compiled (see get_template_plan); if
+                given, column_mappings, amount_config and date_format are unused
         """
-        self.column_mappings = column_mappings
-        self.amount_config = amount_config
-        # Normalize accidental JSON/string wrapping like "\"%Y-%m-%d\""
-        # so parser behavior remains stable even with slightly malformed template data.
-        self.date_format = str(date_format).strip().strip("\"'")
+        self.plan = plan or compile_plan(column_mappings, amount_config, date_format)
+        self.date_format = self.plan.date_format
+        self._parse_date_text = DateParser(self.date_format)
         self.header_row = header_row
         self.skip_rows = skip_rows
+        self.vectorized = vectorized
+        # The row-wise amount conversion for the template's sign convention
+        self._row_amount = {
+            "bank_standard": self._parse_bank_standard,
+            "inverted": self._parse_inverted,
+            "split_columns": self._parse_split_columns,
+            "amount_with_type_column": self._parse_amount_with_type,
+        }[self.plan.sign_convention]
 
     @abstractmethod
+    def parse_batch(self, file: BinaryIO) -> ParsedBatch:
+        """
+        Parse the file into a single ParsedBatch
+
+        Args:
+            file: Binary file object to parse
+
+        Returns:
+            ParsedBatch holding every row of the file
+        """
+        pass
+
     def parse(self, file: BinaryIO) -> list[ParsedRow]:
         """
         Parse the file and return a list of ParsedRow objects
@@ -69,38 +211,171 @@ class BaseParser(ABC):
         Returns:
             List of ParsedRow objects
         """
+        return self.parse_batch(file).to_rows()
+
+    @abstractmethod
+    def read_header(self, file: BinaryIO) -> list[str]:
+        """
+        Read the column names of the file without parsing its rows
+
+        Args:
+            file: Binary file object to read
+
+        Returns:
+            Column names from the header row
+        """
         pass
 
-    def _process_dataframe(self, df: pd.DataFrame) -> list[ParsedRow]:
+    def parse_batches(
+        self, file: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[ParsedBatch]:
+        """
+        Parse the file and yield ParsedBatch chunks of at most chunk_size rows
+
+        Formats that can be read incrementally override this so that only one
+        chunk of the file is in memory at a time. The default parses the whole
+        file and slices the result.
+
+        Args:
+            file: Binary file object to parse
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            ParsedBatch objects, in file order
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        batch = self.parse_batch(file)
+        for start in range(0, len(batch), chunk_size):
+            yield batch.slice(start, start + chunk_size)
+
+    def parse_chunks(
+        self, file: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[list[ParsedRow]]:
+        """
+        Parse the file and yield ParsedRow objects in chunks of at most chunk_size
+
+        Args:
+            file: Binary file object to parse
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            Lists of ParsedRow objects, in file order
+        """
+        for batch in self.parse_batches(file, chunk_size):
+            yield batch.to_rows()
+
+    def _process_dataframe(self, df: pd.DataFrame) -> ParsedBatch:
         """
-        Process a pandas DataFrame into ParsedRow objects
+        Process a pandas DataFrame into a ParsedBatch
 
         Args:
             df: DataFrame with raw data from file
 
         Returns:
-            List of ParsedRow objects
+            ParsedBatch of the DataFrame's rows
         """
+        if len(df.index) == 0:
+            return ParsedBatch.from_rows([])
+        if self.header_row < 1:
+            raise ValueError("header_row must be >= 1")
+        if self.skip_rows < 0:
+            raise ValueError("skip_rows must be >= 0")
+
+        # Columns the file lacks read as unmapped from here on
+        plan = self.plan.bind(df.columns)
+
+        if self.vectorized:
+            return self._process_dataframe_vectorized(df, plan)
+
         rows = []
         for idx, row in df.iterrows():
-            if self.header_row < 1:
-                raise ValueError("header_row must be >= 1")
-            if self.skip_rows < 0:
-                raise ValueError("skip_rows must be >= 0")
-
             # Row number is 1-indexed, accounting for header and skip rows
             row_number = int(idx) + self.header_row + self.skip_rows + 1
-            parsed = self._parse_row(row, row_number)
+            parsed = self._parse_row(row, row_number, plan)
             rows.append(parsed)
-        return rows
+        return ParsedBatch.from_rows(rows)
 
-    def _parse_row(self, row: pd.Series, row_number: int) -> ParsedRow:
+    def _process_dataframe_vectorized(
+        self, df: pd.DataFrame, plan: ConverterPlan
+    ) -> ParsedBatch:
+        """
+        Process a DataFrame column by column instead of row by row.
+
+        Produces exactly the same rows as the row-wise path: each column is
+        converted once with pandas/NumPy and becomes a column of the batch,
+        without building an object per row.
+
+        Args:
+            df: DataFrame with raw data from file
+            plan: The converter plan bound to df's columns
+
+        Returns:
+            ParsedBatch of the DataFrame's rows
+        """
+        offset = self.header_row + self.skip_rows + 1
+        row_numbers = [int(idx) + offset for idx in df.index]
+
+        # Parse dates
+        transaction_dates, transaction_date_errors = self._parse_date_column(
+            df, plan.transaction_date
+        )
+        posted_dates, posted_date_errors = self._parse_date_column(df, plan.posted_date)
+
+        # Parse description and bank category (optional)
+        descriptions = self._get_string_column(df, plan.description, "")
+        bank_categories = self._get_string_column(df, plan.category, None)
+
+        # Parse amount based on sign convention
+        amounts, transaction_types, amount_errors = self._parse_amount_column(df, plan)
+
+        # Required-field checks, in the same order as _parse_row
+        missing_description = descriptions == ""
+        error_columns = [
+            transaction_date_errors,
+            posted_date_errors,
+            np.where(pd.isna(transaction_dates), "Transaction date is required", None),
+            np.where(pd.isna(posted_dates), "Posted date is required", None),
+            np.where(missing_description, "Description is required", None),
+            amount_errors,
+        ]
+        has_errors = np.zeros(len(row_numbers), dtype=bool)
+        for column in error_columns:
+            has_errors |= ~pd.isna(column)
+
+        validation_errors: list[list[str]] = [[] for _ in row_numbers]
+        for i in np.flatnonzero(has_errors):
+            validation_errors[i] = [
+                column[i] for column in error_columns if column[i] is not None
+            ]
+
+        descriptions = np.where(
+            missing_description,
+            "",
+            pd.Series(descriptions, dtype=object).str.strip().to_numpy(dtype=object),
+        )
+
+        return ParsedBatch(
+            row_numbers=row_numbers,
+            transaction_dates=transaction_dates.tolist(),
+            posted_dates=posted_dates.tolist(),
+            descriptions=descriptions.tolist(),
+            amounts=amounts,
+            transaction_types=transaction_types,
+            bank_categories=bank_categories.tolist(),
+            validation_errors=validation_errors,
+        )
+
+    def _parse_row(
+        self, row: pd.Series, row_number: int, plan: ConverterPlan
+    ) -> ParsedRow:
         """
         Parse a single row from the DataFrame
 
         Args:
             row: pandas Series representing a single row
             row_number: The row number in the original file
+            plan: The converter plan bound to the row's columns
 
         Returns:
             ParsedRow object
@@ -108,12 +383,8 @@ class BaseParser(ABC):
         errors: list[str] = []
 
         # Parse dates
-        transaction_date = self._parse_date(
-            row, self.column_mappings.get("transaction_date"), errors
-        )
-        posted_date = self._parse_date(
-            row, self.column_mappings.get("posted_date"), errors
-        )
+        transaction_date = self._parse_date(row, plan.transaction_date, errors)
+        posted_date = self._parse_date(row, plan.posted_date, errors)
 
         # Both dates are required
         if transaction_date is None:
@@ -122,19 +393,15 @@ class BaseParser(ABC):
             errors.append("Posted date is required")
 
         # Parse description
-        description = self._get_string_value(
-            row, self.column_mappings.get("description"), ""
-        )
+        description = self._get_string_value(row, plan.description, "")
         if not description:
             errors.append("Description is required")
 
         # Parse amount based on sign convention
-        amount, transaction_type = self._parse_amount(row, errors)
+        amount, transaction_type = self._parse_amount(row, plan, errors)
 
         # Parse bank category (optional)
-        bank_category = self._get_string_value(
-            row, self.column_mappings.get("category"), None
-        )
+        bank_category = self._get_string_value(row, plan.category, None)
 
         return ParsedRow(
             row_number=row_number,
@@ -151,138 +418,240 @@ class BaseParser(ABC):
         self, row: pd.Series, column_name: str | None, errors: list[str]
     ) -> date | None:
         """Parse a date value from a row"""
-        if not column_name or column_name not in row.index:
+        if column_name is None:
             return None
 
-        value = row[column_name]
+        parsed, error = self._convert_date(row[column_name], column_name)
+        if error:
+            errors.append(error)
+        return parsed
+
+    def _convert_date(
+        self, value: Any, column_name: str
+    ) -> tuple[date | None, str | None]:
+        """
+        Convert a single cell to a date
+
+        Returns:
+            Tuple of (parsed date or None, validation error or None)
+        """
         if pd.isna(value) or value == "":
-            return None
+            return (None, None)
 
         try:
             if isinstance(value, datetime):
-                return value.date()
+                return (value.date(), None)
             if isinstance(value, date):
-                return value
+                return (value, None)
             # Parse string date
-            return datetime.strptime(str(value).strip(), self.date_format).date()
+            return (self._parse_date_text(str(value).strip()), None)
         except ValueError:
-            errors.append(f"Invalid date format in {column_name}: {value}")
-            return None
+            return (None, f"Invalid date format in {column_name}: {value}")
+
+    def _parse_date_column(
+        self, df: pd.DataFrame, column_name: str | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Parse a whole date column.
+
+        Bank exports repeat the same handful of dates thousands of times, so
+        each distinct value is converted once and the results are broadcast
+        back to every row with a single take.
+
+        Returns:
+            Tuple of (object array of dates/None, object array of errors/None)
+        """
+        n = len(df.index)
+        if column_name is None:
+            return (np.full(n, None, dtype=object), np.full(n, None, dtype=object))
 
-    def _parse_amount(self, row: pd.Series, errors: list[str]) -> tuple[int, str]:
+        codes, uniques = pd.factorize(df[column_name])
+
+        # The extra trailing slot holds the result for NA cells (code -1)
+        dates = np.full(len(uniques) + 1, None, dtype=object)
+        errors = np.full(len(uniques) + 1, None, dtype=object)
+        for i, value in enumerate(uniques):
+            dates[i], errors[i] = self._convert_date(value, column_name)
+
+        return (dates[codes], errors[codes])
+
+    def _parse_amount(
+        self, row: pd.Series, plan: ConverterPlan, errors: list[str]
+    ) -> tuple[int, str]:
         """
         Parse amount based on sign convention
 
         Returns:
             Tuple of (amount in cents, transaction_type)
         """
-        sign_convention = self.amount_config.get("sign_convention", "bank_standard")
-        decimal_places = self.amount_config.get("decimal_places", 2)
+        if plan.amount_error is not None:
+            errors.append(plan.amount_error)
+            return (0, "DEBIT")
 
         try:
-            if sign_convention == "split_columns":
-                return self._parse_split_columns(row, decimal_places)
-            elif sign_convention == "inverted":
-                return self._parse_inverted(row, decimal_places)
-            elif sign_convention == "amount_with_type_column":
-                return self._parse_amount_with_type(row, decimal_places)
-            else:  # bank_standard
-                return self._parse_bank_standard(row, decimal_places)
+            return self._row_amount(row, plan)
         except Exception as e:
             errors.append(f"Error parsing amount: {e}")
             return (0, "DEBIT")
 
     def _parse_bank_standard(
-        self, row: pd.Series, decimal_places: int
+        self, row: pd.Series, plan: ConverterPlan
     ) -> tuple[int, str]:
         """Parse amount with bank standard convention (positive=in, negative=out)"""
-        amount_col = self.column_mappings.get("amount")
-        raw_amount = self._get_numeric_value(row, amount_col, 0.0)
-        amount_cents = self._to_cents(raw_amount, decimal_places)
+        amount_cents = self._get_cents_value(row, plan.amount, plan.decimal_places)
         transaction_type = "CREDIT" if amount_cents >= 0 else "DEBIT"
         return (amount_cents, transaction_type)
 
-    def _parse_inverted(self, row: pd.Series, decimal_places: int) -> tuple[int, str]:
+    def _parse_inverted(self, row: pd.Series, plan: ConverterPlan) -> tuple[int, str]:
         """Parse amount with inverted convention (multiply by -1)"""
-        amount_col = self.column_mappings.get("amount")
-        raw_amount = self._get_numeric_value(row, amount_col, 0.0)
         # Invert the sign
-        raw_amount = -raw_amount
-        amount_cents = self._to_cents(raw_amount, decimal_places)
+        amount_cents = -self._get_cents_value(row, plan.amount, plan.decimal_places)
         transaction_type = "CREDIT" if amount_cents >= 0 else "DEBIT"
         return (amount_cents, transaction_type)
 
     def _parse_split_columns(
-        self, row: pd.Series, decimal_places: int
+        self, row: pd.Series, plan: ConverterPlan
     ) -> tuple[int, str]:
         """Parse amount from separate debit/credit columns"""
-        debit_col = self.amount_config.get("debit_column") or self.column_mappings.get(
-            "debit"
-        )
-        credit_col = self.amount_config.get(
-            "credit_column"
-        ) or self.column_mappings.get("credit")
+        debit_cents = self._get_cents_value(row, plan.debit, plan.decimal_places)
+        credit_cents = self._get_cents_value(row, plan.credit, plan.decimal_places)
 
-        debit_amount = self._get_numeric_value(row, debit_col, 0.0)
-        credit_amount = self._get_numeric_value(row, credit_col, 0.0)
-
-        if credit_amount > 0:
+        if credit_cents > 0:
             # Credit = positive (money in)
-            amount_cents = self._to_cents(credit_amount, decimal_places)
-            return (amount_cents, "CREDIT")
+            return (credit_cents, "CREDIT")
         else:
             # Debit = negative (money out)
-            amount_cents = self._to_cents(-abs(debit_amount), decimal_places)
-            return (amount_cents, "DEBIT")
+            return (-abs(debit_cents), "DEBIT")
 
     def _parse_amount_with_type(
-        self, row: pd.Series, decimal_places: int
+        self, row: pd.Series, plan: ConverterPlan
     ) -> tuple[int, str]:
         """Parse amount with separate type indicator column"""
-        amount_col = self.column_mappings.get("amount")
-        type_col = self.column_mappings.get("transaction_type")
+        amount_cents = abs(self._get_cents_value(row, plan.amount, plan.decimal_places))
+        type_value = self._get_string_value(row, plan.transaction_type, "").lower()
 
-        raw_amount = abs(self._get_numeric_value(row, amount_col, 0.0))
-        type_value = self._get_string_value(row, type_col, "").lower()
+        if plan.credit_indicator in type_value:
+            return (amount_cents, "CREDIT")
+        else:
+            return (-amount_cents, "DEBIT")
 
-        credit_indicator = self.amount_config.get("credit_indicator", "credit").lower()
+    def _parse_amount_column(
+        self, df: pd.DataFrame, plan: ConverterPlan
+    ) -> tuple[list[int], list[str], np.ndarray]:
+        """
+        Parse the amount for every row at once based on sign convention.
 
-        if credit_indicator in type_value:
-            amount_cents = self._to_cents(raw_amount, decimal_places)
-            return (amount_cents, "CREDIT")
+        Rows whose amount does not fit in an int64 are re-parsed with
+        _parse_amount so that their results and error messages match the
+        row-wise path.
+
+        Returns:
+            Tuple of (amounts in cents, transaction types, object array of errors/None)
+        """
+        n = len(df.index)
+        errors = np.full(n, None, dtype=object)
+        if plan.amount_error is not None:
+            errors[:] = plan.amount_error
+            return ([0] * n, ["DEBIT"] * n, errors)
+        try:
+            cents, is_credit = self._amount_arrays(df, plan)
+        except Exception:
+            # Let the row-wise path report per-row errors
+            cents = np.zeros(n, dtype=np.int64)
+            is_credit = np.zeros(n, dtype=bool)
+            fallback = np.ones(n, dtype=bool)
         else:
-            amount_cents = self._to_cents(-raw_amount, decimal_places)
-            return (amount_cents, "DEBIT")
+            fallback = np.abs(cents) >= CENTS_LIMIT
+
+        amounts = np.where(fallback, 0, cents).tolist()
+        transaction_types = np.where(is_credit, "CREDIT", "DEBIT").tolist()
+
+        for i in np.flatnonzero(fallback):
+            row_errors: list[str] = []
+            amounts[i], transaction_types[i] = self._parse_amount(
+                df.iloc[i], plan, row_errors
+            )
+            if row_errors:
+                errors[i] = row_errors[0]
+
+        return (amounts, transaction_types, errors)
+
+    def _amount_arrays(
+        self, df: pd.DataFrame, plan: ConverterPlan
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute int64 cents and a CREDIT mask for every row
+
+        Mirrors _parse_bank_standard, _parse_inverted, _parse_split_columns
+        and _parse_amount_with_type.
+        """
+        decimal_places = plan.decimal_places
+
+        if plan.sign_convention == "split_columns":
+            debit_cents = self._get_cents_column(df, plan.debit, decimal_places)
+            credit_cents = self._get_cents_column(df, plan.credit, decimal_places)
+
+            # Credit = positive (money in), Debit = negative (money out)
+            is_credit = credit_cents > 0
+            cents = np.where(is_credit, credit_cents, -np.abs(debit_cents))
+            return (cents, is_credit)
+
+        if plan.sign_convention == "amount_with_type_column":
+            amount_cents = np.abs(
+                self._get_cents_column(df, plan.amount, decimal_places)
+            )
+            type_values = self._get_string_column(df, plan.transaction_type, "")
+            is_credit = (
+                pd.Series(type_values, dtype=object)
+                .str.lower()
+                .str.contains(plan.credit_indicator, regex=False)
+                .to_numpy(dtype=bool)
+            )
+            cents = np.where(is_credit, amount_cents, -amount_cents)
+            return (cents, is_credit)
+
+        cents = self._get_cents_column(df, plan.amount, decimal_places)
+        if plan.sign_convention == "inverted":
+            # Invert the sign
+            cents = -cents
+        return (cents, cents >= 0)
 
     def _get_string_value(
         self, row: pd.Series, column_name: str | None, default: str | None
     ) -> str | None:
-        """Get a string value from a row, handling missing columns and NaN"""
-        if not column_name or column_name not in row.index:
+        """Get a string value from a row, handling unmapped columns and NaN"""
+        if column_name is None:
             return default
         value = row[column_name]
         if pd.isna(value):
             return default
         return str(value)
 
-    def _get_numeric_value(
-        self, row: pd.Series, column_name: str | None, default: float
-    ) -> float:
-        """Get a numeric value from a row, handling missing columns and NaN"""
-        if not column_name or column_name not in row.index:
-            return default
-        value = row[column_name]
-        if pd.isna(value) or value == "":
-            return default
-        try:
-            # Handle string amounts with currency symbols and commas
-            if isinstance(value, str):
-                value = value.replace("$", "").replace(",", "").strip()
-            return float(value)
-        except (ValueError, TypeError):
-            return default
+    def _get_string_column(
+        self, df: pd.DataFrame, column_name: str | None, default: str | None
+    ) -> np.ndarray:
+        """Get a column as an array of strings, handling unmapped columns and NaN"""
+        n = len(df.index)
+        if column_name is None:
+            return np.full(n, default, dtype=object)
+        series = df[column_name]
+        return np.where(
+            series.isna().to_numpy(),
+            default,
+            series.astype(str).to_numpy(dtype=object),
+        )
 
-    def _to_cents(self, amount: float, decimal_places: int) -> int:
-        """Convert a float amount to cents (integer)"""
-        multiplier = 10**decimal_places
-        return int(round(amount * multiplier))
+    def _get_cents_value(
+        self, row: pd.Series, column_name: str | None, decimal_places: int
+    ) -> int:
+        """Get an amount from a row in cents; 0 for missing, blank or garbage cells"""
+        value = row[column_name] if column_name is not None else None
+        return parse_cents(value, decimal_places) or 0
+
+    def _get_cents_column(
+        self, df: pd.DataFrame, column_name: str | None, decimal_places: int
+    ) -> np.ndarray:
+        """Get a whole column in cents as an int64 array, like _get_cents_value"""
+        if column_name is None:
+            return parse_cents_column(pd.Series([None] * len(df.index)), decimal_places)
+        return parse_cents_column(df[column_name], decimal_places)
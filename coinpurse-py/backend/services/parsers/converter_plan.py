@@ -0,0 +1,198 @@
+"""
+Compiled per-template converter plans
+
+A template's column_mappings and amount_config say which column holds each
+field and how amounts are signed. Instead of looking these up for every row,
+compile_plan() resolves them once into a ConverterPlan: plain column names,
+one sign convention and any configuration error that every row would report.
+Binding a plan to a file's header drops the columns the file does not have,
+so the row converters never check for missing columns.
+
+get_template_plan() caches plans process-wide by template ID, rebuilding a
+template's plan when its modified_at changes.
+"""
+
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from .amount_parsing import check_decimal_places
+
+if TYPE_CHECKING:
+    from models import ImportTemplate
+
+SIGN_CONVENTIONS = (
+    "bank_standard",
+    "inverted",
+    "split_columns",
+    "amount_with_type_column",
+)
+
+
+def mapped_columns(
+    column_mappings: dict[str, Any], amount_config: dict[str, Any]
+) -> list[str]:
+    """File column names a template reads, in mapping order without repeats"""
+    names = list(column_mappings.values())
+    names += [amount_config.get("debit_column"), amount_config.get("credit_column")]
+    return list(dict.fromkeys(n for n in names if isinstance(n, str) and n))
+
+
+def normalize_date_format(date_format: Any) -> str:
+    """Undo accidental JSON/string wrapping like "\\"%Y-%m-%d\\"" """
+    return str(date_format).strip().strip("\"'")
+
+
+# Fields naming a source column, cleared by bind() when the file lacks it
+_COLUMN_FIELDS = (
+    "transaction_date",
+    "posted_date",
+    "description",
+    "category",
+    "amount",
+    "debit",
+    "credit",
+    "transaction_type",
+)
+
+
+@dataclass(frozen=True)
+class ConverterPlan:
+    """A template's conversion rules with every lookup already resolved"""
+
+    # Source column of each field, or None if unmapped (or absent once bound)
+    transaction_date: str | None
+    posted_date: str | None
+    description: str | None
+    category: str | None
+    amount: str | None
+    debit: str | None
+    credit: str | None
+    transaction_type: str | None
+
+    # One of SIGN_CONVENTIONS; unknown conventions fall back to bank_standard
+    sign_convention: str
+    decimal_places: int
+    # Lowercased substring marking credits (amount_with_type_column)
+    credit_indicator: str
+    # Set when amount_config is unusable; reported as every row's amount error
+    amount_error: str | None
+    date_format: str
+    # Every column the template reads
+    columns: tuple[str, ...]
+
+    def bind(self, columns: Any) -> "ConverterPlan":
+        """
+        Resolve the plan against a file's columns
+
+        Args:
+            columns: The file's column names (e.g. a DataFrame's columns)
+
+        Returns:
+            A plan whose field columns are all present in the file; fields
+            mapped to a missing column read as unmapped
+        """
+        present = set(columns)
+        return replace(
+            self,
+            **{
+                name: None
+                for name in _COLUMN_FIELDS
+                if getattr(self, name) is not None
+                and getattr(self, name) not in present
+            },
+        )
+
+
+def _column(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+def compile_plan(
+    column_mappings: dict[str, Any],
+    amount_config: dict[str, Any],
+    date_format: Any = "%m/%d/%Y",
+) -> ConverterPlan:
+    """
+    Compile a template's configuration into a ConverterPlan
+
+    Args:
+        column_mappings: Dict mapping internal field names to file column names
+        amount_config: Dict with sign convention and amount parsing settings
+        date_format: strptime format string for parsing dates
+
+    Returns:
+        The compiled plan
+    """
+    sign_convention = amount_config.get("sign_convention", "bank_standard")
+    if sign_convention not in SIGN_CONVENTIONS:
+        sign_convention = "bank_standard"
+
+    # Errors the per-row amount parsing would raise for every row
+    amount_error = None
+    decimal_places = amount_config.get("decimal_places", 2)
+    credit_indicator = "credit"
+    try:
+        check_decimal_places(decimal_places)
+        if sign_convention == "amount_with_type_column":
+            credit_indicator = amount_config.get("credit_indicator", "credit").lower()
+    except Exception as e:
+        amount_error = f"Error parsing amount: {e}"
+
+    return ConverterPlan(
+        transaction_date=_column(column_mappings.get("transaction_date")),
+        posted_date=_column(column_mappings.get("posted_date")),
+        description=_column(column_mappings.get("description")),
+        category=_column(column_mappings.get("category")),
+        amount=_column(column_mappings.get("amount")),
+        debit=_column(
+            amount_config.get("debit_column") or column_mappings.get("debit")
+        ),
+        credit=_column(
+            amount_config.get("credit_column") or column_mappings.get("credit")
+        ),
+        transaction_type=_column(column_mappings.get("transaction_type")),
+        sign_convention=sign_convention,
+        decimal_places=decimal_places if amount_error is None else 2,
+        credit_indicator=credit_indicator,
+        amount_error=amount_error,
+        date_format=normalize_date_format(date_format),
+        columns=tuple(mapped_columns(column_mappings, amount_config)),
+    )
+
+
+_plans: dict[int, tuple[datetime, ConverterPlan]] = {}
+_lock = threading.Lock()
+
+
+def get_template_plan(template: "ImportTemplate") -> ConverterPlan:
+    """
+    The compiled plan of a template, built once per template version
+
+    Args:
+        template: The ImportTemplate to compile
+
+    Returns:
+        The cached plan if the template is unchanged since it was compiled
+    """
+    with _lock:
+        cached = _plans.get(template.template_id)
+    if cached is not None and cached[0] == template.modified_at:
+        return cached[1]
+
+    plan = compile_plan(
+        template.column_mappings or {},
+        template.amount_config or {},
+        template.date_format,
+    )
+    if template.template_id is not None and template.modified_at is not None:
+        with _lock:
+            _plans[template.template_id] = (template.modified_at, plan)
+    return plan
+
+
+def clear_template_plans() -> None:
+    """Drop every cached plan"""
+    with _lock:
+        _plans.clear()
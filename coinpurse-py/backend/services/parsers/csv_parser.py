@@ -2,11 +2,13 @@
 CSV file parser
 """
 
+from collections.abc import Iterator
 from typing import Any, BinaryIO
 
 import pandas as pd
 
-from .base_parser import BaseParser, ParsedRow
+from .base_parser import DEFAULT_CHUNK_SIZE, BaseParser, ParsedBatch
+from .converter_plan import ConverterPlan
 
 
 class CsvParser(BaseParser):
@@ -19,19 +21,79 @@ class CsvParser(BaseParser):
         date_format: str = "%m/%d/%Y",
         header_row: int = 1,
         skip_rows: int = 0,
+        vectorized: bool = True,
+        plan: ConverterPlan | None = None,
     ):
-        super().__init__(column_mappings, amount_config, date_format, header_row, skip_rows)
+        super().__init__(
+            column_mappings,
+            amount_config,
+            date_format,
+            header_row,
+            skip_rows,
+            vectorized,
+            plan,
+        )
 
-    def parse(self, file: BinaryIO) -> list[ParsedRow]:
+    def parse_batch(self, file: BinaryIO) -> ParsedBatch:
         """
-        Parse a CSV file and return a list of ParsedRow objects
+        Parse a CSV file into a single ParsedBatch
 
         Args:
             file: Binary file object to parse
 
         Returns:
-            List of ParsedRow objects
+            ParsedBatch holding every row of the file
+        """
+        # Read CSV file
+        df = pd.read_csv(file, **self._read_csv_options())
+
+        # Strip whitespace from column names
+        df.columns = df.columns.str.strip()
+
+        return self._process_dataframe(df)
+
+    def parse_batches(
+        self, file: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[ParsedBatch]:
+        """
+        Stream a CSV file and yield a ParsedBatch per chunk
+
+        Only chunk_size rows of the file are held as a DataFrame at a time.
+        Row numbers continue across chunks exactly as in parse().
+
+        Args:
+            file: Binary file object to parse
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            ParsedBatch objects, in file order
         """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+
+        with pd.read_csv(
+            file, chunksize=chunk_size, **self._read_csv_options()
+        ) as reader:
+            for df in reader:
+                # Strip whitespace from column names
+                df.columns = df.columns.str.strip()
+                yield self._process_dataframe(df)
+
+    def read_header(self, file: BinaryIO) -> list[str]:
+        """
+        Read only the column names of a CSV file
+
+        Args:
+            file: Binary file object to read
+
+        Returns:
+            Column names from the template's header row, whitespace stripped
+        """
+        df = pd.read_csv(file, header=self.header_row - 1, nrows=0, dtype=str)
+        return [str(name).strip() for name in df.columns]
+
+    def _read_csv_options(self) -> dict[str, Any]:
+        """Build the pd.read_csv keyword arguments for this template"""
         # header_row is 1-indexed in our config, pandas uses 0-indexed
         header_idx = self.header_row - 1
 
@@ -41,17 +103,10 @@ class CsvParser(BaseParser):
             # Skip rows after header
             skiprows = list(range(self.header_row, self.header_row + self.skip_rows))
 
-        # Read CSV file
-        df = pd.read_csv(
-            file,
-            header=header_idx,
-            skiprows=skiprows,
-            dtype=str,  # Read all as strings to prevent type coercion issues
-            keep_default_na=False,  # Don't convert empty strings to NaN
-            na_values=[""],  # Only treat empty string as NA
-        )
-
-        # Strip whitespace from column names
-        df.columns = df.columns.str.strip()
-
-        return self._process_dataframe(df)
+        return {
+            "header": header_idx,
+            "skiprows": skiprows,
+            "dtype": str,  # Read all as strings to prevent type coercion issues
+            "keep_default_na": False,  # Don't convert empty strings to NaN
+            "na_values": [""],  # Only treat empty string as NA
+        }
@@ -0,0 +1,96 @@
+"""
+Compiled date parsers for import files
+
+datetime.strptime re-reads its format string on every call and is one of the
+slowest stdlib calls. compile_date_parser() turns a template's date_format
+into a parser function once per process: formats made of %Y, %m and %d with
+a single separator (%m/%d/%Y, %Y-%m-%d, %d.%m.%Y, ...) get a hand-written
+fast path, and anything else uses strptime.
+"""
+
+import re
+from collections.abc import Callable
+from datetime import date, datetime
+from functools import cache
+
+# %Y, %m and %d, each once, joined by the same one-character separator
+_SIMPLE_FORMAT = re.compile(r"%([Ymd])([/\-.])%([Ymd])\2%([Ymd])")
+
+# Digits strptime accepts for each directive: (fewest, most)
+_DIRECTIVE_WIDTHS = {"Y": (4, 4), "m": (1, 2), "d": (1, 2)}
+
+
+def _strptime_parser(date_format: str) -> Callable[[str], date]:
+    def parse(text: str) -> date:
+        return datetime.strptime(text, date_format).date()
+
+    return parse
+
+
+@cache
+def compile_date_parser(date_format: str) -> Callable[[str], date]:
+    """
+    Get the parser for a date format, building it on first use
+
+    Args:
+        date_format: strptime format string
+
+    Returns:
+        Function converting a stripped string to a date; raises ValueError
+        for text that does not match the format, exactly like strptime
+    """
+    slow = _strptime_parser(date_format)
+    match = _SIMPLE_FORMAT.fullmatch(date_format)
+    if match is None:
+        return slow
+
+    first, separator, second, third = match.groups()
+    order = (first, second, third)
+    if sorted(order) != ["Y", "d", "m"]:
+        return slow
+
+    widths = [_DIRECTIVE_WIDTHS[directive] for directive in order]
+    year_at, month_at, day_at = (order.index(d) for d in ("Y", "m", "d"))
+
+    def parse(text: str) -> date:
+        parts = text.split(separator)
+        if len(parts) == 3 and text.isascii():
+            for part, (fewest, most) in zip(parts, widths, strict=True):
+                if not (fewest <= len(part) <= most and part.isdigit()):
+                    break
+            else:
+                return date(
+                    int(parts[year_at]), int(parts[month_at]), int(parts[day_at])
+                )
+        # Unusual input (spaces, missing padding rules, ...): let strptime decide
+        return slow(text)
+
+    return parse
+
+
+class DateParser:
+    """
+    Parses one file's date cells with a compiled parser, memoizing results
+
+    Bank exports repeat the same few hundred dates thousands of times, so
+    each distinct string is parsed once per file.
+    """
+
+    def __init__(self, date_format: str):
+        self.date_format = date_format
+        self._parse = compile_date_parser(date_format)
+        self._memo: dict[str, date] = {}
+
+    def __call__(self, text: str) -> date:
+        """Parse a stripped date string; raises ValueError if it does not match"""
+        parsed = self._memo.get(text)
+        if parsed is None:
+            parsed = self._memo[text] = self._parse(text)
+        return parsed
+
+    def __getstate__(self) -> dict:
+        # Compiled parsers are closures; workers rebuild them from the format
+        return {"date_format": self.date_format}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["date_format"])
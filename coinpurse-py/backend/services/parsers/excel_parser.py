@@ -2,11 +2,26 @@
 Excel file parser
 """
 
+import operator
+from collections.abc import Iterator, Sequence
 from typing import Any, BinaryIO
 
+import openpyxl
 import pandas as pd
 
-from .base_parser import BaseParser, ParsedRow
+from .base_parser import BaseParser, ParsedBatch
+from .converter_plan import ConverterPlan
+
+try:
+    # Optional Rust-based reader, several times faster than openpyxl
+    from python_calamine import CalamineWorkbook
+except ImportError:  # pragma: no cover - depends on the environment
+    CalamineWorkbook = None
+
+# Leading bytes of .xlsx workbooks, the only kind openpyxl can read
+_ZIP_SIGNATURE = b"PK\x03\x04"
+
+ENGINES = ("calamine", "openpyxl")
 
 
 class ExcelParser(BaseParser):
@@ -19,21 +34,104 @@ class ExcelParser(BaseParser):
         date_format: str = "%m/%d/%Y",
         header_row: int = 1,
         skip_rows: int = 0,
-        sheet_name: str | int = 0,
+        sheet_name: str | int | None = 0,
+        vectorized: bool = True,
+        fast: bool = True,
+        engine: str | None = None,
+        plan: ConverterPlan | None = None,
     ):
-        super().__init__(column_mappings, amount_config, date_format, header_row, skip_rows)
+        """
+        Initialize the parser with template configuration
+
+        Args:
+            sheet_name: Sheet name or 0-based index to read, or None for every
+                sheet whose header row has all the mapped columns
+            fast: If True, stream the workbook and keep only the mapped columns
+                instead of loading every cell through pandas.read_excel
+            engine: Reader for the fast path, "calamine" or "openpyxl";
+                None picks calamine when it is installed
+
+        See BaseParser for the other arguments.
+        """
+        super().__init__(
+            column_mappings,
+            amount_config,
+            date_format,
+            header_row,
+            skip_rows,
+            vectorized,
+            plan,
+        )
+        if engine is not None and engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}")
+        if engine == "calamine" and CalamineWorkbook is None:
+            raise ValueError("engine 'calamine' requires python-calamine")
         self.sheet_name = sheet_name
+        self.fast = fast
+        self.engine = engine
 
-    def parse(self, file: BinaryIO) -> list[ParsedRow]:
+    def parse_batch(self, file: BinaryIO) -> ParsedBatch:
         """
-        Parse an Excel file and return a list of ParsedRow objects
+        Parse an Excel file into a single ParsedBatch
+
+        When every sheet is read, rows are numbered as if the sheets were
+        stacked one under another, header rows included, so row numbers stay
+        unique within the file.
 
         Args:
             file: Binary file object to parse
 
         Returns:
-            List of ParsedRow objects
+            ParsedBatch holding every row of the file
+        """
+        frames = self._read_fast(file) if self.fast else self._read_pandas(file)
+        return self._process_dataframe(self._stack_sheets(frames))
+
+    def read_header(self, file: BinaryIO) -> list[str]:
         """
+        Read only the column names of an Excel sheet
+
+        When every sheet is selected, reads the first sheet parse_batch would
+        read: the first whose header row has all the mapped columns.
+
+        Args:
+            file: Binary file object to read
+
+        Returns:
+            Column names from the template's header row, whitespace stripped
+        """
+        headers = self.read_sheet_headers(file)
+        if self.sheet_name is None:
+            required = set(self._mapped_columns())
+            headers = [header for header in headers if required <= set(header)]
+        return headers[0] if headers else []
+
+    def read_sheet_headers(self, file: BinaryIO) -> list[list[str]]:
+        """
+        Read only the column names of each selected sheet
+
+        Args:
+            file: Binary file object to read
+
+        Returns:
+            Column names of each sheet in workbook order, empty for a sheet
+            with fewer rows than the header row
+        """
+        if self.fast:
+            return [
+                self._read_sheet_header(rows) or []
+                for _name, rows in self._iter_sheets(file)
+            ]
+
+        sheets = pd.read_excel(
+            file, sheet_name=self.sheet_name, header=self.header_row - 1, nrows=0
+        )
+        if self.sheet_name is not None:
+            sheets = {self.sheet_name: sheets}
+        return [[str(name).strip() for name in df.columns] for df in sheets.values()]
+
+    def _read_pandas(self, file: BinaryIO) -> Iterator[pd.DataFrame]:
+        """Read the selected sheets whole with pandas.read_excel"""
         # header_row is 1-indexed in our config, pandas uses 0-indexed
         header_idx = self.header_row - 1
 
@@ -44,7 +142,7 @@ class ExcelParser(BaseParser):
             skiprows = list(range(self.header_row, self.header_row + self.skip_rows))
 
         # Read Excel file
-        df = pd.read_excel(
+        sheets = pd.read_excel(
             file,
             sheet_name=self.sheet_name,
             header=header_idx,
@@ -52,8 +150,141 @@ class ExcelParser(BaseParser):
             dtype=str,  # Read all as strings to prevent type coercion issues
             na_values=[""],  # Only treat empty string as NA
         )
+        if self.sheet_name is not None:
+            sheets = {self.sheet_name: sheets}
+
+        required = set(self._mapped_columns())
+        for df in sheets.values():
+            # Strip whitespace from column names
+            df.columns = df.columns.astype(str).str.strip()
+            if self.sheet_name is None and not required <= set(df.columns):
+                continue
+            yield df
+
+    def _read_fast(self, file: BinaryIO) -> Iterator[pd.DataFrame]:
+        """
+        Stream the selected sheets, keeping only the mapped columns
+
+        Cells keep their Excel types (dates, numbers), which the date and
+        amount conversions accept as they are.
+        """
+        wanted = self._mapped_columns()
+        for _name, rows in self._iter_sheets(file):
+            header = self._read_sheet_header(rows)
+            if header is None:
+                continue
+
+            positions: dict[str, int] = {}
+            for i, name in enumerate(header):
+                if name in wanted:
+                    positions.setdefault(name, i)
+            if self.sheet_name is None and len(positions) < len(wanted):
+                continue
+
+            for _ in range(self.skip_rows):
+                next(rows, None)
+            yield self._mapped_frame(rows, positions)
+
+    def _iter_sheets(
+        self, file: BinaryIO
+    ) -> Iterator[tuple[str, Iterator[Sequence[Any]]]]:
+        """Yield (sheet name, row values) for each selected sheet"""
+        engine = self.engine
+        if engine is None:
+            engine = "calamine" if CalamineWorkbook is not None else "openpyxl"
+
+        if engine == "openpyxl":
+            file.seek(0)
+            is_xlsx = file.read(4) == _ZIP_SIGNATURE
+            file.seek(0)
+            if not is_xlsx:
+                # Legacy .xls: leave it to pandas and whatever reader it has
+                sheets = pd.read_excel(
+                    file, sheet_name=self.sheet_name, header=None, dtype=object
+                )
+                if self.sheet_name is not None:
+                    sheets = {self.sheet_name: sheets}
+                for name, df in sheets.items():
+                    yield str(name), df.itertuples(index=False, name=None)
+                return
+
+            workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+            try:
+                for name in self._select_sheets(workbook.sheetnames):
+                    yield name, workbook[name].iter_rows(values_only=True)
+            finally:
+                workbook.close()
+            return
+
+        workbook = CalamineWorkbook.from_filelike(file)
+        try:
+            for name in self._select_sheets(workbook.sheet_names):
+                sheet = workbook.get_sheet_by_name(name)
+                # Keep leading blank rows so header_row counts from the top
+                yield name, iter(sheet.to_python(skip_empty_area=False))
+        finally:
+            workbook.close()
+
+    def _select_sheets(self, names: list[str]) -> list[str]:
+        """Names of the sheets to read, in workbook order"""
+        if self.sheet_name is None:
+            return names
+        if isinstance(self.sheet_name, int):
+            if not 0 <= self.sheet_name < len(names):
+                raise ValueError(f"Worksheet index {self.sheet_name} is invalid")
+            return [names[self.sheet_name]]
+        if self.sheet_name not in names:
+            raise ValueError(f"Worksheet named '{self.sheet_name}' not found")
+        return [self.sheet_name]
+
+    def _read_sheet_header(self, rows: Iterator[Sequence[Any]]) -> list[str] | None:
+        """Advance to the header row and return its names, None if too short"""
+        header = None
+        for _ in range(self.header_row):
+            header = next(rows, None)
+            if header is None:
+                return None
+        return ["" if pd.isna(name) else str(name).strip() for name in header]
+
+    def _mapped_frame(
+        self, rows: Iterator[Sequence[Any]], positions: dict[str, int]
+    ) -> pd.DataFrame:
+        """Build a DataFrame of the mapped columns from the remaining rows"""
+        names = list(positions)
+        if not names:
+            count = sum(1 for _ in rows)
+            return pd.DataFrame(index=pd.RangeIndex(count))
+
+        pick = operator.itemgetter(*positions.values())
+        width = max(positions.values()) + 1
+        records = []
+        for row in rows:
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            cells = pick(row)
+            records.append(cells if len(names) > 1 else (cells,))
+
+        df = pd.DataFrame.from_records(records, columns=names)
+        # Blank cells read as "" (calamine) or None (openpyxl); treat both as NA
+        df = df.replace("", None)
+
+        # Formatting can stretch a sheet past its data; drop the blank tail
+        filled = df.notna().to_numpy().any(axis=1).nonzero()[0]
+        return df.iloc[: filled[-1] + 1 if len(filled) else 0]
 
-        # Strip whitespace from column names
-        df.columns = df.columns.str.strip()
+    def _mapped_columns(self) -> list[str]:
+        return list(self.plan.columns)
 
-        return self._process_dataframe(df)
+    def _stack_sheets(self, frames: Iterator[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate sheets, numbering rows on from the previous sheet"""
+        stacked = []
+        start = 0
+        for df in frames:
+            df = df.set_axis(pd.RangeIndex(start, start + len(df.index)))
+            stacked.append(df)
+            start += len(df.index) + self.header_row + self.skip_rows
+        if not stacked:
+            return pd.DataFrame()
+        if len(stacked) == 1:
+            return stacked[0]
+        return pd.concat(stacked)
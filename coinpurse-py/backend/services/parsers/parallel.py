@@ -0,0 +1,72 @@
+"""
+Parallel parsing of several import files on a process pool
+"""
+
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+
+import config
+
+from .base_parser import BaseParser, ParsedBatch
+
+
+def _parse_file(parser: BaseParser, path: Path) -> ParsedBatch:
+    """Worker entry point: parse one file, opened here rather than sent over"""
+    with open(path, "rb") as file:
+        return parser.parse_batch(file)
+
+
+@cache
+def get_parse_executor() -> Executor:
+    """
+    Get the process-wide pool used to parse files in parallel
+
+    Workers are started with "spawn" so they never inherit the server's
+    threads or open database connections.
+    """
+    return ProcessPoolExecutor(
+        max_workers=config.IMPORT_PARSE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the parse pool if it was started"""
+    if get_parse_executor.cache_info().currsize:
+        get_parse_executor().shutdown(wait=False, cancel_futures=True)
+        get_parse_executor.cache_clear()
+
+
+def parse_files(
+    jobs: Sequence[tuple[BaseParser, Path]],
+    executor: Executor | None = None,
+) -> list[ParsedBatch | Exception]:
+    """
+    Parse several files at once, one pool task per file
+
+    A file that fails to parse does not affect the others; its exception is
+    returned in its place.
+
+    Args:
+        jobs: (parser, path of the file) pairs; only the path is sent to the
+            worker, which reads the file from disk itself
+        executor: Pool to run on (defaults to get_parse_executor())
+
+    Returns:
+        Parsed batch or the raised exception for each job, in input order
+    """
+    if executor is None:
+        executor = get_parse_executor()
+
+    futures = [executor.submit(_parse_file, parser, path) for parser, path in jobs]
+
+    results: list[ParsedBatch | Exception] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
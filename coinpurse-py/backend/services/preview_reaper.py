@@ -0,0 +1,111 @@
+"""
+Scheduled reaper for stale preview batches
+Previews that are never confirmed keep their staged rows in the database;
+this deletes previews older than a maximum age on a fixed interval, on a
+background thread of the API process, along with stored uploads of the same
+age and parse memos that can no longer be used
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from functools import cache
+
+from sqlalchemy.orm import Session
+
+import config
+from database import SessionLocal
+from repositories.import_batch_repository import ImportBatchRepository, ReapedPreviews
+from repositories.import_template_repository import ImportTemplateRepository
+from services.file_store import FileStore, ReapedFiles, get_file_store
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewReaper:
+    """Deletes preview batches older than max_age_hours every interval"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: float,
+        max_age_hours: int = 24,
+        file_store: FileStore | None = None,
+    ):
+        """
+        Args:
+            session_factory: Creates a new database session for each run
+            interval_seconds: Time between runs; 0 or less disables the schedule
+            max_age_hours: Previews, and uploads no batch was read from and
+                not sent again, older than this many hours are deleted
+            file_store: Store of uploaded files (defaults to get_file_store())
+        """
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.max_age_hours = max_age_hours
+        self.file_store = file_store if file_store is not None else get_file_store()
+        # Outcome of the most recent run, None until the first one
+        self.last_result: ReapedPreviews | None = None
+        self.last_files: ReapedFiles | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> ReapedPreviews:
+        """Delete the stale previews and stored files now, reporting the previews"""
+        with self.session_factory() as db:
+            batch_repo = ImportBatchRepository(db)
+            result = batch_repo.reap_old_previews(self.max_age_hours)
+            # Any batch still in the database can be parsed again, so keep its
+            # upload; only files of deleted or reaped batches age out
+            files = self.file_store.reap(
+                self.max_age_hours,
+                keep=batch_repo.get_content_hashes(),
+                templates=ImportTemplateRepository(db).get_all(include_inactive=True),
+            )
+        self.last_result = result
+        self.last_files = files
+        if result.batches:
+            logger.info(
+                "Reaped %d preview batches: %d staged rows, %d bytes",
+                result.batches,
+                result.rows,
+                result.bytes,
+            )
+        if files.files:
+            logger.info("Reaped %d stored files: %d bytes", files.files, files.bytes)
+        return result
+
+    def start(self) -> None:
+        """Run on a daemon thread every interval, first after one interval"""
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="preview-reaper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the schedule, waiting for a run in progress to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                # Keep the schedule alive; the next run retries
+                logger.exception("Reaping stale preview batches failed")
+
+
+@cache
+def get_preview_reaper() -> PreviewReaper:
+    """The process-wide preview reaper"""
+    return PreviewReaper(
+        session_factory=SessionLocal,
+        interval_seconds=config.PREVIEW_REAP_INTERVAL_SECONDS,
+        max_age_hours=config.PREVIEW_MAX_AGE_HOURS,
+    )
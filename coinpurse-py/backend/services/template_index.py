@@ -0,0 +1,217 @@
+"""
+Automatic import template selection from a file's header row
+
+Every active template's column_mappings names the headers its files must
+have. The index maps each header name to the templates that need it, so an
+uploaded file's header row is matched against every template in one pass
+over its columns instead of trial-parsing the file with each template.
+
+The index is process-wide and rebuilt on the next lookup after any template
+is created, changed or deleted.
+"""
+
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from models import FileFormat, ImportTemplate
+from repositories.import_template_repository import ImportTemplateRepository
+from services.parsers import CsvParser, ExcelParser, mapped_columns
+
+# Leading bytes of .xlsx (zip) and legacy .xls (OLE2) workbooks
+_EXCEL_SIGNATURES = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+
+
+def normalize_header(name: str) -> str:
+    """Header names match ignoring case and surrounding whitespace"""
+    return name.strip().casefold()
+
+
+def required_headers(template: ImportTemplate) -> frozenset[str]:
+    """Normalized header names a file must have to be read with a template"""
+    names = mapped_columns(template.column_mappings or {}, template.amount_config or {})
+    return frozenset(normalize_header(n) for n in names)
+
+
+def sniff_file_format(file: BinaryIO) -> FileFormat:
+    """Tell Excel workbooks from CSV by their first bytes, leaving the file at 0"""
+    file.seek(0)
+    head = file.read(4)
+    file.seek(0)
+    return FileFormat.EXCEL if head in _EXCEL_SIGNATURES else FileFormat.CSV
+
+
+@dataclass(frozen=True)
+class TemplateMatch:
+    """A template whose every mapped column is in a file's header row"""
+
+    template_id: int
+    template_name: str
+    matched_columns: int
+
+
+class TemplateIndex:
+    """Inverted index of header name -> templates requiring it"""
+
+    def __init__(self, templates: Iterable[ImportTemplate]):
+        # Templates are grouped by where the header is, since files are read
+        # once per distinct (format, header row)
+        self._by_header: dict[tuple[FileFormat, int], dict[str, list[int]]] = (
+            defaultdict(lambda: defaultdict(list))
+        )
+        self._required: dict[int, int] = {}
+        self._names: dict[int, str] = {}
+        # Excel templates that read every sheet, not just the first
+        self._all_sheets: set[int] = set()
+        for template in templates:
+            headers = required_headers(template)
+            if not headers:
+                continue
+            group = self._by_header[(template.file_format, template.header_row)]
+            for header in headers:
+                group[header].append(template.template_id)
+            self._required[template.template_id] = len(headers)
+            self._names[template.template_id] = template.template_name
+            if template.all_sheets:
+                self._all_sheets.add(template.template_id)
+
+    def __len__(self) -> int:
+        return len(self._required)
+
+    def header_rows(self, file_format: FileFormat) -> list[int]:
+        """Header row numbers used by the indexed templates of a format"""
+        return sorted(row for fmt, row in self._by_header if fmt == file_format)
+
+    def match(
+        self,
+        file_format: FileFormat,
+        header_row: int,
+        headers: Sequence[str],
+        sheet_index: int = 0,
+    ) -> list[TemplateMatch]:
+        """
+        Find the templates a header row satisfies
+
+        Args:
+            file_format: Format of the file
+            header_row: Row number the headers were read from (1-indexed)
+            headers: The file's column names
+            sheet_index: Workbook sheet the headers came from; only templates
+                reading every sheet can read one after the first
+
+        Returns:
+            Matching templates, those mapping the most columns first
+        """
+        group = self._by_header.get((file_format, header_row))
+        if not group:
+            return []
+
+        hits: Counter[int] = Counter()
+        for header in {normalize_header(h) for h in headers if isinstance(h, str)}:
+            hits.update(group.get(header, ()))
+
+        matches = [
+            TemplateMatch(template_id, self._names[template_id], count)
+            for template_id, count in hits.items()
+            if count == self._required[template_id]
+            and (sheet_index == 0 or template_id in self._all_sheets)
+        ]
+        return sorted(matches, key=lambda m: (-m.matched_columns, m.template_id))
+
+    def detect(self, file: BinaryIO) -> list[TemplateMatch]:
+        """
+        Find the templates able to read a file, reading only its header rows
+
+        Returns:
+            Matching templates, best first; the file is left at position 0
+        """
+        file_format = sniff_file_format(file)
+
+        matches: dict[int, TemplateMatch] = {}
+        for header_row in self.header_rows(file_format):
+            try:
+                sheets = self._read_headers(file, file_format, header_row)
+            except Exception:
+                # Not enough rows, or not readable in this format at all
+                sheets = []
+            finally:
+                file.seek(0)
+            for sheet_index, headers in enumerate(sheets):
+                for match in self.match(file_format, header_row, headers, sheet_index):
+                    matches.setdefault(match.template_id, match)
+        return sorted(
+            matches.values(), key=lambda m: (-m.matched_columns, m.template_id)
+        )
+
+    def _read_headers(
+        self, file: BinaryIO, file_format: FileFormat, header_row: int
+    ) -> list[list[str]]:
+        """Column names of each sheet the indexed templates could read"""
+        if file_format == FileFormat.CSV:
+            return [CsvParser({}, {}, header_row=header_row).read_header(file)]
+        if not self._all_sheets:
+            return [ExcelParser({}, {}, header_row=header_row).read_header(file)]
+        # Read every sheet, as the parser does for these templates
+        parser = ExcelParser({}, {}, header_row=header_row, sheet_name=None)
+        return parser.read_sheet_headers(file)
+
+
+def best_match(matches: Sequence[TemplateMatch]) -> TemplateMatch | None:
+    """The single most specific match, or None if there is none or a tie"""
+    if not matches:
+        return None
+    if len(matches) > 1 and matches[1].matched_columns == matches[0].matched_columns:
+        return None
+    return matches[0]
+
+
+_index: TemplateIndex | None = None
+# Bumped on every invalidation so a build that raced with one is not kept
+_version = 0
+_lock = threading.Lock()
+
+
+def get_template_index(db: Session) -> TemplateIndex:
+    """The process-wide index of active templates, built on first use"""
+    global _index
+    with _lock:
+        if _index is not None:
+            return _index
+        version = _version
+
+    index = TemplateIndex(ImportTemplateRepository(db).get_all())
+    with _lock:
+        if _version == version:
+            _index = index
+    return index
+
+
+def invalidate_template_index() -> None:
+    """Drop the index so the next lookup rebuilds it from the database"""
+    global _index, _version
+    with _lock:
+        _index = None
+        _version += 1
+
+
+# Session.info key set when a flush changed templates
+_CHANGED_KEY = "import_templates_changed"
+
+
+@event.listens_for(ImportTemplate, "after_insert")
+@event.listens_for(ImportTemplate, "after_update")
+@event.listens_for(ImportTemplate, "after_delete")
+def _record_change(mapper, connection, target: ImportTemplate) -> None:
+    # Rebuilt on commit, so a concurrent build cannot cache uncommitted data
+    object_session(target).info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_change(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        invalidate_template_index()
@@ -7,9 +7,16 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+import config
 from database import get_db
 from main import app
 from models import Base, Category, Institution
+from services.file_store import get_file_store
+from services.fingerprint_cache import get_fingerprint_cache
+from services.import_job_runner import ImportJobRunner, get_import_job_runner
+from services.parsers import clear_template_plans
+from services.preview_reaper import PreviewReaper, get_preview_reaper
+from services.template_index import invalidate_template_index
 
 
 @pytest.fixture(scope="session")
@@ -41,6 +48,39 @@ def db_session(engine):
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_fingerprint_cache():
+    """Each test rolls its data back, so start with an empty shared cache"""
+    get_fingerprint_cache().clear()
+    yield
+    get_fingerprint_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_template_index():
+    """Templates are rolled back after each test, so rebuild the index per test"""
+    invalidate_template_index()
+    yield
+    invalidate_template_index()
+
+
+@pytest.fixture(autouse=True)
+def clear_converter_plans():
+    """Template IDs are reused across rolled-back tests, so drop cached plans"""
+    clear_template_plans()
+    yield
+    clear_template_plans()
+
+
+@pytest.fixture(autouse=True)
+def import_file_store(tmp_path, monkeypatch):
+    """Keep stored uploads and memoized parses in a per-test directory"""
+    monkeypatch.setattr(config, "IMPORT_FILE_DIR", tmp_path / "import_files")
+    get_file_store.cache_clear()
+    yield get_file_store()
+    get_file_store.cache_clear()
+
+
 @pytest.fixture(scope="session")
 def session_factory(engine):
     """Session factory for creating new sessions"""
@@ -48,7 +88,22 @@ def session_factory(engine):
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def import_job_runner(db_session, tmp_path) -> ImportJobRunner:
+    """
+    Import job runner that runs jobs inline on submit.
+    Job sessions share the test connection, inside a savepoint.
+    """
+    return ImportJobRunner(
+        session_factory=lambda: Session(
+            bind=db_session.get_bind(), join_transaction_mode="create_savepoint"
+        ),
+        upload_dir=tmp_path / "import_jobs",
+        synchronous=True,
+    )
+
+
+@pytest.fixture(scope="function")
+def client(db_session, import_job_runner):
     """
     Create a test client with database session override.
     Uses the same session as db_session fixture for consistency.
@@ -58,6 +113,11 @@ def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_import_job_runner] = lambda: import_job_runner
+    # Never reap on a schedule against the real database
+    app.dependency_overrides[get_preview_reaper] = lambda: PreviewReaper(
+        session_factory=import_job_runner.session_factory, interval_seconds=0
+    )
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,64 @@
+"""
+Integration tests for Balances Router bulk endpoints.
+"""
+
+from datetime import date
+
+from models import Account, AccountBalance, AccountType, Institution, TaxTreatmentType
+
+
+class TestBulkSoftDeleteEndpoints:
+    """Tests for the bulk soft delete and restore endpoints"""
+
+    def _balances(self, db_session):
+        institution = Institution(name="Balance Bank")
+        db_session.add(institution)
+        db_session.flush()
+        account = Account(
+            institution_id=institution.institution_id,
+            account_name="Brokerage",
+            account_type=AccountType.INVESTMENT,
+            tax_treatment=TaxTreatmentType.TAXABLE,
+            last_4_digits="4444",
+        )
+        db_session.add(account)
+        db_session.flush()
+        balances = [
+            AccountBalance(
+                account_id=account.account_id,
+                balance_date=date(2026, 1, day),
+                balance=100_000 + day,
+            )
+            for day in (2, 9, 16)
+        ]
+        db_session.add_all(balances)
+        db_session.commit()
+        return account, [b.balance_id for b in balances]
+
+    def test_bulk_delete_then_restore(self, client, db_session):
+        """Both endpoints should report only the rows they changed"""
+        account, ids = self._balances(db_session)
+
+        response = client.post(
+            "/api/balances/bulk-delete", json={"balance_ids": ids[:2]}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"updated_count": 2}
+        active = client.get(
+            "/api/balances/", params={"account_id": account.account_id}
+        ).json()
+        assert [b["balance_id"] for b in active] == [ids[2]]
+
+        response = client.post("/api/balances/bulk-restore", json={"balance_ids": ids})
+        assert response.status_code == 200
+        assert response.json() == {"updated_count": 2}
+        active = client.get(
+            "/api/balances/", params={"account_id": account.account_id}
+        ).json()
+        assert len(active) == 3
+
+    def test_bulk_delete_requires_ids(self, client):
+        """An empty ID list should be rejected"""
+        response = client.post("/api/balances/bulk-delete", json={"balance_ids": []})
+
+        assert response.status_code == 422
@@ -2,20 +2,32 @@
 Integration tests for Import Router
 """
 
+import asyncio
+import functools
 import io
+import json
 
 import pytest
+from sqlalchemy import select
 
+import config
 from models import (
     Account,
     AccountType,
+    BackgroundJob,
     Category,
     CategoryMapping,
     FileFormat,
+    ImportBatch,
     ImportTemplate,
     Institution,
+    JobStatus,
+    JobType,
     TaxTreatmentType,
+    Transaction,
 )
+from routers.import_router import _job_events
+from services import ImportService
 
 
 class TestImportTemplateEndpoints:
@@ -672,6 +684,310 @@ class TestImportUploadEndpoint:
         assert response.status_code == 422
         assert "no import template configured" in response.json()["detail"]
 
+    def test_upload_detects_template_from_header(
+        self, client, db_session, setup_import_data
+    ):
+        """An account without a template should use the one matching the header"""
+        account = Account(
+            institution_id=setup_import_data["institution"].institution_id,
+            account_name="No Template Account",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="0000",
+            tracks_transactions=True,
+        )
+        db_session.add(account)
+        db_session.commit()
+
+        csv_content = """Transaction Date,Post Date,Description,Category,Amount
+1/15/2026,1/15/2026,Test Payment,,100.00"""
+
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        data = {"account_id": account.account_id}
+
+        response = client.post("/api/import/upload", files=files, data=data)
+
+        assert response.status_code == 200
+        assert response.json()["summary"]["valid_rows"] == 1
+        batch = db_session.get(ImportBatch, response.json()["import_batch_id"])
+        assert batch.template_id == setup_import_data["template"].template_id
+
+    def test_detect_template(self, client, setup_import_data):
+        """Should name the matching template and the accounts using it"""
+        csv_content = "Transaction Date,Post Date,Description,Category,Amount,Memo\n"
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+
+        response = client.post("/api/import/templates/detect", files=files)
+
+        assert response.status_code == 200
+        result = response.json()
+        template_id = setup_import_data["template"].template_id
+        assert result["template_id"] == template_id
+        assert result["matches"] == [
+            {
+                "template_id": template_id,
+                "template_name": "Test Import Template",
+                "matched_columns": 5,
+                "account_ids": [setup_import_data["account"].account_id],
+            }
+        ]
+
+    def test_detect_template_no_match(self, client, setup_import_data):
+        """A header no template fits should give no template"""
+        files = {"file": ("test.csv", io.BytesIO(b"Date,Memo,Value\n"), "text/csv")}
+
+        response = client.post("/api/import/templates/detect", files=files)
+
+        assert response.status_code == 200
+        assert response.json() == {"template_id": None, "matches": []}
+
+    def test_upload_rejects_oversized_file(
+        self, client, setup_import_data, monkeypatch
+    ):
+        """Should refuse uploads larger than the configured maximum"""
+        monkeypatch.setattr(config, "MAX_UPLOAD_BYTES", 256)
+
+        csv_content = "Transaction Date,Post Date,Description,Category,Amount\n" + (
+            "1/15/2026,1/15/2026,Test Payment,,100.00\n" * 20
+        )
+
+        files = {"file": ("big.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        data = {"account_id": setup_import_data["account"].account_id}
+
+        response = client.post("/api/import/upload", files=files, data=data)
+
+        assert response.status_code == 413
+        assert "maximum size" in response.json()["detail"]
+
+    def test_upload_spooled_to_disk(self, client, setup_import_data):
+        """Files larger than the in-memory spool threshold should still parse"""
+        header = "Transaction Date,Post Date,Description,Category,Amount\n"
+        row = "1/15/2026,1/15/2026,Test Payment With A Long Description,,100.00\n"
+        csv_content = header + row * 25_000  # well over the 1MB spool threshold
+
+        files = {"file": ("big.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        data = {"account_id": setup_import_data["account"].account_id}
+
+        response = client.post("/api/import/upload", files=files, data=data)
+
+        assert response.status_code == 200
+        assert response.json()["summary"]["total_rows"] == 25_000
+
+    def test_bulk_upload_preview(self, client, db_session, setup_import_data):
+        """Should preview every file with its own account and batch"""
+        second_account = Account(
+            institution_id=setup_import_data["institution"].institution_id,
+            template_id=setup_import_data["template"].template_id,
+            account_name="Second Import Account",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="1111",
+            tracks_transactions=True,
+        )
+        db_session.add(second_account)
+        db_session.commit()
+
+        header = "Transaction Date,Post Date,Description,Category,Amount\n"
+        first = header + "1/15/2026,1/15/2026,Test Payment,,100.00\n"
+        second = header + (
+            "1/16/2026,1/16/2026,Test Purchase,,-50.00\n"
+            "1/17/2026,1/17/2026,Another,,-25.00\n"
+        )
+
+        files = [
+            ("files", ("jan.csv", io.BytesIO(first.encode()), "text/csv")),
+            ("files", ("feb.csv", io.BytesIO(second.encode()), "text/csv")),
+        ]
+        data = {
+            "account_ids": [
+                setup_import_data["account"].account_id,
+                second_account.account_id,
+            ]
+        }
+
+        response = client.post("/api/import/upload/bulk", files=files, data=data)
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["summary"]["total_rows"] == 3
+        assert [f["file_name"] for f in result["files"]] == ["jan.csv", "feb.csv"]
+        assert result["files"][1]["account_id"] == second_account.account_id
+        assert result["files"][1]["summary"]["total_rows"] == 2
+        batch_ids = {f["import_batch_id"] for f in result["files"]}
+        assert len(batch_ids) == 2
+
+    def test_bulk_upload_mismatched_account_ids(self, client, setup_import_data):
+        """Should require exactly one account ID per file"""
+        files = [
+            ("files", ("a.csv", io.BytesIO(b"x"), "text/csv")),
+            ("files", ("b.csv", io.BytesIO(b"x"), "text/csv")),
+        ]
+        data = {"account_ids": [setup_import_data["account"].account_id]}
+
+        response = client.post("/api/import/upload/bulk", files=files, data=data)
+
+        assert response.status_code == 422
+
+
+class TestImportBatchRowsEndpoint:
+    """Tests for paging through a preview batch's rows"""
+
+    @pytest.fixture
+    def setup_preview(self, client, db_session, monkeypatch):
+        """Upload a 12-row file with a 5-row first page"""
+        monkeypatch.setattr(config, "PREVIEW_PAGE_SIZE", 5)
+
+        institution = Institution(name="Paging Bank")
+        uncategorized = Category(name="Uncategorized")
+        shopping = Category(name="Shopping")
+        db_session.add_all([institution, uncategorized, shopping])
+        db_session.commit()
+
+        db_session.add(
+            CategoryMapping(
+                institution_id=institution.institution_id,
+                bank_category_name="Shopping",
+                coinpurse_category_id=shopping.category_id,
+            )
+        )
+        template = ImportTemplate(
+            template_name="Paging Template",
+            file_format=FileFormat.CSV,
+            column_mappings={
+                "transaction_date": "Date",
+                "posted_date": "Date",
+                "description": "Desc",
+                "category": "Category",
+                "amount": "Amt",
+            },
+            amount_config={"sign_convention": "bank_standard", "decimal_places": 2},
+            date_format="%m/%d/%Y",
+        )
+        db_session.add(template)
+        db_session.commit()
+
+        account = Account(
+            institution_id=institution.institution_id,
+            template_id=template.template_id,
+            account_name="Paging Account",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="5555",
+            tracks_transactions=True,
+        )
+        db_session.add(account)
+        db_session.commit()
+
+        # Rows 2-13; every third row is Shopping, row 13 has a bad date
+        lines = ["Date,Desc,Category,Amt"]
+        for i in range(11):
+            category = "Shopping" if i % 3 == 0 else ""
+            lines.append(f"1/{i + 1}/2026,Item {i},{category},-{i + 1}.00")
+        lines.append("bad-date,Broken,,-1.00")
+
+        content = io.BytesIO("\n".join(lines).encode())
+        files = {"file": ("page.csv", content, "text/csv")}
+        response = client.post(
+            "/api/import/upload", files=files, data={"account_id": account.account_id}
+        )
+
+        return {"preview": response.json(), "shopping": shopping}
+
+    def test_upload_returns_first_page(self, setup_preview):
+        """The upload response should hold the summary and only the first page"""
+        preview = setup_preview["preview"]
+
+        assert preview["summary"]["total_rows"] == 12
+        assert [t["row_number"] for t in preview["transactions"]] == [2, 3, 4, 5, 6]
+        assert preview["next_cursor"] == 6
+
+    def test_cursor_paging_walks_all_rows(self, client, setup_preview):
+        """Following next_cursor should visit every row exactly once"""
+        batch_id = setup_preview["preview"]["import_batch_id"]
+        cursor = setup_preview["preview"]["next_cursor"]
+        seen = [t["row_number"] for t in setup_preview["preview"]["transactions"]]
+
+        while cursor is not None:
+            page = client.get(
+                f"/api/import/batches/{batch_id}/rows",
+                params={"after_row": cursor},
+            ).json()
+            assert page["total"] == 12
+            seen.extend(t["row_number"] for t in page["transactions"])
+            cursor = page["next_cursor"]
+
+        assert seen == list(range(2, 14))
+
+    def test_offset_paging(self, client, setup_preview):
+        """Offset and limit should select a window of rows"""
+        batch_id = setup_preview["preview"]["import_batch_id"]
+
+        page = client.get(
+            f"/api/import/batches/{batch_id}/rows",
+            params={"offset": 10, "limit": 5},
+        ).json()
+
+        assert [t["row_number"] for t in page["transactions"]] == [12, 13]
+        assert page["next_cursor"] is None
+
+    def test_filter_by_category(self, client, setup_preview):
+        """Should return only rows mapped to the given category"""
+        batch_id = setup_preview["preview"]["import_batch_id"]
+
+        page = client.get(
+            f"/api/import/batches/{batch_id}/rows",
+            params={"category_id": setup_preview["shopping"].category_id},
+        ).json()
+
+        assert page["total"] == 4
+        assert [t["row_number"] for t in page["transactions"]] == [2, 5, 8, 11]
+        assert all(t["category_name"] == "Shopping" for t in page["transactions"])
+
+    def test_filter_by_errors(self, client, setup_preview):
+        """Should separate rows with and without validation errors"""
+        batch_id = setup_preview["preview"]["import_batch_id"]
+        url = f"/api/import/batches/{batch_id}/rows"
+
+        with_errors = client.get(url, params={"has_errors": True}).json()
+        without_errors = client.get(
+            url, params={"has_errors": False, "is_duplicate": False}
+        ).json()
+
+        assert [t["row_number"] for t in with_errors["transactions"]] == [13]
+        assert without_errors["total"] == 11
+
+    def test_rows_batch_not_found(self, client):
+        """Should return 404 for an unknown batch"""
+        response = client.get("/api/import/batches/99999/rows")
+
+        assert response.status_code == 404
+
+    def test_recategorize_after_mapping_change(self, client, db_session, setup_preview):
+        """Editing a mapping mid-review should re-map only the affected rows"""
+        batch_id = setup_preview["preview"]["import_batch_id"]
+        retail = Category(name="Retail")
+        db_session.add(retail)
+        db_session.commit()
+        mapping = db_session.scalars(select(CategoryMapping)).one()
+        mapping.coinpurse_category_id = retail.category_id
+        db_session.commit()
+
+        response = client.post(f"/api/import/batches/{batch_id}/recategorize")
+
+        assert response.status_code == 200
+        assert response.json()["recategorized_rows"] == 4
+        page = client.get(
+            f"/api/import/batches/{batch_id}/rows",
+            params={"category_id": retail.category_id},
+        ).json()
+        assert [t["row_number"] for t in page["transactions"]] == [2, 5, 8, 11]
+
+    def test_recategorize_batch_not_found(self, client):
+        """Should return 404 for an unknown batch"""
+        response = client.post("/api/import/batches/99999/recategorize")
+
+        assert response.status_code == 404
+
 
 class TestImportConfirmEndpoint:
     """Tests for the confirm import endpoint"""
@@ -781,6 +1097,42 @@ class TestImportConfirmEndpoint:
         assert result["imported_count"] == 2
         assert result["status"] == "completed"
 
+    def test_edit_row_category(self, client, db_session, setup_with_preview):
+        """An edited row should be imported with its new category"""
+        new_category = Category(name="Edited Category")
+        db_session.add(new_category)
+        db_session.commit()
+        batch_id = setup_with_preview["import_batch_id"]
+
+        response = client.patch(
+            f"/api/import/batches/{batch_id}/rows/3",
+            json={"coinpurse_category_id": new_category.category_id},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["row_number"] == 3
+        assert response.json()["coinpurse_category_id"] == new_category.category_id
+
+        client.post(
+            "/api/import/confirm",
+            json={"import_batch_id": batch_id, "selected_rows": [3]},
+        )
+        imported = db_session.scalars(
+            select(Transaction).where(Transaction.description == "Purchase")
+        ).one()
+        assert imported.category_id == new_category.category_id
+
+    def test_edit_row_not_found(self, client, setup_with_preview):
+        """Should return 404 for a row that is not in the batch"""
+        batch_id = setup_with_preview["import_batch_id"]
+
+        response = client.patch(
+            f"/api/import/batches/{batch_id}/rows/999",
+            json={"coinpurse_category_id": 1},
+        )
+
+        assert response.status_code == 404
+
     def test_confirm_invalid_batch(self, client):
         """Should return error for invalid batch"""
         response = client.post(
@@ -792,6 +1144,344 @@ class TestImportConfirmEndpoint:
         assert "not found" in response.json()["detail"]
 
 
+class TestImportJobEndpoints:
+    """Tests for background import job endpoints"""
+
+    CSV_CONTENT = """Date,Posted Date,Desc,Amt
+1/15/2026,1/15/2026,Payment,100.00
+1/16/2026,1/16/2026,Purchase,-50.00
+1/17/2026,1/17/2026,Another,-25.00"""
+
+    @pytest.fixture
+    def setup_job_data(self, db_session):
+        """Set up an account with a template for job tests"""
+        institution = Institution(name="Job Bank")
+        db_session.add(institution)
+        db_session.add(Category(name="Uncategorized"))
+        db_session.commit()
+
+        template = ImportTemplate(
+            template_name="Job Template",
+            file_format=FileFormat.CSV,
+            column_mappings={
+                "transaction_date": "Date",
+                "posted_date": "Posted Date",
+                "description": "Desc",
+                "amount": "Amt",
+            },
+            amount_config={"sign_convention": "bank_standard", "decimal_places": 2},
+            date_format="%m/%d/%Y",
+        )
+        db_session.add(template)
+        db_session.commit()
+
+        account = Account(
+            institution_id=institution.institution_id,
+            template_id=template.template_id,
+            account_name="Job Account",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="7777",
+            tracks_transactions=True,
+        )
+        db_session.add(account)
+        db_session.commit()
+        db_session.refresh(account)
+
+        return {"account": account, "template": template}
+
+    def _queue_upload(self, client, account_id):
+        files = {
+            "file": ("jobs.csv", io.BytesIO(self.CSV_CONTENT.encode()), "text/csv")
+        }
+        return client.post(
+            "/api/import/jobs/upload", files=files, data={"account_id": account_id}
+        )
+
+    def test_upload_job_builds_preview(self, client, setup_job_data):
+        """Should queue a preview job and report its result when polled"""
+        response = self._queue_upload(client, setup_job_data["account"].account_id)
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["job_type"] == "import_preview"
+
+        response = client.get(f"/api/import/jobs/{job['job_id']}")
+
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] == "completed"
+        assert job["import_batch_id"] is not None
+        assert job["result"]["total_rows"] == 3
+        assert job["progress_current"] == 3
+
+        batch = client.get(f"/api/import/batches/{job['import_batch_id']}").json()
+        assert batch["status"] == "preview"
+
+    def test_upload_job_removes_saved_file(
+        self, client, setup_job_data, import_job_runner
+    ):
+        """The saved upload should be deleted once the job has run"""
+        self._queue_upload(client, setup_job_data["account"].account_id)
+
+        assert list(import_job_runner.upload_dir.iterdir()) == []
+
+    def test_upload_job_account_without_template(
+        self, client, db_session, setup_job_data
+    ):
+        """Should reject the upload before queuing a job if no template matches"""
+        account = Account(
+            institution_id=setup_job_data["account"].institution_id,
+            account_name="No Template",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="0000",
+            tracks_transactions=True,
+        )
+        db_session.add(account)
+        db_session.commit()
+
+        files = {"file": ("other.csv", io.BytesIO(b"Date,Memo,Value\n"), "text/csv")}
+        response = client.post(
+            "/api/import/jobs/upload",
+            files=files,
+            data={"account_id": account.account_id},
+        )
+
+        assert response.status_code == 422
+
+    def test_upload_job_detects_template(self, client, db_session, setup_job_data):
+        """An account without a template should use the one matching the header"""
+        account = Account(
+            institution_id=setup_job_data["account"].institution_id,
+            account_name="No Template",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="0000",
+            tracks_transactions=True,
+        )
+        db_session.add(account)
+        db_session.commit()
+
+        response = self._queue_upload(client, account.account_id)
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "completed"
+
+    def test_confirm_job(self, client, setup_job_data):
+        """Should queue a confirm job that imports the selected rows"""
+        upload = self._queue_upload(client, setup_job_data["account"].account_id)
+        import_batch_id = client.get(
+            f"/api/import/jobs/{upload.json()['job_id']}"
+        ).json()["import_batch_id"]
+
+        response = client.post(
+            "/api/import/jobs/confirm",
+            json={"import_batch_id": import_batch_id, "selected_rows": [2, 3]},
+        )
+
+        assert response.status_code == 202
+        job = client.get(f"/api/import/jobs/{response.json()['job_id']}").json()
+        assert job["job_type"] == "import_confirm"
+        assert job["status"] == "completed"
+        assert job["result"]["imported_count"] == 2
+        assert job["result"]["skipped_count"] == 1
+        assert job["progress_current"] == 2
+        assert job["progress_total"] == 2
+
+    def test_job_reports_stage(self, client, setup_job_data, import_job_runner):
+        """A running job's pipeline stage should be shown with its progress"""
+        job_id = self._queue_upload(
+            client, setup_job_data["account"].account_id
+        ).json()["job_id"]
+        report = import_job_runner._progress_reporter(job_id)
+
+        report(2, None, "categorized")
+        job = client.get(f"/api/import/jobs/{job_id}").json()
+
+        assert job["progress_current"] == 2
+        assert job["progress_stage"] == "categorized"
+
+    def test_job_event_stream(self, client, setup_job_data):
+        """The event stream should end with a done event holding the job"""
+        job_id = self._queue_upload(
+            client, setup_job_data["account"].account_id
+        ).json()["job_id"]
+
+        response = client.get(f"/api/import/jobs/{job_id}/events")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        event, data = response.text.strip().split("\n")
+        assert event == "event: done"
+        job = json.loads(data.removeprefix("data: "))
+        assert job["status"] == "completed"
+        assert job["result"]["total_rows"] == 3
+
+    def test_job_event_stream_stalls(
+        self, client, db_session, setup_job_data, monkeypatch
+    ):
+        """A job that stops changing should end the stream with an error event"""
+        monkeypatch.setattr(config, "JOB_EVENT_INTERVAL", 0)
+        monkeypatch.setattr(config, "JOB_EVENT_STALL_SECONDS", 0)
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_PREVIEW,
+            account_id=setup_job_data["account"].account_id,
+        )
+        db_session.add(job)
+        db_session.commit()
+
+        response = client.get(f"/api/import/jobs/{job.job_id}/events")
+
+        progress, error = response.text.strip().split("\n\n")
+        assert progress.startswith("event: progress\n")
+        event, data = error.split("\n")
+        assert event == "event: error"
+        assert "no progress" in json.loads(data.removeprefix("data: "))["detail"]
+
+    def test_job_event_stream_stops_on_disconnect(
+        self, db_session, setup_job_data, import_job_runner
+    ):
+        """The stream should stop polling once the client has gone"""
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_PREVIEW,
+            account_id=setup_job_data["account"].account_id,
+        )
+        db_session.add(job)
+        db_session.commit()
+
+        class DisconnectedRequest:
+            async def is_disconnected(self):
+                return True
+
+        async def collect():
+            events = _job_events(job.job_id, import_job_runner, DisconnectedRequest())
+            return [event async for event in events]
+
+        assert asyncio.run(collect()) == []
+
+    def test_job_event_stream_not_found(self, client):
+        """Should return 404 for an unknown job"""
+        response = client.get("/api/import/jobs/99999/events")
+
+        assert response.status_code == 404
+
+    def test_confirm_job_invalid_batch(self, client):
+        """Should return 404 for an unknown batch"""
+        response = client.post(
+            "/api/import/jobs/confirm",
+            json={"import_batch_id": 99999, "selected_rows": [1]},
+        )
+
+        assert response.status_code == 404
+
+    def test_failed_job_records_error(
+        self, client, db_session, setup_job_data, import_job_runner
+    ):
+        """A job whose upload has gone missing should be marked failed"""
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_PREVIEW,
+            account_id=setup_job_data["account"].account_id,
+            file_name="missing.csv",
+            file_path=str(import_job_runner.upload_dir / "missing.upload"),
+            parameters={"template_id": setup_job_data["template"].template_id},
+        )
+        db_session.add(job)
+        db_session.commit()
+
+        import_job_runner.run(job.job_id)
+
+        result = client.get(f"/api/import/jobs/{job.job_id}").json()
+        assert result["status"] == "failed"
+        assert "missing" in result["error"]
+
+    def test_failed_job_removes_saved_file(
+        self, client, db_session, setup_job_data, import_job_runner
+    ):
+        """The saved upload should be deleted when the job fails too"""
+        import_job_runner.upload_dir.mkdir(parents=True, exist_ok=True)
+        file_path = import_job_runner.upload_dir / "bad-template.upload"
+        file_path.write_bytes(self.CSV_CONTENT.encode())
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_PREVIEW,
+            account_id=setup_job_data["account"].account_id,
+            file_name="bad-template.csv",
+            file_path=str(file_path),
+            parameters={"template_id": 99999},
+        )
+        db_session.add(job)
+        db_session.commit()
+
+        import_job_runner.run(job.job_id)
+
+        db_session.refresh(job)
+        assert job.status == JobStatus.FAILED
+        assert not file_path.exists()
+
+    def test_confirm_job_persists_committed_progress(
+        self, client, db_session, setup_job_data, import_job_runner, monkeypatch
+    ):
+        """Rows committed before a confirm fails should be recorded on the job"""
+        upload = self._queue_upload(client, setup_job_data["account"].account_id)
+        import_batch_id = client.get(
+            f"/api/import/jobs/{upload.json()['job_id']}"
+        ).json()["import_batch_id"]
+
+        monkeypatch.setattr(
+            "services.import_job_runner.ImportService",
+            functools.partial(ImportService, chunk_size=1, commit_rows=1),
+        )
+        insert_window = ImportService._insert_window
+
+        def fail_at_row_3(self, import_batch_id, account_id, imported_date, row_range):
+            if row_range[0] == 3:
+                raise RuntimeError("connection lost")
+            return insert_window(
+                self, import_batch_id, account_id, imported_date, row_range
+            )
+
+        monkeypatch.setattr(ImportService, "_insert_window", fail_at_row_3)
+        response = client.post(
+            "/api/import/jobs/confirm",
+            json={"import_batch_id": import_batch_id, "selected_rows": [2, 3, 4]},
+        )
+
+        job = db_session.get(BackgroundJob, response.json()["job_id"])
+        db_session.refresh(job)
+        assert job.status == JobStatus.FAILED
+        assert (job.progress_current, job.progress_total) == (1, 3)
+
+    def test_get_job_not_found(self, client):
+        """Should return 404 for an unknown job"""
+        response = client.get("/api/import/jobs/99999")
+
+        assert response.status_code == 404
+
+    def test_resume_unfinished_jobs(
+        self, client, db_session, setup_job_data, import_job_runner
+    ):
+        """Jobs left queued by a previous process should run on resume"""
+        import_job_runner.upload_dir.mkdir(parents=True, exist_ok=True)
+        file_path = import_job_runner.upload_dir / "leftover.upload"
+        file_path.write_bytes(self.CSV_CONTENT.encode())
+
+        job = BackgroundJob(
+            job_type=JobType.IMPORT_PREVIEW,
+            account_id=setup_job_data["account"].account_id,
+            file_name="leftover.csv",
+            file_path=str(file_path),
+            parameters={"template_id": setup_job_data["template"].template_id},
+        )
+        db_session.add(job)
+        db_session.commit()
+
+        assert import_job_runner.resume_unfinished() == 1
+
+        db_session.refresh(job)
+        assert job.status == JobStatus.COMPLETED
+        assert job.result["total_rows"] == 3
+
+
 class TestImportBatchEndpoints:
     """Tests for batch history endpoints"""
 
@@ -884,3 +1574,23 @@ class TestImportBatchEndpoints:
         assert data["import_batch_id"] == setup_with_batches["import_batch_id"]
         assert data["status"] == "completed"
         assert "account_name" in data
+
+    def test_reparse_batch(self, client, setup_with_batches):
+        """A batch's stored file should preview again without a new upload"""
+        import_batch_id = setup_with_batches["import_batch_id"]
+        detail = client.get(f"/api/import/batches/{import_batch_id}").json()
+        assert len(detail["content_hash"]) == 64
+
+        response = client.post(f"/api/import/batches/{import_batch_id}/reparse")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["import_batch_id"] != import_batch_id
+        assert data["already_imported_batch_id"] == import_batch_id
+        assert data["summary"]["duplicate_count"] == 1
+
+    def test_reparse_batch_not_found(self, client):
+        """Should return 404 for a batch that does not exist"""
+        response = client.post("/api/import/batches/99999/reparse")
+
+        assert response.status_code == 404
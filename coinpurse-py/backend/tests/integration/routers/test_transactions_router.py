@@ -17,6 +17,7 @@ from routers.transactions_router import (
     list_transactions,
     list_transactions_with_names,
 )
+from services.fingerprint_cache import get_fingerprint_cache
 
 
 class TestTransactionListEndpoints:
@@ -154,3 +155,146 @@ class TestTransactionListEndpoints:
         )
 
         assert [row.description for row in data] == ["Inside Range"]
+
+
+class TestDuplicateSweepEndpoints:
+    """Tests for the duplicate sweep and resolve endpoints"""
+
+    def _ledger(self, db_session):
+        institution = Institution(name="Sweep Bank")
+        category = Category(name="Uncategorized")
+        db_session.add_all([institution, category])
+        db_session.flush()
+        account = Account(
+            institution_id=institution.institution_id,
+            account_name="Sweep Card",
+            account_type=AccountType.CREDIT_CARD,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="3333",
+        )
+        db_session.add(account)
+        db_session.flush()
+        transactions = [
+            Transaction(
+                account_id=account.account_id,
+                category_id=category.category_id,
+                transaction_date=date(2026, 1, 5),
+                posted_date=date(2026, 1, 6),
+                amount=-999,
+                description="STREAMING",
+                transaction_type=TransactionType.PURCHASE,
+                notes="",
+            )
+            for _ in range(2)
+        ]
+        db_session.add_all(transactions)
+        db_session.commit()
+        return account, [t.transaction_id for t in transactions]
+
+    def test_sweep_then_resolve(self, client, db_session):
+        """A sweep should report the group and resolving it keeps one transaction"""
+        account, ids = self._ledger(db_session)
+
+        response = client.post(
+            "/api/transactions/duplicates/sweep",
+            params={"account_id": account.account_id},
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "completed"
+
+        response = client.get(f"/api/transactions/duplicates/sweep/{job['job_id']}")
+        assert response.status_code == 200
+        groups = response.json()["groups"]
+        assert [g["transaction_ids"] for g in groups] == [ids]
+
+        response = client.post(
+            "/api/transactions/duplicates/resolve",
+            json={"groups": [g["transaction_ids"] for g in groups]},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"deleted_count": 1}
+
+        remaining = client.get(
+            "/api/transactions/", params={"account_ids": [account.account_id]}
+        ).json()
+        assert [t["transaction_id"] for t in remaining] == [ids[0]]
+
+    def test_sweep_unknown_account(self, client):
+        """Sweeping an unknown account should return 404"""
+        response = client.post(
+            "/api/transactions/duplicates/sweep", params={"account_id": 999_999}
+        )
+
+        assert response.status_code == 404
+
+    def test_sweep_result_unknown_job(self, client):
+        """Fetching an unknown sweep should return 404"""
+        response = client.get("/api/transactions/duplicates/sweep/999999")
+
+        assert response.status_code == 404
+
+    def test_resolve_rejects_non_duplicates(self, client, db_session):
+        """Resolving transactions that differ should return 400"""
+        account, ids = self._ledger(db_session)
+        db_session.get(Transaction, ids[1]).amount = -1000
+        db_session.commit()
+
+        response = client.post(
+            "/api/transactions/duplicates/resolve", json={"groups": [ids]}
+        )
+
+        assert response.status_code == 400
+
+
+class TestBulkSoftDeleteEndpoints:
+    """Tests for the bulk soft delete and restore endpoints"""
+
+    def test_bulk_delete_then_restore(self, client, db_session):
+        """Both endpoints should report only the rows they changed"""
+        account, ids = TestDuplicateSweepEndpoints()._ledger(db_session)
+
+        response = client.post(
+            "/api/transactions/bulk-delete",
+            json={"transaction_ids": [ids[0], 999_999]},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"updated_count": 1}
+
+        response = client.post(
+            "/api/transactions/bulk-delete", json={"transaction_ids": ids}
+        )
+        assert response.json() == {"updated_count": 1}
+        remaining = client.get(
+            "/api/transactions/", params={"account_ids": [account.account_id]}
+        ).json()
+        assert remaining == []
+
+        response = client.post(
+            "/api/transactions/bulk-restore", json={"transaction_ids": ids}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"updated_count": 2}
+        remaining = client.get(
+            "/api/transactions/", params={"account_ids": [account.account_id]}
+        ).json()
+        assert sorted(t["transaction_id"] for t in remaining) == ids
+
+    def test_bulk_delete_invalidates_fingerprint_cache(self, client, db_session):
+        """Cached fingerprints of the affected account should be dropped"""
+        account, ids = TestDuplicateSweepEndpoints()._ledger(db_session)
+        cache = get_fingerprint_cache()
+        cache.get(account.account_id, lambda start, end: [])
+        assert account.account_id in cache
+
+        client.post("/api/transactions/bulk-delete", json={"transaction_ids": ids})
+
+        assert account.account_id not in cache
+
+    def test_bulk_delete_requires_ids(self, client):
+        """An empty ID list should be rejected"""
+        response = client.post(
+            "/api/transactions/bulk-delete", json={"transaction_ids": []}
+        )
+
+        assert response.status_code == 422
@@ -291,3 +291,67 @@ class TestDeleteGroup:
         repo.delete_group(inst.institution_id, "Nonexistent")
         # verify still empty
         assert repo.get_active_by_group(inst.institution_id, "Nonexistent") == []
+
+    def test_delete_group_returns_count_including_inactive(self, db_session: Session):
+        inst = Institution(name="Count Bank")
+        cat1 = Category(name="C1")
+        cat2 = Category(name="C2")
+        db_session.add_all([inst, cat1, cat2])
+        db_session.commit()
+
+        db_session.add_all(
+            [
+                CategoryMapping(
+                    institution_id=inst.institution_id,
+                    bank_category_name="Counted",
+                    coinpurse_category_id=cat1.category_id,
+                ),
+                CategoryMapping(
+                    institution_id=inst.institution_id,
+                    bank_category_name="Counted",
+                    coinpurse_category_id=cat2.category_id,
+                    is_active=False,
+                ),
+            ]
+        )
+        db_session.commit()
+
+        repo = CategoryMappingRepository(db_session)
+        assert repo.delete_group(inst.institution_id, "Counted") == 2
+        assert repo.get_by_institution(inst.institution_id, include_inactive=True) == []
+
+
+class TestSoftDeleteGroup:
+    """Tests for soft_delete_group"""
+
+    def test_deactivates_active_mappings_only(self, db_session: Session):
+        inst = Institution(name="Soft Bank")
+        cat1 = Category(name="S1")
+        cat2 = Category(name="S2")
+        db_session.add_all([inst, cat1, cat2])
+        db_session.commit()
+
+        active = CategoryMapping(
+            institution_id=inst.institution_id,
+            bank_category_name="Soft",
+            coinpurse_category_id=cat1.category_id,
+        )
+        db_session.add_all(
+            [
+                active,
+                CategoryMapping(
+                    institution_id=inst.institution_id,
+                    bank_category_name="Soft",
+                    coinpurse_category_id=cat2.category_id,
+                    is_active=False,
+                ),
+            ]
+        )
+        db_session.commit()
+
+        repo = CategoryMappingRepository(db_session)
+        assert repo.soft_delete_group(inst.institution_id, "Soft") == 1
+        assert active.is_active is False
+        mappings = repo.get_by_institution(inst.institution_id, include_inactive=True)
+        assert len(mappings) == 2
+        assert repo.soft_delete_group(inst.institution_id, "Soft") == 0
@@ -0,0 +1,110 @@
+"""
+Unit tests for ImportBatchRepository cleanup methods
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import (
+    Account,
+    AccountType,
+    FileFormat,
+    ImportBatch,
+    ImportStagingRow,
+    ImportStatus,
+    Institution,
+    TaxTreatmentType,
+)
+from repositories.import_batch_repository import ImportBatchRepository
+
+
+def _make_account(db_session: Session) -> Account:
+    inst = Institution(name="Cleanup Bank")
+    db_session.add(inst)
+    db_session.commit()
+
+    account = Account(
+        institution_id=inst.institution_id,
+        account_name="Cleanup Account",
+        account_type=AccountType.CREDIT_CARD,
+        tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+        last_4_digits="1234",
+        tracks_transactions=True,
+    )
+    db_session.add(account)
+    db_session.commit()
+    return account
+
+
+def _make_batch(
+    db_session: Session, account: Account, status: ImportStatus, age_hours: int
+) -> ImportBatch:
+    batch = ImportBatch(
+        account_id=account.account_id,
+        file_name="statement.csv",
+        file_format=FileFormat.CSV,
+        status=status,
+        created_at=datetime.now(UTC) - timedelta(hours=age_hours),
+    )
+    db_session.add(batch)
+    db_session.commit()
+
+    db_session.add_all(
+        ImportStagingRow(
+            import_batch_id=batch.import_batch_id,
+            row_number=row_number,
+            description="Row",
+            transaction_type="DEBIT",
+        )
+        for row_number in (2, 3)
+    )
+    db_session.commit()
+    return batch
+
+
+class TestCleanupOldPreviews:
+    """Tests for cleanup_old_previews"""
+
+    def test_deletes_old_previews_and_their_rows(self, db_session: Session):
+        account = _make_account(db_session)
+        old = _make_batch(db_session, account, ImportStatus.PREVIEW, age_hours=48)
+        recent = _make_batch(db_session, account, ImportStatus.PREVIEW, age_hours=1)
+        completed = _make_batch(
+            db_session, account, ImportStatus.COMPLETED, age_hours=48
+        )
+        old_id = old.import_batch_id
+
+        deleted = ImportBatchRepository(db_session).cleanup_old_previews(hours=24)
+
+        assert deleted == 1
+        assert db_session.get(ImportBatch, old_id) is None
+        assert db_session.get(ImportBatch, recent.import_batch_id) is not None
+        assert db_session.get(ImportBatch, completed.import_batch_id) is not None
+
+        remaining = db_session.execute(
+            select(ImportStagingRow.import_batch_id, func.count()).group_by(
+                ImportStagingRow.import_batch_id
+            )
+        ).all()
+        assert dict(remaining) == {
+            recent.import_batch_id: 2,
+            completed.import_batch_id: 2,
+        }
+
+    def test_nothing_to_delete(self, db_session: Session):
+        account = _make_account(db_session)
+        _make_batch(db_session, account, ImportStatus.PREVIEW, age_hours=1)
+
+        assert ImportBatchRepository(db_session).cleanup_old_previews(hours=24) == 0
+
+    def test_reap_reports_reclaimed_rows_and_bytes(self, db_session: Session):
+        account = _make_account(db_session)
+        _make_batch(db_session, account, ImportStatus.PREVIEW, age_hours=48)
+        _make_batch(db_session, account, ImportStatus.PREVIEW, age_hours=1)
+
+        reaped = ImportBatchRepository(db_session).reap_old_previews(hours=24)
+
+        # Two rows of "Row" with empty candidate and error lists ("[]")
+        assert (reaped.batches, reaped.rows, reaped.bytes) == (1, 2, 14)
@@ -0,0 +1,147 @@
+"""
+Unit tests for fixed-point amount parsing
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.parsers.amount_parsing import (
+    CENTS_LIMIT,
+    parse_cents,
+    parse_cents_column,
+)
+
+SAMPLES = [
+    ("1234.56", 123456),
+    ("-1234.56", -123456),
+    ("+12", 1200),
+    ("1,234.56", 123456),
+    ("$1,234.56", 123456),
+    ("$-1,234.56", -123456),
+    ("-$1,234.56", -123456),
+    ("€12.50", 1250),
+    ("(1,234.56)", -123456),
+    ("($45.00)", -4500),
+    ("45.00-", -4500),
+    ("  12.34  ", 1234),
+    (".5", 50),
+    ("12.", 1200),
+    ("0.29", 29),
+    ("90071992547409.93", 9007199254740993),
+    ("1.005", 101),
+    ("2.675", 268),
+    ("-1.005", -101),
+    ("1.004999", 100),
+    ("", None),
+    ("   ", None),
+    ("abc", None),
+    ("$", None),
+    ("-", None),
+    ("1.2.3", None),
+    ("(12.00", None),
+    ("12.00)", None),
+    ("1e3", 100000),
+    ("1.5E+03", 150000),
+    ("-2.5e-1", -25),
+    ("$1.2345e2", 12345),
+    ("1.005E0", 101),
+    ("(1E2)", -10000),
+    ("1e", None),
+    ("e3", None),
+    ("1e999999", None),
+    ("inf", None),
+    ("nan", None),
+    ("١٢٣", None),
+]
+
+
+class TestParseCents:
+    """Tests for parse_cents"""
+
+    @pytest.mark.parametrize("text,expected", SAMPLES)
+    def test_text(self, text, expected):
+        """Text amounts should convert exactly, with no float rounding"""
+        assert parse_cents(text) == expected
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (12, 1200),
+            (-3, -300),
+            (np.int64(7), 700),
+            (4.35, 435),
+            (-0.1, -10),
+            (1e16, 1000000000000000000),
+            (float("nan"), None),
+            (float("inf"), None),
+            (None, None),
+        ],
+    )
+    def test_numeric_cells(self, value, expected):
+        """Numeric cells (e.g. from Excel) use their shortest decimal form"""
+        assert parse_cents(value) == expected
+
+    @pytest.mark.parametrize(
+        "decimal_places,expected", [(0, 1235), (1, 12346), (3, 1234568)]
+    )
+    def test_decimal_places(self, decimal_places, expected):
+        """The result unit should follow decimal_places"""
+        assert parse_cents("1,234.5678", decimal_places) == expected
+
+    @pytest.mark.parametrize("decimal_places", ["2", -1, 2.0, True])
+    def test_invalid_decimal_places(self, decimal_places):
+        """A malformed decimal_places should be rejected"""
+        with pytest.raises(ValueError):
+            parse_cents("1.00", decimal_places)
+
+
+class TestParseCentsColumn:
+    """Tests for parse_cents_column"""
+
+    @pytest.mark.parametrize("decimal_places", [0, 2, 3])
+    def test_matches_scalar(self, decimal_places):
+        """The vectorized path should agree with parse_cents cell for cell"""
+        texts = [text for text, _expected in SAMPLES] + [None]
+        result = parse_cents_column(pd.Series(texts, dtype=object), decimal_places)
+
+        assert result.dtype == np.int64
+        assert result.tolist() == [
+            parse_cents(text, decimal_places) or 0 for text in texts
+        ]
+
+    def test_random_text_matches_scalar(self):
+        """Arbitrary mixes of amount characters should agree with parse_cents"""
+        rng = random.Random(1)
+        alphabet = "0123456789,.-+$€() x"
+        texts = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randrange(12)))
+            for _ in range(5000)
+        ]
+        result = parse_cents_column(pd.Series(texts, dtype=object))
+
+        assert result.tolist() == [parse_cents(text) or 0 for text in texts]
+
+    def test_scientific_notation(self):
+        """Exponent cells from spreadsheet exports should not read as 0"""
+        result = parse_cents_column(pd.Series(["1e3", "1.5E+03", "-4.5", "2E-2"]))
+        assert result.tolist() == [100000, 150000, -450, 2]
+
+    def test_numeric_column(self):
+        """Float columns should go through the shortest decimal form"""
+        result = parse_cents_column(pd.Series([4.35, -0.1, np.nan, 4.35]))
+        assert result.tolist() == [435, -10, 0, 435]
+
+    def test_huge_amounts_are_exact_or_clipped(self):
+        """Long whole parts should stay exact and overflow should be clipped"""
+        result = parse_cents_column(
+            pd.Series(["1234567890123456.78", "9" * 30, "-" + "9" * 30])
+        )
+        assert result.tolist() == [123456789012345678, CENTS_LIMIT, -CENTS_LIMIT]
+
+    def test_invalid_decimal_places(self):
+        """A malformed decimal_places should be rejected even for empty columns"""
+        with pytest.raises(ValueError):
+            parse_cents_column(pd.Series([], dtype=object), "2")
@@ -0,0 +1,160 @@
+"""
+Unit tests for compiled converter plans
+"""
+
+import io
+from datetime import datetime
+from types import SimpleNamespace
+
+from services.parsers import (
+    CsvParser,
+    compile_plan,
+    get_template_plan,
+)
+
+
+def make_template(template_id=1, modified_at=datetime(2026, 1, 1), **config):
+    return SimpleNamespace(
+        template_id=template_id,
+        modified_at=modified_at,
+        column_mappings=config.get("column_mappings", {"amount": "Amount"}),
+        amount_config=config.get("amount_config", {}),
+        date_format=config.get("date_format", "%m/%d/%Y"),
+    )
+
+
+class TestCompilePlan:
+    """Tests for compile_plan"""
+
+    def test_resolves_columns(self, capital_one_template_config):
+        """Should resolve every field to its source column once"""
+        plan = compile_plan(
+            capital_one_template_config["column_mappings"],
+            capital_one_template_config["amount_config"],
+            '"%m/%d/%Y"',
+        )
+
+        assert plan.transaction_date == "Transaction Date"
+        assert plan.debit == "Debit"
+        assert plan.credit == "Credit"
+        assert plan.amount is None
+        assert plan.sign_convention == "split_columns"
+        assert plan.date_format == "%m/%d/%Y"
+        assert plan.amount_error is None
+        assert "Posted Date" in plan.columns
+
+    def test_unknown_sign_convention_is_bank_standard(self):
+        """Should treat an unknown sign convention as bank_standard"""
+        plan = compile_plan({"amount": "Amount"}, {"sign_convention": "bogus"})
+
+        assert plan.sign_convention == "bank_standard"
+
+    def test_bad_decimal_places_is_amount_error(self):
+        """Should report unusable decimal places once, as every row's error"""
+        plan = compile_plan({"amount": "Amount"}, {"decimal_places": "two"})
+
+        assert plan.amount_error.startswith("Error parsing amount:")
+
+    def test_bind_drops_missing_columns(self, chase_template_config):
+        """Should unmap fields whose column the file lacks"""
+        plan = compile_plan(
+            chase_template_config["column_mappings"],
+            chase_template_config["amount_config"],
+        )
+
+        bound = plan.bind(["Transaction Date", "Description", "Amount"])
+
+        assert bound.transaction_date == "Transaction Date"
+        assert bound.posted_date is None
+        assert bound.category is None
+        assert bound.columns == plan.columns
+
+
+class TestTemplatePlanCache:
+    """Tests for get_template_plan"""
+
+    def test_reuses_plan_for_unchanged_template(self):
+        """Should compile a template only once per version"""
+        template = make_template()
+
+        assert get_template_plan(template) is get_template_plan(template)
+
+    def test_rebuilds_plan_when_template_changes(self):
+        """Should recompile when modified_at changes"""
+        template = make_template()
+        first = get_template_plan(template)
+
+        template.modified_at = datetime(2026, 2, 1)
+        template.column_mappings = {"amount": "Total"}
+        second = get_template_plan(template)
+
+        assert second is not first
+        assert second.amount == "Total"
+
+    def test_unsaved_template_is_not_cached(self):
+        """Should not cache templates without an ID"""
+        template = make_template(template_id=None)
+
+        assert get_template_plan(template) is not get_template_plan(template)
+
+
+class TestPlanParsing:
+    """Tests for parsers running a compiled plan"""
+
+    CSV = b"""Date,Description,Amount,Type
+01/15/2026,COFFEE,4.50,Debit
+01/16/2026,REFUND,12.00,Credit
+01/17/2026,BAD,abc,Debit
+"""
+
+    def test_parser_uses_given_plan(self):
+        """Should parse with the plan instead of the raw configuration"""
+        plan = compile_plan(
+            {
+                "transaction_date": "Date",
+                "description": "Description",
+                "amount": "Amount",
+                "transaction_type": "Type",
+            },
+            {"sign_convention": "amount_with_type_column", "credit_indicator": "CR"},
+        )
+
+        rows = CsvParser({}, {}, plan=plan).parse(io.BytesIO(self.CSV))
+
+        assert plan.credit_indicator == "cr"
+        assert [r.amount for r in rows] == [-450, 1200, 0]
+        assert [r.transaction_type for r in rows] == ["DEBIT", "CREDIT", "DEBIT"]
+
+    def test_row_wise_matches_vectorized(self):
+        """Both paths should produce identical rows from the same plan"""
+        plan = compile_plan(
+            {
+                "transaction_date": "Date",
+                "posted_date": "Posted",
+                "description": "Description",
+                "amount": "Amount",
+            },
+            {"sign_convention": "inverted"},
+        )
+
+        vectorized = CsvParser({}, {}, plan=plan).parse(io.BytesIO(self.CSV))
+        row_wise = CsvParser({}, {}, vectorized=False, plan=plan).parse(
+            io.BytesIO(self.CSV)
+        )
+
+        assert vectorized == row_wise
+        assert vectorized[0].amount == -450
+        assert vectorized[0].posted_date is None
+
+    def test_amount_error_reported_on_every_row(self):
+        """Both paths should report a configuration error on each row"""
+        plan = compile_plan(
+            {"transaction_date": "Date", "description": "Description"},
+            {"decimal_places": -1},
+        )
+
+        for vectorized in (True, False):
+            rows = CsvParser({}, {}, vectorized=vectorized, plan=plan).parse(
+                io.BytesIO(self.CSV)
+            )
+            assert all(plan.amount_error in r.validation_errors for r in rows)
@@ -5,6 +5,8 @@ Unit tests for CSV parser
 import io
 from datetime import date
 
+import pytest
+
 from services.parsers import CsvParser
 
 
@@ -334,3 +336,182 @@ not-a-date,1/21/2026,Test Transaction,,Sale,-10.00,"""
 
         assert rows[0].amount == -123456  # -$1,234.56 in cents
         assert rows[0].is_valid
+
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_accounting_negatives_and_exact_cents(
+        self, chase_template_config, vectorized
+    ):
+        """Should read (x) and trailing-minus negatives without float rounding"""
+        csv_data = """Transaction Date,Post Date,Description,Category,Type,Amount,Memo
+1/21/2026,1/21/2026,Refund,,Sale,"($1,234.56)",
+1/21/2026,1/21/2026,Fee,,Sale,45.10-,
+1/21/2026,1/21/2026,Big,,Sale,90071992547409.93,"""
+
+        parser = CsvParser(
+            column_mappings=chase_template_config["column_mappings"],
+            amount_config=chase_template_config["amount_config"],
+            date_format=chase_template_config["date_format"],
+            vectorized=vectorized,
+        )
+
+        rows = parser.parse(io.BytesIO(csv_data.encode("utf-8")))
+
+        assert [row.amount for row in rows] == [-123456, -4510, 9007199254740993]
+        assert [row.transaction_type for row in rows] == ["DEBIT", "DEBIT", "CREDIT"]
+
+
+class TestCsvParserVectorized:
+    """The vectorized path must produce exactly what the row-wise path produces"""
+
+    MESSY_CSV = """\
+Transaction Date,Post Date,Description,Category,Type,Amount,Debit,Credit
+1/21/2026,1/21/2026,Payment Thank You,,Credit,3153.72,,3153.72
+1/22/2026,1/23/2026,  STEAMGAMES.COM  ,Entertainment,Debit,-6.9,6.9,
+not-a-date,1/21/2026,Bad Date,,Sale,-10.00,10.00,
+,,Missing Dates,Shopping,Sale,"$-1,234.56","1,234.56",
+1/25/2026,1/25/2026,,,Sale,abc,abc,
+1/26/2026,13/45/2026,Inf Amount,,Sale,inf,inf,
+1/27/2026,1/27/2026,NaN Amount,,Sale,nan,nan,nan
+1/28/2026,1/28/2026,Zero,,CREDIT memo,0,0,0
+1/28/2026,1/28/2026,Rounding,,debit,1.005,2.675,"""
+
+    def _parse_both(self, config: dict, csv_data: str = MESSY_CSV):
+        rows = {}
+        for vectorized in (False, True):
+            parser = CsvParser(
+                column_mappings=config["column_mappings"],
+                amount_config=config["amount_config"],
+                date_format=config["date_format"],
+                vectorized=vectorized,
+            )
+            rows[vectorized] = parser.parse(io.BytesIO(csv_data.encode("utf-8")))
+        return rows[False], rows[True]
+
+    def test_bank_standard_matches_row_wise(self, chase_template_config):
+        """bank_standard convention"""
+        row_wise, vectorized = self._parse_both(chase_template_config)
+        assert vectorized == row_wise
+
+    def test_inverted_matches_row_wise(self, discover_template_config):
+        """inverted convention"""
+        config = discover_template_config.copy()
+        config["column_mappings"] = {
+            **config["column_mappings"],
+            "transaction_date": "Transaction Date",
+        }
+        row_wise, vectorized = self._parse_both(config)
+        assert vectorized == row_wise
+
+    def test_split_columns_matches_row_wise(self, capital_one_template_config):
+        """split_columns convention"""
+        config = capital_one_template_config.copy()
+        config["column_mappings"] = {
+            **config["column_mappings"],
+            "posted_date": "Post Date",
+        }
+        row_wise, vectorized = self._parse_both(config)
+        assert vectorized == row_wise
+
+    def test_amount_with_type_column_matches_row_wise(self, chase_template_config):
+        """amount_with_type_column convention"""
+        config = chase_template_config.copy()
+        config["column_mappings"] = {
+            **config["column_mappings"],
+            "transaction_type": "Type",
+        }
+        config["amount_config"] = {
+            "sign_convention": "amount_with_type_column",
+            "credit_indicator": "Credit",
+            "decimal_places": 2,
+        }
+        row_wise, vectorized = self._parse_both(config)
+        assert vectorized == row_wise
+
+    def test_missing_columns_match_row_wise(self, chase_template_config):
+        """Mapped columns absent from the file behave the same in both paths"""
+        config = chase_template_config.copy()
+        config["column_mappings"] = {
+            "transaction_date": "Nope",
+            "description": "Description",
+            "amount": "Also Nope",
+        }
+        row_wise, vectorized = self._parse_both(config)
+        assert vectorized == row_wise
+        assert all(row.amount == 0 for row in vectorized)
+
+    def test_invalid_amount_config_matches_row_wise(self, chase_template_config):
+        """A broken amount_config reports the same per-row errors"""
+        config = chase_template_config.copy()
+        config["amount_config"] = {
+            "sign_convention": "bank_standard",
+            "decimal_places": "2",
+        }
+        row_wise, vectorized = self._parse_both(config)
+        assert vectorized == row_wise
+        assert all(not row.is_valid for row in vectorized)
+
+    def test_empty_file(self, chase_template_config):
+        """A header-only file yields no rows"""
+        csv_data = "Transaction Date,Post Date,Description,Category,Type,Amount\n"
+        row_wise, vectorized = self._parse_both(chase_template_config, csv_data)
+        assert vectorized == row_wise == []
+
+
+class TestCsvParserChunks:
+    """Tests for streaming a CSV in fixed-size chunks"""
+
+    CSV_DATA = """Transaction Date,Post Date,Description,Category,Type,Amount,Memo
+1/21/2026,1/21/2026,Row 1,,Sale,-10.00,
+1/22/2026,1/22/2026,Row 2,,Sale,-20.00,
+1/23/2026,1/23/2026,Row 3,,Sale,-30.00,
+1/24/2026,1/24/2026,Row 4,,Sale,-40.00,
+1/25/2026,1/25/2026,Row 5,,Sale,-50.00,"""
+
+    def _parser(self, config: dict, **kwargs) -> CsvParser:
+        return CsvParser(
+            column_mappings=config["column_mappings"],
+            amount_config=config["amount_config"],
+            date_format=config["date_format"],
+            **kwargs,
+        )
+
+    def test_chunks_are_bounded(self, chase_template_config):
+        """Each chunk should hold at most chunk_size rows"""
+        parser = self._parser(chase_template_config)
+
+        chunks = list(
+            parser.parse_chunks(io.BytesIO(self.CSV_DATA.encode("utf-8")), chunk_size=2)
+        )
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_chunks_match_full_parse(self, chase_template_config):
+        """Concatenated chunks should equal a full parse, row numbers included"""
+        parser = self._parser(chase_template_config, skip_rows=1)
+
+        full = parser.parse(io.BytesIO(self.CSV_DATA.encode("utf-8")))
+        chunked = [
+            row
+            for chunk in parser.parse_chunks(
+                io.BytesIO(self.CSV_DATA.encode("utf-8")), chunk_size=3
+            )
+            for row in chunk
+        ]
+
+        assert chunked == full
+        assert [row.row_number for row in chunked] == [3, 4, 5, 6]
+
+    def test_whitespace_in_column_names_per_chunk(self, chase_template_config):
+        """Column names should be stripped in every chunk"""
+        csv_data = """\
+Transaction Date , Post Date , Description , Category , Type , Amount
+1/21/2026,1/21/2026,Test 1,,Sale,-10.00
+1/22/2026,1/22/2026,Test 2,,Sale,-20.00"""
+        parser = self._parser(chase_template_config)
+
+        chunks = list(
+            parser.parse_chunks(io.BytesIO(csv_data.encode("utf-8")), chunk_size=1)
+        )
+
+        assert [chunk[0].description for chunk in chunks] == ["Test 1", "Test 2"]
+        assert all(chunk[0].is_valid for chunk in chunks)
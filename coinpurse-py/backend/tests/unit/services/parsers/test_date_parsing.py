@@ -0,0 +1,100 @@
+"""
+Unit tests for compiled date parsers
+"""
+
+import pickle
+from datetime import date, datetime
+
+import pytest
+
+from services.parsers.date_parsing import DateParser, compile_date_parser
+
+SAMPLES = [
+    "01/15/2026",
+    "1/5/2026",
+    "12/31/1999",
+    "2026-01-15",
+    "2026-1-5",
+    "15.01.2026",
+    "2/30/2026",
+    "13/01/2026",
+    "00/10/2026",
+    "1/15/26",
+    "01/15/02026",
+    " 1/15/2026",
+    "1 /15/2026",
+    "01-15-2026",
+    "٠١/١٥/٢٠٢٦",
+    "",
+    "garbage",
+]
+
+
+def _strptime(text: str, date_format: str) -> date | type[ValueError]:
+    try:
+        return datetime.strptime(text, date_format).date()
+    except ValueError:
+        return ValueError
+
+
+def _compiled(text: str, date_format: str) -> date | type[ValueError]:
+    try:
+        return compile_date_parser(date_format)(text)
+    except ValueError:
+        return ValueError
+
+
+class TestCompileDateParser:
+    """Tests for compile_date_parser"""
+
+    @pytest.mark.parametrize(
+        "date_format", ["%m/%d/%Y", "%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%m-%d-%Y"]
+    )
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_fast_path_matches_strptime(self, date_format, text):
+        """Fast paths should accept and reject exactly what strptime does"""
+        assert _compiled(text, date_format) == _strptime(text, date_format)
+
+    def test_other_formats_use_strptime(self):
+        """Formats without a fast path should still parse"""
+        parse = compile_date_parser("%b %d, %Y")
+
+        assert parse("Jan 15, 2026") == date(2026, 1, 15)
+        with pytest.raises(ValueError):
+            parse("2026-01-15")
+
+    def test_compiled_once_per_format(self):
+        """The same format should return the same compiled parser"""
+        assert compile_date_parser("%m/%d/%Y") is compile_date_parser("%m/%d/%Y")
+
+
+class TestDateParser:
+    """Tests for the per-file memoizing DateParser"""
+
+    def test_memoizes_repeated_strings(self):
+        """A repeated string should be parsed only once"""
+        parser = DateParser("%m/%d/%Y")
+
+        first = parser("01/15/2026")
+        second = parser("01/15/2026")
+
+        assert first == date(2026, 1, 15)
+        assert first is second
+
+    def test_errors_raise(self):
+        """Invalid dates should raise ValueError and not be memoized"""
+        parser = DateParser("%m/%d/%Y")
+
+        with pytest.raises(ValueError):
+            parser("2/30/2026")
+        assert parser._memo == {}
+
+    def test_pickles_for_worker_processes(self):
+        """A parser should survive pickling for the parse pool"""
+        parser = DateParser("%Y-%m-%d")
+        parser("2026-01-15")
+
+        restored = pickle.loads(pickle.dumps(parser))
+
+        assert restored("2026-02-01") == date(2026, 2, 1)
+        assert restored._memo == {"2026-02-01": date(2026, 2, 1)}
@@ -3,10 +3,14 @@ Unit tests for Excel parser
 """
 
 import io
+from datetime import date, datetime
 
+import openpyxl
 import pandas as pd
+import pytest
 
 from services.parsers import ExcelParser
+from services.parsers.excel_parser import CalamineWorkbook
 
 
 def create_excel_file(data: list[dict], columns: list[str]) -> io.BytesIO:
@@ -319,3 +323,146 @@ class TestExcelParserValidation:
 
         assert rows[0].row_number == 2  # After header
         assert rows[1].row_number == 3
+
+
+def create_workbook(sheets: dict[str, list[list]]) -> io.BytesIO:
+    """Helper to create a workbook with native cell types, one list of rows per sheet"""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+CHASE_COLUMNS = ["Transaction Date", "Post Date", "Description", "Category", "Amount"]
+
+
+@pytest.fixture(
+    params=[
+        "openpyxl",
+        pytest.param(
+            "calamine",
+            marks=pytest.mark.skipif(
+                CalamineWorkbook is None, reason="python-calamine not installed"
+            ),
+        ),
+    ]
+)
+def engine(request):
+    return request.param
+
+
+class TestExcelParserFast:
+    """Tests for the streaming, mapped-columns-only read"""
+
+    def _parser(self, config, engine, **kwargs):
+        return ExcelParser(
+            column_mappings=config["column_mappings"],
+            amount_config=config["amount_config"],
+            date_format=config["date_format"],
+            engine=engine,
+            **kwargs,
+        )
+
+    def test_native_cells_match_pandas_path(self, chase_template_config, engine):
+        """Dates and numbers read natively should parse like the string path"""
+        rows = [
+            ["Card", *CHASE_COLUMNS, "Memo"],
+            ["1111", datetime(2026, 1, 21), "1/21/2026", "Coffee", None, -4.35, "x"],
+            ["1111", "1/22/2026", datetime(2026, 1, 22), "Refund", "Food", 12, None],
+            ["1111", "1/23/2026", "1/23/2026", None, "Gas", "$1,005.01", None],
+        ]
+        file = create_workbook({"Sheet1": rows})
+
+        fast = self._parser(chase_template_config, engine).parse(file)
+        file.seek(0)
+        legacy = self._parser(chase_template_config, None, fast=False).parse(file)
+
+        assert [r.amount for r in fast] == [-435, 1200, 100501]
+        assert fast[0].transaction_date == date(2026, 1, 21)
+        assert fast[1].posted_date == date(2026, 1, 22)
+        assert fast[0].bank_category is None
+        assert fast[2].validation_errors == ["Description is required"]
+        for fast_row, legacy_row in zip(fast, legacy, strict=True):
+            assert fast_row.row_number == legacy_row.row_number
+            assert fast_row.amount == legacy_row.amount
+            assert fast_row.description == legacy_row.description
+            assert fast_row.bank_category == legacy_row.bank_category
+
+    def test_header_row_and_skip_rows(self, chase_template_config, engine):
+        """Row numbers should count preamble, header and skipped rows"""
+        rows = [
+            ["Account export"],
+            CHASE_COLUMNS,
+            ["(pending)"],
+            ["1/21/2026", "1/21/2026", "Coffee", None, -4.35],
+        ]
+        parser = self._parser(chase_template_config, engine, header_row=2, skip_rows=1)
+
+        parsed = parser.parse(create_workbook({"Sheet1": rows}))
+
+        assert [r.row_number for r in parsed] == [4]
+        assert parsed[0].is_valid
+
+    def test_every_sheet(self, chase_template_config, engine):
+        """All sheets with the mapped columns are read, others are skipped"""
+        january = [CHASE_COLUMNS, ["1/21/2026", "1/21/2026", "Coffee", None, -4]]
+        february = [
+            CHASE_COLUMNS,
+            ["2/1/2026", "2/1/2026", "Rent", None, -900],
+            ["2/2/2026", "2/2/2026", "Pay", None, 2000],
+        ]
+        summary = [["Total"], [1096]]
+        file = create_workbook({"Jan": january, "Summary": summary, "Feb": february})
+
+        parsed = self._parser(chase_template_config, engine, sheet_name=None).parse(
+            file
+        )
+
+        assert [r.description for r in parsed] == ["Coffee", "Rent", "Pay"]
+        assert [r.row_number for r in parsed] == [2, 4, 5]
+
+    def test_named_sheet(self, chase_template_config, engine):
+        """A sheet can be picked by name, and a missing one is an error"""
+        file = create_workbook(
+            {
+                "Summary": [["Total"]],
+                "Activity": [CHASE_COLUMNS, ["1/21/2026", "1/21/2026", "A", None, 1]],
+            }
+        )
+
+        parsed = self._parser(
+            chase_template_config, engine, sheet_name="Activity"
+        ).parse(file)
+        assert [r.amount for r in parsed] == [100]
+
+        file.seek(0)
+        with pytest.raises(ValueError):
+            self._parser(chase_template_config, engine, sheet_name="Nope").parse(file)
+
+    def test_read_header(self, chase_template_config, engine):
+        """read_header should return the stripped names of the header row"""
+        file = create_workbook({"Sheet1": [[" Date ", "Amount"]]})
+
+        assert self._parser(chase_template_config, engine).read_header(file) == [
+            "Date",
+            "Amount",
+        ]
+
+    def test_read_header_every_sheet(self, chase_template_config, engine):
+        """With every sheet selected, the header is that of the first sheet parsed"""
+        file = create_workbook({"Summary": [["Total"]], "Activity": [CHASE_COLUMNS]})
+
+        first = self._parser(chase_template_config, engine).read_header(file)
+        file.seek(0)
+        every = self._parser(
+            chase_template_config, engine, sheet_name=None
+        ).read_header(file)
+
+        assert first == ["Total"]
+        assert every == CHASE_COLUMNS
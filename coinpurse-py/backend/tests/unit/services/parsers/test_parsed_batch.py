@@ -0,0 +1,86 @@
+"""
+Unit tests for the columnar ParsedBatch
+"""
+
+import io
+import pickle
+from datetime import date
+
+from services.parsers import CsvParser, ParsedBatch, ParsedRow
+
+ROWS = [
+    ParsedRow(
+        row_number=2,
+        transaction_date=date(2026, 1, 2),
+        posted_date=date(2026, 1, 3),
+        description="Coffee",
+        amount=-450,
+        transaction_type="DEBIT",
+        bank_category="Food & Drink",
+    ),
+    ParsedRow(row_number=3, description="", validation_errors=["x"]),
+    ParsedRow(
+        row_number=4, description="Refund", amount=1200, transaction_type="CREDIT"
+    ),
+]
+
+
+class TestParsedBatch:
+    """Tests for ParsedBatch"""
+
+    def test_round_trips_rows(self):
+        """Rows built into a batch should come back unchanged"""
+        batch = ParsedBatch.from_rows(ROWS)
+
+        assert len(batch) == 3
+        assert batch.to_rows() == ROWS
+        assert batch.row(1) == ROWS[1]
+
+    def test_starts_unmapped_and_unchecked(self):
+        """Category and duplicate columns should be empty until filled in"""
+        batch = ParsedBatch.from_rows(ROWS)
+
+        assert batch.coinpurse_category_ids == [None, None, None]
+        assert batch.candidate_category_ids == [[], [], []]
+        assert batch.fingerprints == [None, None, None]
+        assert batch.is_duplicate == [False, False, False]
+
+    def test_slice_keeps_every_column(self):
+        """A slice should carry the filled-in columns with the parsed ones"""
+        batch = ParsedBatch.from_rows(ROWS)
+        batch.is_duplicate = [False, False, True]
+        batch.coinpurse_category_ids = [7, 1, 1]
+
+        part = batch.slice(1, 3)
+
+        assert part.to_rows() == ROWS[1:]
+        assert part.is_duplicate == [False, True]
+        assert part.coinpurse_category_ids == [1, 1]
+        assert batch.slice(0, 3) == batch
+
+    def test_pickles(self):
+        """Batches cross process boundaries and are memoized with pickle"""
+        batch = ParsedBatch.from_rows(ROWS)
+
+        assert pickle.loads(pickle.dumps(batch)) == batch
+
+    def test_parse_batches_match_parse(self, chase_template_config):
+        """Streamed batches should hold exactly the rows parse() returns"""
+        csv_data = """Transaction Date,Post Date,Description,Category,Type,Amount
+1/15/2026,1/16/2026,Coffee,Food & Drink,Sale,-4.50
+1/17/2026,1/17/2026,,Shopping,Sale,-20.00
+1/18/2026,1/19/2026,Refund,,Return,12.00"""
+        parser = CsvParser(
+            column_mappings=chase_template_config["column_mappings"],
+            amount_config=chase_template_config["amount_config"],
+            date_format=chase_template_config["date_format"],
+        )
+
+        batches = list(
+            parser.parse_batches(io.BytesIO(csv_data.encode("utf-8")), chunk_size=2)
+        )
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [row for batch in batches for row in batch.to_rows()] == parser.parse(
+            io.BytesIO(csv_data.encode("utf-8"))
+        )
@@ -6,6 +6,7 @@ import pytest
 
 from models import Category, CategoryMapping, Institution
 from services import CategoryMapper
+from services.parsers import ParsedBatch, ParsedRow
 
 
 class TestCategoryMapper:
@@ -199,6 +200,37 @@ class TestCategoryMapper:
         # None bank_category should have empty candidate list
         assert result[2]["candidate_category_ids"] == []
 
+    def test_map_batch_sets_category_columns(self, db_session, setup_data):
+        """Should fill a batch's category columns like map_categories does"""
+        mapper = CategoryMapper(db_session)
+        chase = setup_data["chase"]
+        batch = ParsedBatch.from_rows(
+            [
+                ParsedRow(row_number=1, bank_category="Food & Drink"),
+                ParsedRow(row_number=2, bank_category=" food & drink "),
+                ParsedRow(row_number=3, bank_category="Unknown"),
+                ParsedRow(row_number=4, bank_category=None),
+            ]
+        )
+
+        result = mapper.map_batch(chase.institution_id, batch)
+
+        restaurants_id = setup_data["restaurants"].category_id
+        uncategorized_id = setup_data["uncategorized"].category_id
+        assert result is batch
+        assert batch.coinpurse_category_ids == [
+            restaurants_id,
+            restaurants_id,
+            uncategorized_id,
+            uncategorized_id,
+        ]
+        assert batch.candidate_category_ids == [
+            [restaurants_id],
+            [restaurants_id],
+            [],
+            [],
+        ]
+
     def test_cache_is_used(self, db_session, setup_data):
         """Should cache mappings for performance"""
         mapper = CategoryMapper(db_session)
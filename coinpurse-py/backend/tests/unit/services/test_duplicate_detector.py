@@ -5,9 +5,12 @@ Unit tests for duplicate detection service
 from datetime import date
 
 import pytest
+from sqlalchemy import select
 
 from models import Account, AccountType, Category, Institution, TaxTreatmentType, Transaction, TransactionType
 from services import DuplicateDetector, TransactionHash
+from services.duplicate_detector import DateToleranceIndex
+from services.parsers import ParsedBatch, ParsedRow
 
 
 class TestTransactionHash:
@@ -110,6 +113,72 @@ class TestTransactionHash:
         assert hash1 == hash2
 
 
+class TestDateToleranceIndex:
+    """Tests for the amount-bucketed, date-sorted tolerance index"""
+
+    def test_matches_within_tolerance(self):
+        """A row within the tolerance with the same amount and description matches"""
+        index = DateToleranceIndex.build(
+            [(date(2026, 1, 15), None, "COFFEE", -450)],
+            tolerance_days=2,
+            match_posted_date=False,
+        )
+
+        assert index.claim(date(2026, 1, 17), None, "coffee ", -450)
+
+    def test_rejects_outside_tolerance_or_other_fields(self):
+        """Dates past the tolerance, other amounts or descriptions do not match"""
+        index = DateToleranceIndex.build(
+            [(date(2026, 1, 15), None, "COFFEE", -450)],
+            tolerance_days=1,
+            match_posted_date=False,
+        )
+
+        assert not index.claim(date(2026, 1, 17), None, "COFFEE", -450)
+        assert not index.claim(date(2026, 1, 15), None, "COFFEE", -451)
+        assert not index.claim(date(2026, 1, 15), None, "TEA", -450)
+
+    def test_each_transaction_claimed_once(self):
+        """One stored transaction should absorb only one row"""
+        index = DateToleranceIndex.build(
+            [(date(2026, 1, 15), None, "COFFEE", -450)],
+            tolerance_days=1,
+            match_posted_date=False,
+        )
+
+        assert index.claim(date(2026, 1, 15), None, "COFFEE", -450)
+        assert not index.claim(date(2026, 1, 16), None, "COFFEE", -450)
+
+    def test_claims_nearest_date(self):
+        """The closest unclaimed transaction should be matched first"""
+        index = DateToleranceIndex.build(
+            [
+                (date(2026, 1, 13), None, "COFFEE", -450),
+                (date(2026, 1, 16), None, "COFFEE", -450),
+            ],
+            tolerance_days=3,
+            match_posted_date=False,
+        )
+
+        assert index.claim(date(2026, 1, 16), None, "COFFEE", -450)
+        assert index.claim(date(2026, 1, 15), None, "COFFEE", -450)
+        assert not index.claim(date(2026, 1, 15), None, "COFFEE", -450)
+
+    def test_matches_across_posted_date(self):
+        """With posted-date matching a row dated on the posted date matches"""
+        rows = [(date(2026, 1, 15), date(2026, 1, 18), "COFFEE", -450)]
+
+        without = DateToleranceIndex.build(
+            rows, tolerance_days=0, match_posted_date=False
+        )
+        with_posted = DateToleranceIndex.build(
+            rows, tolerance_days=0, match_posted_date=True
+        )
+
+        assert not without.claim(date(2026, 1, 18), None, "COFFEE", -450)
+        assert with_posted.claim(date(2026, 1, 18), None, "COFFEE", -450)
+
+
 class TestDuplicateDetector:
     """Tests for DuplicateDetector service"""
 
@@ -236,6 +305,48 @@ class TestDuplicateDetector:
         assert result[0]["is_duplicate"] is True
         assert result[1]["is_duplicate"] is False
 
+    def test_check_batch_matches_check_duplicates(self, db_session, setup_data):
+        """Should set the same flags and fingerprints on a batch's columns"""
+        account = setup_data["account"]
+        rows = [
+            ParsedRow(
+                row_number=1,
+                transaction_date=date(2026, 1, 15),
+                description="AMAZON PURCHASE",
+                transaction_type="DEBIT",
+                amount=-5000,
+            ),
+            ParsedRow(
+                row_number=2,
+                transaction_date=date(2026, 1, 17),
+                description="NEW PURCHASE",
+                transaction_type="DEBIT",
+                amount=-2500,
+            ),
+            ParsedRow(row_number=3, description="NO DATE", amount=-100),
+        ]
+        expected = DuplicateDetector(db_session).check_duplicates(
+            account.account_id,
+            [
+                {
+                    "transaction_date": row.transaction_date,
+                    "description": row.description,
+                    "transaction_type": row.transaction_type,
+                    "amount": row.amount,
+                }
+                for row in rows
+            ],
+        )
+
+        batch = DuplicateDetector(db_session).check_batch(
+            account.account_id, ParsedBatch.from_rows(rows)
+        )
+
+        assert batch.is_duplicate == [True, False, False]
+        assert batch.is_duplicate == [t["is_duplicate"] for t in expected]
+        assert batch.fingerprints == [t["fingerprint"] for t in expected]
+        assert batch.fingerprints[2] is None
+
     def test_check_duplicates_skips_null_dates(self, db_session, setup_data):
         """Should mark rows with null dates as not duplicate"""
         detector = DuplicateDetector(db_session)
@@ -255,27 +366,179 @@ class TestDuplicateDetector:
 
         assert result[0]["is_duplicate"] is False
 
-    def test_cache_is_used(self, db_session, setup_data):
-        """Should cache hash set for same account"""
+    def test_check_duplicates_ignores_inactive(self, db_session, setup_data):
+        """Soft-deleted transactions should not count as duplicates"""
+        amazon = db_session.scalars(
+            select(Transaction).where(Transaction.description == "AMAZON PURCHASE")
+        ).one()
+        amazon.is_active = False
+        db_session.commit()
         detector = DuplicateDetector(db_session)
-        account = setup_data["account"]
 
-        # First call builds cache
-        detector.build_hash_set(account.account_id)
-        assert detector._cached_account_id == account.account_id
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 1, 15),
+                "description": "AMAZON PURCHASE",
+                "transaction_type": "DEBIT",
+                "amount": -5000,
+            },
+        ]
+
+        result = detector.check_duplicates(setup_data["account"].account_id, parsed)
+
+        assert result[0]["is_duplicate"] is False
+
+    def test_fingerprint_set_on_insert(self, db_session, setup_data):
+        """Stored transactions should carry the fingerprint of their hash"""
+        amazon = db_session.scalars(
+            select(Transaction).where(Transaction.description == "AMAZON PURCHASE")
+        ).one()
+
+        expected = TransactionHash.from_transaction(amazon).fingerprint
+        assert amazon.fingerprint == expected
 
-        # Second call should use cache (not rebuild)
-        hash_set = detector.build_hash_set(account.account_id)
-        assert len(hash_set) == 2
+    def test_fingerprint_updated_on_edit(self, db_session, setup_data):
+        """Editing a hashed field should recompute the fingerprint"""
+        amazon = db_session.scalars(
+            select(Transaction).where(Transaction.description == "AMAZON PURCHASE")
+        ).one()
+        before = amazon.fingerprint
 
-    def test_clear_cache(self, db_session, setup_data):
-        """Should clear cache when requested"""
+        amazon.amount = -6000
+        db_session.commit()
+
+        assert amazon.fingerprint != before
+        expected = TransactionHash.from_transaction(amazon).fingerprint
+        assert amazon.fingerprint == expected
+
+    def test_check_duplicates_sets_fingerprint(self, db_session, setup_data):
+        """Each dated row should get the fingerprint it will be stored with"""
         detector = DuplicateDetector(db_session)
         account = setup_data["account"]
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 1, 15),
+                "description": "Amazon Purchase ",
+                "transaction_type": "DEBIT",
+                "amount": -5000,
+            },
+            {
+                "row_number": 2,
+                "transaction_date": None,
+                "description": "NO DATE",
+                "transaction_type": "DEBIT",
+                "amount": -100,
+            },
+        ]
+
+        result = detector.check_duplicates(account.account_id, parsed)
+
+        amazon = db_session.scalars(
+            select(Transaction).where(Transaction.description == "AMAZON PURCHASE")
+        ).one()
+        assert result[0]["fingerprint"] == amazon.fingerprint
+        assert result[1]["fingerprint"] is None
+
+    def test_fingerprint_collision_is_not_duplicate(self, db_session, setup_data):
+        """A matching fingerprint with different fields must not count"""
+        amazon = db_session.scalars(
+            select(Transaction).where(Transaction.description == "AMAZON PURCHASE")
+        ).one()
+        detector = DuplicateDetector(db_session)
+        other = TransactionHash.from_parsed_row(
+            account_id=setup_data["account"].account_id,
+            transaction_date=date(2026, 1, 15),
+            description="something else",
+            transaction_type="DEBIT",
+            amount=-5000,
+        )
+        # Simulate a collision by storing the other row's fingerprint
+        db_session.execute(
+            Transaction.__table__.update()
+            .where(Transaction.transaction_id == amazon.transaction_id)
+            .values(fingerprint=other.fingerprint)
+        )
+
+        account_id = setup_data["account"].account_id
+        assert detector.find_existing(account_id, [other]) == set()
+
+    def test_tolerance_flags_shifted_date(self, db_session, setup_data):
+        """A row a day off should only be a duplicate in tolerance mode"""
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 1, 16),
+                "description": "AMAZON PURCHASE",
+                "transaction_type": "DEBIT",
+                "amount": -5000,
+            },
+        ]
+        account_id = setup_data["account"].account_id
+
+        exact = DuplicateDetector(db_session).check_duplicates(
+            account_id, [dict(parsed[0])]
+        )
+        tolerant = DuplicateDetector(
+            db_session, date_tolerance_days=1
+        ).check_duplicates(account_id, [dict(parsed[0])])
+
+        assert exact[0]["is_duplicate"] is False
+        assert tolerant[0]["is_duplicate"] is True
+
+    def test_tolerance_exact_match_claims_first(self, db_session, setup_data):
+        """A shifted copy should not match a transaction an exact row already matched"""
+        detector = DuplicateDetector(db_session, date_tolerance_days=1)
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 1, 14),
+                "description": "AMAZON PURCHASE",
+                "transaction_type": "DEBIT",
+                "amount": -5000,
+            },
+            {
+                "row_number": 2,
+                "transaction_date": date(2026, 1, 15),
+                "description": "AMAZON PURCHASE",
+                "transaction_type": "DEBIT",
+                "amount": -5000,
+            },
+        ]
 
-        detector.build_hash_set(account.account_id)
-        assert detector._hash_cache is not None
+        result = detector.check_duplicates(setup_data["account"].account_id, parsed)
 
-        detector.clear_cache()
-        assert detector._hash_cache is None
-        assert detector._cached_account_id is None
+        assert result[0]["is_duplicate"] is False
+        assert result[1]["is_duplicate"] is True
+
+    def test_tolerance_matches_posted_date(self, db_session, setup_data):
+        """A row dated on a stored transaction's posted date should match"""
+        db_session.add(
+            Transaction(
+                account_id=setup_data["account"].account_id,
+                category_id=setup_data["category"].category_id,
+                transaction_date=date(2026, 1, 20),
+                posted_date=date(2026, 1, 22),
+                amount=-450,
+                description="COFFEE",
+                transaction_type=TransactionType.PURCHASE,
+                notes="",
+            )
+        )
+        db_session.commit()
+        detector = DuplicateDetector(db_session, match_posted_date=True)
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 1, 22),
+                "posted_date": date(2026, 1, 22),
+                "description": "Coffee",
+                "transaction_type": "DEBIT",
+                "amount": -450,
+            },
+        ]
+
+        result = detector.check_duplicates(setup_data["account"].account_id, parsed)
+
+        assert result[0]["is_duplicate"] is True
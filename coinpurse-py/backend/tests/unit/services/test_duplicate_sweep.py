@@ -0,0 +1,150 @@
+"""
+Unit tests for the historical duplicate sweep
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from models import (
+    Account,
+    AccountType,
+    Category,
+    Institution,
+    TaxTreatmentType,
+    Transaction,
+    TransactionType,
+)
+from services.duplicate_sweep import DuplicateSweepService
+
+
+@pytest.fixture
+def ledger(db_session):
+    """An account whose ledger holds two duplicate groups and a near miss"""
+    institution = Institution(name="Sweep Bank")
+    category = Category(name="Uncategorized")
+    db_session.add_all([institution, category])
+    db_session.commit()
+
+    account = Account(
+        institution_id=institution.institution_id,
+        account_name="Sweep Account",
+        account_type=AccountType.CREDIT_CARD,
+        tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+        last_4_digits="9999",
+        tracks_transactions=True,
+    )
+    db_session.add(account)
+    db_session.commit()
+
+    def txn(txn_date, description, amount, is_active=True):
+        return Transaction(
+            account_id=account.account_id,
+            category_id=category.category_id,
+            transaction_date=txn_date,
+            posted_date=txn_date,
+            amount=amount,
+            description=description,
+            transaction_type=TransactionType.PURCHASE,
+            notes="",
+            is_active=is_active,
+        )
+
+    transactions = [
+        txn(date(2025, 3, 1), "COFFEE SHOP", -450),
+        txn(date(2025, 3, 1), "coffee shop ", -450),
+        txn(date(2025, 3, 1), "Coffee Shop", -450),
+        txn(date(2025, 3, 2), "COFFEE SHOP", -450),  # Different date
+        txn(date(2025, 4, 9), "RENT", -150000),
+        txn(date(2025, 4, 9), "RENT", -150000),
+        txn(date(2025, 4, 9), "RENT", -150000, is_active=False),
+        txn(date(2025, 5, 1), "BOOKS", -1299),
+    ]
+    db_session.add_all(transactions)
+    db_session.commit()
+    return {"account": account, "transactions": transactions}
+
+
+class TestFindDuplicates:
+    """Tests for the sort-merge sweep"""
+
+    def test_groups_equal_keys(self, db_session, ledger):
+        """Active transactions sharing amount, date and description should group"""
+        ids = [t.transaction_id for t in ledger["transactions"]]
+
+        result = DuplicateSweepService(db_session, batch_size=2).find_duplicates(
+            ledger["account"].account_id
+        )
+
+        assert result.transactions_scanned == 7
+        assert [g.transaction_ids for g in result.groups] == [[ids[4], ids[5]], ids[:3]]
+        assert result.groups[1].description == "coffee shop"
+
+    def test_reports_progress(self, db_session, ledger):
+        """Progress should end at the number of active transactions"""
+        progress = []
+
+        DuplicateSweepService(db_session, batch_size=3).find_duplicates(
+            ledger["account"].account_id,
+            progress_callback=lambda current, total: progress.append((current, total)),
+        )
+
+        assert progress == [(3, 7), (6, 7), (7, 7)]
+
+    def test_groups_descriptions_python_normalizes_alike(self, db_session, ledger):
+        """Non-ASCII case and tab padding should not split a group"""
+        account = ledger["account"]
+        template = ledger["transactions"][7]
+        rows = [
+            Transaction(
+                account_id=account.account_id,
+                category_id=template.category_id,
+                transaction_date=date(2025, 6, 1),
+                posted_date=date(2025, 6, 1),
+                amount=-350,
+                description=description,
+                transaction_type=TransactionType.PURCHASE,
+                notes="",
+            )
+            for description in ["Café ", "Cafè", "CAFÉ\t"]
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+
+        result = DuplicateSweepService(db_session).find_duplicates(account.account_id)
+
+        cafe = [g for g in result.groups if g.amount == -350]
+        assert [g.description for g in cafe] == ["café"]
+        assert cafe[0].transaction_ids == [
+            rows[0].transaction_id,
+            rows[2].transaction_id,
+        ]
+
+
+class TestResolve:
+    """Tests for soft-deleting confirmed groups"""
+
+    def test_keeps_oldest_of_each_group(self, db_session, ledger):
+        """All but the oldest transaction of each group should be deactivated"""
+        ids = [t.transaction_id for t in ledger["transactions"]]
+
+        deleted = DuplicateSweepService(db_session).resolve([ids[:3], [ids[5], ids[4]]])
+
+        active = db_session.scalars(
+            select(Transaction.transaction_id).where(Transaction.is_active.is_(True))
+        ).all()
+        assert deleted == 3
+        assert sorted(active) == [ids[0], ids[3], ids[4], ids[7]]
+
+    def test_rejects_non_duplicates(self, db_session, ledger):
+        """A group whose transactions differ should be refused"""
+        ids = [t.transaction_id for t in ledger["transactions"]]
+
+        with pytest.raises(ValueError, match="not duplicates"):
+            DuplicateSweepService(db_session).resolve([[ids[0], ids[3]]])
+
+    def test_rejects_unknown_transactions(self, db_session, ledger):
+        """Unknown transaction IDs should be refused"""
+        with pytest.raises(ValueError, match="not found"):
+            DuplicateSweepService(db_session).resolve([[999_999, 999_998]])
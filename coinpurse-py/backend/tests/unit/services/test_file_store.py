@@ -0,0 +1,156 @@
+"""
+Unit tests for the content-addressed import file store
+"""
+
+import hashlib
+import io
+import os
+import time
+from datetime import UTC, date, datetime
+
+import pytest
+
+from models import ImportTemplate
+from services import file_store
+from services.file_store import PARSE_MEMO_VERSION, FileStore, ReapedFiles
+from services.parsers import ParsedBatch, ParsedRow
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileStore(tmp_path / "files")
+
+
+def _template(template_id=1, modified_at=datetime(2026, 1, 1, tzinfo=UTC)):
+    return ImportTemplate(template_id=template_id, modified_at=modified_at)
+
+
+def _chunks():
+    return [
+        ParsedBatch.from_rows(
+            [ParsedRow(row_number=2, transaction_date=date(2026, 1, 2), amount=-450)]
+        ),
+        ParsedBatch.from_rows(
+            [ParsedRow(row_number=3, description="Refund", validation_errors=["x"])]
+        ),
+    ]
+
+
+class TestFileStore:
+    """Tests for FileStore"""
+
+    def test_put_stores_by_content_hash(self, store):
+        """Identical content should be stored once under its SHA-256"""
+        content = b"Date,Amount\n1/2/2026,-4.50\n"
+        file = io.BytesIO(content)
+
+        first = store.put(file)
+        second = store.put(io.BytesIO(content))
+
+        assert first == second == hashlib.sha256(content).hexdigest()
+        assert file.tell() == 0
+        with store.open(first) as stored:
+            assert stored.read() == content
+        assert [p.name for p in store.root.rglob("*") if p.is_file()] == [first]
+
+    def test_open_missing_file(self, store):
+        """Opening a hash that was never stored should fail"""
+        assert not store.exists("0" * 64)
+        with pytest.raises(FileNotFoundError):
+            store.open("0" * 64)
+
+    def test_memoized_parse_round_trip(self, store):
+        """Chunks passed through memoize_parsed should load back unchanged"""
+        content_hash = store.put(io.BytesIO(b"data"))
+        template = _template()
+        assert store.load_parsed(content_hash, template) is None
+
+        passed = list(store.memoize_parsed(content_hash, template, _chunks()))
+
+        assert passed == _chunks()
+        assert list(store.load_parsed(content_hash, template)) == _chunks()
+
+    def test_abandoned_parse_is_not_memoized(self, store):
+        """A parse that is not read to the end should leave no memo behind"""
+        content_hash = store.put(io.BytesIO(b"data"))
+        template = _template()
+
+        chunks = store.memoize_parsed(content_hash, template, _chunks())
+        next(chunks)
+        chunks.close()
+
+        assert store.load_parsed(content_hash, template) is None
+        assert not list(store.root.rglob("*.tmp"))
+
+    def test_template_change_invalidates_memo(self, store):
+        """Editing or switching the template should miss the memo"""
+        content_hash = store.put(io.BytesIO(b"data"))
+        old = _template()
+        new = _template(modified_at=datetime(2026, 2, 1, tzinfo=UTC))
+        list(store.memoize_parsed(content_hash, old, _chunks()))
+
+        assert store.load_parsed(content_hash, new) is None
+        assert store.load_parsed(content_hash, _template(template_id=2)) is None
+
+        list(store.memoize_parsed(content_hash, new, _chunks()[:1]))
+        assert store.load_parsed(content_hash, old) is None
+        assert list(store.load_parsed(content_hash, new)) == _chunks()[:1]
+
+
+def _age(path, hours):
+    """Set a file's modification time this many hours back"""
+    mtime = time.time() - hours * 60 * 60
+    os.utime(path, (mtime, mtime))
+
+
+class TestFileStoreReap:
+    """Tests for deleting stored files that are no longer needed"""
+
+    def test_old_uploads_are_deleted(self, store):
+        """Uploads older than the age limit go, unless kept or uploaded again"""
+        old = store.put(io.BytesIO(b"old"))
+        kept = store.put(io.BytesIO(b"kept"))
+        again = store.put(io.BytesIO(b"again"))
+        fresh = store.put(io.BytesIO(b"fresh"))
+        for content_hash in (old, kept, again):
+            _age(store.path(content_hash), 48)
+        store.put(io.BytesIO(b"again"))
+
+        reaped = store.reap(24, keep={kept}, templates=[])
+
+        assert reaped == ReapedFiles(files=1, bytes=3)
+        assert not store.exists(old)
+        assert all(store.exists(h) for h in (kept, again, fresh))
+
+    def test_unusable_memos_are_deleted(self, store):
+        """Memos of changed templates or deleted uploads go with any age"""
+        content_hash = store.put(io.BytesIO(b"data"))
+        orphan = store.put(io.BytesIO(b"orphan"))
+        current = _template()
+        changed = _template(template_id=2)
+        for template in (current, changed):
+            list(store.memoize_parsed(content_hash, template, _chunks()))
+        list(store.memoize_parsed(orphan, current, _chunks()))
+        _age(store.path(orphan), 48)
+
+        edited = _template(template_id=2, modified_at=datetime(2026, 2, 1, tzinfo=UTC))
+        reaped = store.reap(24, keep=set(), templates=[current, edited])
+
+        assert reaped.files == 3
+        assert store.load_parsed(content_hash, current) is not None
+        assert store.load_parsed(content_hash, changed) is None
+        assert store.load_parsed(orphan, current) is None
+
+    def test_old_memo_version_is_deleted(self, store, monkeypatch):
+        """Memos written by an older PARSE_MEMO_VERSION should be deleted"""
+        content_hash = store.put(io.BytesIO(b"data"))
+        template = _template()
+        list(store.memoize_parsed(content_hash, template, _chunks()))
+        monkeypatch.setattr(file_store, "PARSE_MEMO_VERSION", PARSE_MEMO_VERSION + 1)
+
+        assert store.reap(24, keep=set(), templates=[template]).files == 1
+        assert [p.name for p in store.root.rglob("*") if p.is_file()] == [content_hash]
+
+    def test_empty_store(self, store):
+        """Reaping a store that was never written to should do nothing"""
+        assert store.reap(24, keep=set(), templates=[]) == ReapedFiles()
@@ -0,0 +1,301 @@
+"""
+Unit tests for the process-wide fingerprint cache
+"""
+
+from datetime import date
+
+import pytest
+
+from models import (
+    Account,
+    AccountType,
+    Category,
+    Institution,
+    TaxTreatmentType,
+    Transaction,
+    TransactionType,
+)
+from services import DuplicateDetector
+from services.fingerprint_cache import (
+    BYTES_PER_FINGERPRINT,
+    FingerprintCache,
+    PackedFingerprints,
+    contains_many,
+    get_fingerprint_cache,
+)
+
+
+class TestPackedFingerprints:
+    """Tests for the compact fingerprint representation"""
+
+    def test_membership(self):
+        """Packed and recently added fingerprints should both be found"""
+        packed = PackedFingerprints([5, -3, 2**62, 5])
+        packed.update([9])
+
+        assert len(packed) == 4
+        assert -3 in packed
+        assert 9 in packed
+        assert 4 not in packed
+        assert set(packed) == {5, -3, 2**62, 9}
+
+    def test_update_merges_into_array(self, monkeypatch):
+        """Additions past the threshold should be merged into the array"""
+        monkeypatch.setattr(PackedFingerprints, "MERGE_THRESHOLD", 2)
+        packed = PackedFingerprints([10])
+
+        packed.update([1, 2, 3])
+
+        assert packed._recent == set()
+        assert packed._packed.tolist() == [1, 2, 3, 10]
+
+    def test_contains_many(self):
+        """The vectorized test should agree with a plain set"""
+        packed = PackedFingerprints([7, 2**63 - 1])
+        packed.update([100])
+        probe = [7, -7, 100, 2**63 - 1, -(2**63), 8]
+
+        assert contains_many(packed, probe) == contains_many({7, 100, 2**63 - 1}, probe)
+        assert contains_many(PackedFingerprints(), probe) == [False] * len(probe)
+
+    def test_smaller_than_int_set(self):
+        """Packing should use far less memory than a set of ints"""
+        values = range(-50_000, 50_000)
+
+        packed = PackedFingerprints(values)
+
+        assert packed._packed.nbytes == 8 * len(values)
+        assert packed.nbytes < FingerprintCache._estimate(set(values)) / 4
+
+
+class TestFingerprintCache:
+    """Tests for FingerprintCache"""
+
+    @pytest.fixture(params=[True, False], ids=["compact", "set"])
+    def compact(self, request):
+        return request.param
+
+    def test_get_loads_once(self, compact):
+        """A second lookup should reuse the loaded set"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+        calls = []
+
+        def loader(start, end):
+            calls.append(1)
+            return [1, 2, 3]
+
+        assert set(cache.get(7, loader)) == {1, 2, 3}
+        assert set(cache.get(7, loader)) == {1, 2, 3}
+        assert len(calls) == 1
+
+    def test_window_extends_with_missing_days_only(self, compact):
+        """A wider window should load only the days the entry lacks"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+        windows = []
+
+        def loader(start, end):
+            windows.append((start, end))
+            return [start.day]
+
+        cache.get(7, loader, date(2026, 3, 10), date(2026, 3, 20))
+        cache.get(7, loader, date(2026, 3, 12), date(2026, 3, 18))
+        known = cache.get(7, loader, date(2026, 3, 5), date(2026, 3, 25))
+
+        assert windows == [
+            (date(2026, 3, 10), date(2026, 3, 20)),
+            (date(2026, 3, 5), date(2026, 3, 9)),
+            (date(2026, 3, 21), date(2026, 3, 25)),
+        ]
+        assert set(known) == {10, 5, 21}
+
+    def test_disjoint_window_replaces_entry(self, compact):
+        """A window that does not touch the cached one should not load the gap"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+        cache.get(7, lambda start, end: [1], date(2020, 1, 1), date(2020, 1, 31))
+
+        known = cache.get(
+            7, lambda start, end: [2], date(2026, 1, 1), date(2026, 1, 31)
+        )
+
+        assert set(known) == {2}
+        assert set(
+            cache.get(7, lambda start, end: [], date(2026, 1, 5), date(2026, 1, 6))
+        ) == {2}
+
+    def test_add_updates_cached_account(self, compact):
+        """Adding to a cached account should extend its set"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+        cache.get(7, lambda start, end: [1])
+
+        cache.add(7, [2])
+
+        assert set(cache.get(7, lambda start, end: [])) == {1, 2}
+
+    def test_add_ignores_uncached_account(self, compact):
+        """Adding to an account that is not cached should not cache it"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+
+        cache.add(7, [2])
+
+        assert 7 not in cache
+
+    def test_invalidate_forces_reload(self, compact):
+        """An invalidated account should be loaded again"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+        cache.get(7, lambda start, end: [1])
+
+        cache.invalidate(7)
+
+        assert set(cache.get(7, lambda start, end: [5])) == {5}
+
+    def test_write_during_load_is_not_cached(self, compact):
+        """A load that raced with a write should not be stored"""
+        cache = FingerprintCache(max_bytes=1_000_000, compact=compact)
+
+        def loader(start, end):
+            cache.add(7, [2])
+            return [1]
+
+        cache.get(7, loader)
+
+        assert 7 not in cache
+
+    def test_evicts_least_recently_used(self, compact):
+        """Going over the budget should drop the oldest account first"""
+        sample = PackedFingerprints(range(100)) if compact else set(range(100))
+        cache = FingerprintCache(
+            max_bytes=FingerprintCache._estimate(sample) * 2, compact=compact
+        )
+        cache.get(1, lambda start, end: range(100))
+        cache.get(2, lambda start, end: range(100, 200))
+        cache.get(1, lambda start, end: [])  # Touch account 1
+
+        cache.get(3, lambda start, end: range(200, 300))
+
+        assert 1 in cache
+        assert 2 not in cache
+        assert 3 in cache
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_account_over_budget_is_not_cached(self, compact):
+        """An account larger than the whole budget should not be cached"""
+        cache = FingerprintCache(max_bytes=BYTES_PER_FINGERPRINT * 10, compact=compact)
+
+        assert set(cache.get(1, lambda start, end: range(100))) == set(range(100))
+        assert 1 not in cache
+        assert cache.total_bytes == 0
+
+
+class TestFingerprintCacheWriteThrough:
+    """Tests for keeping the shared cache in step with transaction writes"""
+
+    @pytest.fixture
+    def account(self, db_session):
+        institution = Institution(name="Test Bank")
+        category = Category(name="Uncategorized")
+        db_session.add_all([institution, category])
+        db_session.commit()
+
+        account = Account(
+            institution_id=institution.institution_id,
+            account_name="Test Checking",
+            account_type=AccountType.BANKING,
+            tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+            last_4_digits="1234",
+            tracks_transactions=True,
+        )
+        db_session.add(account)
+        db_session.commit()
+        return account
+
+    def _transaction(self, account, description="COFFEE"):
+        return Transaction(
+            account_id=account.account_id,
+            category_id=1,
+            transaction_date=date(2026, 2, 1),
+            posted_date=date(2026, 2, 1),
+            amount=-450,
+            description=description,
+            transaction_type=TransactionType.PURCHASE,
+            notes="",
+        )
+
+    def test_detectors_share_the_cache(self, db_session, account):
+        """A new detector should reuse fingerprints loaded by an earlier one"""
+        db_session.add(self._transaction(account))
+        db_session.commit()
+        DuplicateDetector(db_session).known_fingerprints(account.account_id)
+
+        assert account.account_id in get_fingerprint_cache()
+
+    def test_create_adds_on_commit(self, db_session, account):
+        """A committed insert should be added to a cached account"""
+        detector = DuplicateDetector(db_session)
+        detector.known_fingerprints(account.account_id)
+
+        txn = self._transaction(account)
+        db_session.add(txn)
+        db_session.flush()
+        assert txn.fingerprint not in detector.known_fingerprints(account.account_id)
+        db_session.commit()
+
+        assert txn.fingerprint in detector.known_fingerprints(account.account_id)
+
+    def test_new_row_detected_without_reload(self, db_session, account):
+        """Rows saved after the cache loaded should still be duplicates"""
+        detector = DuplicateDetector(db_session)
+        detector.known_fingerprints(account.account_id)
+        db_session.add(self._transaction(account))
+        db_session.commit()
+
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 2, 1),
+                "description": "coffee",
+                "transaction_type": "DEBIT",
+                "amount": -450,
+            }
+        ]
+        result = DuplicateDetector(db_session).check_duplicates(
+            account.account_id, parsed
+        )
+
+        assert result[0]["is_duplicate"] is True
+
+    def test_loads_only_the_statement_window(self, db_session, account):
+        """Transactions far outside the checked dates should not be loaded"""
+        old = self._transaction(account, "old coffee")
+        old.transaction_date = date(2020, 1, 1)
+        db_session.add_all([old, self._transaction(account)])
+        db_session.commit()
+        parsed = [
+            {
+                "row_number": 1,
+                "transaction_date": date(2026, 2, 1),
+                "description": "tea",
+                "transaction_type": "DEBIT",
+                "amount": -450,
+            }
+        ]
+
+        detector = DuplicateDetector(db_session, date_tolerance_days=3)
+        detector.check_duplicates(account.account_id, parsed)
+
+        known = detector.known_fingerprints(
+            account.account_id, date(2026, 1, 29), date(2026, 2, 4)
+        )
+        assert old.fingerprint not in known
+        assert len(known) == 1
+
+    def test_soft_delete_invalidates(self, db_session, account):
+        """Deactivating a transaction should drop the account from the cache"""
+        txn = self._transaction(account)
+        db_session.add(txn)
+        db_session.commit()
+        DuplicateDetector(db_session).known_fingerprints(account.account_id)
+
+        txn.is_active = False
+        db_session.commit()
+
+        assert account.account_id not in get_fingerprint_cache()
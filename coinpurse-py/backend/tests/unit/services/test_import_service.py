@@ -0,0 +1,690 @@
+"""
+Unit tests for import orchestration service
+"""
+
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from models import (
+    Account,
+    AccountType,
+    AppSetting,
+    Category,
+    CategoryMapping,
+    FileFormat,
+    ImportBatch,
+    ImportStagingRow,
+    ImportStatus,
+    ImportTemplate,
+    Institution,
+    TaxTreatmentType,
+    Transaction,
+    TransactionType,
+)
+from services import BulkImportFile, ImportService
+from services.fingerprint_cache import get_fingerprint_cache
+
+CSV_CONTENT = """Transaction Date,Post Date,Description,Category,Amount
+1/15/2026,1/15/2026,Coffee Shop,Food & Drink,-4.50
+1/16/2026,1/16/2026,Existing Purchase,Shopping,-25.00
+1/17/2026,1/17/2026,Paycheck,,1500.00
+not-a-date,1/18/2026,Broken Row,,-1.00
+1/19/2026,1/19/2026,Book Store,Shopping,-12.99"""
+
+
+@pytest.fixture
+def setup_data(db_session):
+    """Set up an account with a template, a mapping and one existing transaction"""
+    institution = Institution(name="Service Bank")
+    uncategorized = Category(name="Uncategorized")
+    restaurants = Category(name="Restaurants")
+    shopping = Category(name="Shopping")
+    db_session.add_all([institution, uncategorized, restaurants, shopping])
+    db_session.commit()
+
+    db_session.add_all(
+        [
+            CategoryMapping(
+                institution_id=institution.institution_id,
+                bank_category_name="Food & Drink",
+                coinpurse_category_id=restaurants.category_id,
+            ),
+            CategoryMapping(
+                institution_id=institution.institution_id,
+                bank_category_name="Shopping",
+                coinpurse_category_id=shopping.category_id,
+            ),
+        ]
+    )
+
+    template = ImportTemplate(
+        template_name="Service Template",
+        file_format=FileFormat.CSV,
+        column_mappings={
+            "transaction_date": "Transaction Date",
+            "posted_date": "Post Date",
+            "description": "Description",
+            "category": "Category",
+            "amount": "Amount",
+        },
+        amount_config={"sign_convention": "bank_standard", "decimal_places": 2},
+        date_format="%m/%d/%Y",
+    )
+    db_session.add(template)
+    db_session.commit()
+
+    account = Account(
+        institution_id=institution.institution_id,
+        template_id=template.template_id,
+        account_name="Service Account",
+        account_type=AccountType.CREDIT_CARD,
+        tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+        last_4_digits="4242",
+        tracks_transactions=True,
+    )
+    db_session.add(account)
+    db_session.commit()
+
+    db_session.add(
+        Transaction(
+            account_id=account.account_id,
+            category_id=shopping.category_id,
+            transaction_date=date(2026, 1, 16),
+            posted_date=date(2026, 1, 16),
+            amount=-2500,
+            description="Existing Purchase",
+            transaction_type=TransactionType.PURCHASE,
+            notes="",
+        )
+    )
+    db_session.commit()
+
+    return {
+        "account": account,
+        "template": template,
+        "uncategorized": uncategorized,
+        "restaurants": restaurants,
+        "shopping": shopping,
+    }
+
+
+class TestUploadAndPreviewChunked:
+    """Tests for chunk-by-chunk preview processing"""
+
+    def _preview(self, db_session, setup_data, chunk_size: int):
+        service = ImportService(db_session, chunk_size=chunk_size)
+        return service.upload_and_preview(
+            file=io.BytesIO(CSV_CONTENT.encode()),
+            file_name="test.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+        )
+
+    def test_small_chunks_match_single_chunk(self, db_session, setup_data):
+        """Chunk size should not change the preview"""
+        single = self._preview(db_session, setup_data, chunk_size=1000)
+        chunked = self._preview(db_session, setup_data, chunk_size=2)
+
+        assert chunked.summary == single.summary
+        assert chunked.transactions == single.transactions
+
+    def test_chunked_preview_summary(self, db_session, setup_data):
+        """Mapping, duplicate and validation results should span chunk boundaries"""
+        preview = self._preview(db_session, setup_data, chunk_size=2)
+
+        assert preview.summary.total_rows == 5
+        assert preview.summary.duplicate_count == 1
+        assert preview.summary.validation_errors == 1
+        assert preview.summary.valid_rows == 3
+
+        by_row = {t.row_number: t for t in preview.transactions}
+        assert by_row[2].coinpurse_category_id == setup_data["restaurants"].category_id
+        assert by_row[3].is_duplicate
+        assert by_row[6].coinpurse_category_id == setup_data["shopping"].category_id
+
+
+class TestBulkUploadAndPreview:
+    """Tests for previewing several files at once"""
+
+    def test_bulk_matches_single_file_previews(self, db_session, setup_data):
+        """Each file in a bulk upload should preview exactly as it would alone"""
+        service = ImportService(db_session, chunk_size=2)
+        single = service.upload_and_preview(
+            file=io.BytesIO(CSV_CONTENT.encode()),
+            file_name="test.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+        )
+
+        bulk = service.bulk_upload_and_preview(
+            [
+                BulkImportFile(
+                    file=io.BytesIO(CSV_CONTENT.encode()),
+                    file_name=f"month{i}.csv",
+                    account_id=setup_data["account"].account_id,
+                )
+                for i in range(3)
+            ]
+        )
+
+        assert [f.file_name for f in bulk.files] == [
+            "month0.csv",
+            "month1.csv",
+            "month2.csv",
+        ]
+        assert len({f.import_batch_id for f in bulk.files}) == 3
+        for f in bulk.files:
+            assert f.error is None
+            assert f.summary == single.summary
+            assert f.transactions == single.transactions
+        assert bulk.summary.total_rows == 3 * single.summary.total_rows
+
+    def test_bulk_reports_unparseable_file(self, db_session, setup_data):
+        """A file that fails to parse should not stop the other files"""
+        service = ImportService(db_session)
+        bulk = service.bulk_upload_and_preview(
+            [
+                BulkImportFile(
+                    file=io.BytesIO(b""),
+                    file_name="empty.csv",
+                    account_id=setup_data["account"].account_id,
+                ),
+                BulkImportFile(
+                    file=io.BytesIO(CSV_CONTENT.encode()),
+                    file_name="good.csv",
+                    account_id=setup_data["account"].account_id,
+                ),
+            ]
+        )
+
+        assert bulk.files[0].error is not None
+        assert bulk.files[0].import_batch_id is None
+        assert bulk.files[1].error is None
+        assert bulk.summary.total_rows == 5
+
+    def test_bulk_unknown_account(self, db_session, setup_data):
+        """Should raise before parsing when an account does not exist"""
+        service = ImportService(db_session)
+
+        with pytest.raises(ValueError, match="not found"):
+            service.bulk_upload_and_preview(
+                [
+                    BulkImportFile(
+                        file=io.BytesIO(CSV_CONTENT.encode()),
+                        file_name="test.csv",
+                        account_id=99999,
+                    )
+                ]
+            )
+
+
+class TestDuplicateDateTolerance:
+    """Tests for the date tolerance settings applied during preview"""
+
+    SHIFTED_CSV = """Transaction Date,Post Date,Description,Category,Amount
+1/17/2026,1/17/2026,Existing Purchase,Shopping,-25.00"""
+
+    def _preview(self, db_session, setup_data):
+        return ImportService(db_session).upload_and_preview(
+            file=io.BytesIO(self.SHIFTED_CSV.encode()),
+            file_name="shifted.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+        )
+
+    def test_shifted_row_not_duplicate_by_default(self, db_session, setup_data):
+        """Without a tolerance a row a day off should be imported"""
+        preview = self._preview(db_session, setup_data)
+
+        assert preview.summary.duplicate_count == 0
+
+    def test_tolerance_setting_flags_shifted_row(self, db_session, setup_data):
+        """The tolerance setting should flag a row a day off as a duplicate"""
+        db_session.add(
+            AppSetting(setting_key="duplicate_date_tolerance_days", setting_value="1")
+        )
+        db_session.commit()
+
+        preview = self._preview(db_session, setup_data)
+
+        assert preview.summary.duplicate_count == 1
+        assert preview.transactions[0].is_duplicate
+
+
+class TestExcelSheets:
+    """Tests for which workbook sheets a preview reads"""
+
+    def _preview(self, db_session, setup_data, all_sheets):
+        template = setup_data["template"]
+        template.file_format = FileFormat.EXCEL
+        template.all_sheets = all_sheets
+        db_session.commit()
+
+        header = CSV_CONTENT.splitlines()[0].split(",")
+        file = io.BytesIO()
+        with pd.ExcelWriter(file) as writer:
+            for month, day in (("Jan", "1/20/2026"), ("Feb", "2/20/2026")):
+                row = [day, day, f"{month} purchase", "", "-1.00"]
+                pd.DataFrame([row], columns=header).to_excel(
+                    writer, sheet_name=month, index=False
+                )
+        return ImportService(db_session).upload_and_preview(
+            file=file,
+            file_name="statement.xlsx",
+            account_id=setup_data["account"].account_id,
+            template_id=template.template_id,
+        )
+
+    def test_first_sheet_by_default(self, db_session, setup_data):
+        """A template reads only the first sheet unless it opts in"""
+        preview = self._preview(db_session, setup_data, all_sheets=False)
+
+        assert [t.description for t in preview.transactions] == ["Jan purchase"]
+
+    def test_all_sheets_opt_in(self, db_session, setup_data):
+        """A template with all_sheets reads every sheet with its columns"""
+        preview = self._preview(db_session, setup_data, all_sheets=True)
+
+        assert [t.description for t in preview.transactions] == [
+            "Jan purchase",
+            "Feb purchase",
+        ]
+
+
+class TestStagedConfirm:
+    """Tests for confirming a preview from its staged rows"""
+
+    def _preview(self, db_session, setup_data):
+        return ImportService(db_session, chunk_size=2).upload_and_preview(
+            file=io.BytesIO(CSV_CONTENT.encode()),
+            file_name="test.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+        )
+
+    def test_preview_rows_are_staged(self, db_session, setup_data):
+        """Every parsed row should be stored in the staging table"""
+        preview = self._preview(db_session, setup_data)
+
+        rows = db_session.scalars(
+            select(ImportStagingRow)
+            .where(ImportStagingRow.import_batch_id == preview.import_batch_id)
+            .order_by(ImportStagingRow.row_number)
+        ).all()
+
+        expected = [t.row_number for t in preview.transactions]
+        assert [r.row_number for r in rows] == expected
+        assert rows[0].transaction_date == date(2026, 1, 15)
+        assert rows[1].is_duplicate
+        assert rows[3].has_errors
+
+    @pytest.mark.parametrize("confirm_mode", ["insert_select", "executemany"])
+    def test_confirm_inserts_selected_rows(self, db_session, setup_data, confirm_mode):
+        """Only selected, valid, non-duplicate rows should become transactions"""
+        preview = self._preview(db_session, setup_data)
+        service = ImportService(db_session, chunk_size=2, confirm_mode=confirm_mode)
+
+        result = service.confirm_import(
+            import_batch_id=preview.import_batch_id,
+            selected_rows=[2, 3, 4, 5],
+            category_overrides={4: setup_data["shopping"].category_id},
+        )
+
+        assert result.imported_count == 2
+        assert result.duplicate_count == 1
+        assert result.skipped_count == 2
+        assert result.status == ImportStatus.COMPLETED
+
+        imported = {
+            t.description: t
+            for t in db_session.scalars(
+                select(Transaction).where(Transaction.imported_date.is_not(None))
+            )
+        }
+        assert set(imported) == {"Coffee Shop", "Paycheck"}
+        assert imported["Coffee Shop"].amount == -450
+        assert imported["Coffee Shop"].transaction_type == TransactionType.PURCHASE
+        restaurants = setup_data["restaurants"]
+        assert imported["Coffee Shop"].category_id == restaurants.category_id
+        assert imported["Paycheck"].transaction_type == TransactionType.PAYMENT
+        assert imported["Paycheck"].category_id == setup_data["shopping"].category_id
+        assert imported["Paycheck"].posted_date == date(2026, 1, 17)
+        assert imported["Paycheck"].is_active
+        assert imported["Paycheck"].created_at is not None
+        assert imported["Paycheck"].imported_date is not None
+        for txn in imported.values():
+            assert txn.fingerprint == txn.compute_fingerprint()
+
+    @pytest.mark.parametrize("confirm_mode", ["insert_select", "executemany"])
+    def test_confirm_updates_fingerprint_cache(
+        self, db_session, setup_data, confirm_mode
+    ):
+        """Imported rows should reach the shared cache without a reload"""
+        preview = self._preview(db_session, setup_data)
+        account_id = setup_data["account"].account_id
+        assert account_id in get_fingerprint_cache()
+
+        ImportService(db_session, confirm_mode=confirm_mode).confirm_import(
+            import_batch_id=preview.import_batch_id, selected_rows=[2, 3, 4, 5]
+        )
+
+        imported = db_session.scalars(
+            select(Transaction.fingerprint).where(
+                Transaction.imported_date.is_not(None)
+            )
+        ).all()
+        cached = set(get_fingerprint_cache().get(account_id, lambda start, end: []))
+        assert imported
+        assert set(imported) <= cached
+
+    def test_confirm_clears_staged_rows(self, db_session, setup_data):
+        """Staged rows should be removed once the batch is confirmed"""
+        preview = self._preview(db_session, setup_data)
+
+        ImportService(db_session).confirm_import(
+            import_batch_id=preview.import_batch_id, selected_rows=[2]
+        )
+
+        batch = db_session.get(ImportBatch, preview.import_batch_id)
+        assert batch.status == ImportStatus.COMPLETED
+        assert (
+            db_session.scalars(
+                select(ImportStagingRow).where(
+                    ImportStagingRow.import_batch_id == preview.import_batch_id
+                )
+            ).first()
+            is None
+        )
+
+    def test_confirm_twice_fails(self, db_session, setup_data):
+        """A confirmed batch cannot be confirmed again"""
+        preview = self._preview(db_session, setup_data)
+        service = ImportService(db_session)
+        service.confirm_import(preview.import_batch_id, selected_rows=[2])
+
+        with pytest.raises(ValueError, match="not in PREVIEW status"):
+            service.confirm_import(preview.import_batch_id, selected_rows=[2])
+
+
+class TestStoredUploads:
+    """Tests for the file store: memoized parses, re-upload flag and re-parse"""
+
+    def _preview(self, db_session, setup_data, content=CSV_CONTENT):
+        return ImportService(db_session).upload_and_preview(
+            file=io.BytesIO(content.encode()),
+            file_name="test.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+        )
+
+    def test_reupload_uses_memoized_parse(self, db_session, setup_data, monkeypatch):
+        """An identical re-upload should not be parsed again"""
+        first = self._preview(db_session, setup_data)
+
+        def fail(self, template):
+            raise AssertionError("file parsed again")
+
+        monkeypatch.setattr(ImportService, "_create_parser", fail)
+        second = self._preview(db_session, setup_data)
+
+        assert second.import_batch_id != first.import_batch_id
+        assert second.summary == first.summary
+        assert second.transactions == first.transactions
+
+    def test_template_change_parses_again(self, db_session, setup_data):
+        """Editing the template should invalidate the memoized parse"""
+        self._preview(db_session, setup_data)
+
+        template = setup_data["template"]
+        template.amount_config = {"sign_convention": "inverted", "decimal_places": 2}
+        db_session.commit()
+        preview = self._preview(db_session, setup_data)
+
+        assert preview.transactions[0].amount == 450
+
+    def test_flags_file_already_imported(self, db_session, setup_data):
+        """A re-upload of a confirmed file should point at the earlier batch"""
+        first = self._preview(db_session, setup_data)
+        assert first.already_imported_batch_id is None
+        ImportService(db_session).confirm_import(
+            first.import_batch_id, selected_rows=[2]
+        )
+
+        again = self._preview(db_session, setup_data)
+        other = self._preview(db_session, setup_data, CSV_CONTENT + "\n")
+
+        assert again.already_imported_batch_id == first.import_batch_id
+        assert other.already_imported_batch_id is None
+
+    def test_reparse_batch(self, db_session, setup_data):
+        """A preview can be parsed again from the stored file, replacing it"""
+        preview = self._preview(db_session, setup_data)
+        template = setup_data["template"]
+        template.column_mappings = {**template.column_mappings, "category": "Nope"}
+        db_session.commit()
+
+        reparsed = ImportService(db_session).reparse_batch(preview.import_batch_id)
+
+        assert reparsed.import_batch_id != preview.import_batch_id
+        assert reparsed.summary.total_rows == 5
+        assert all(t.category_name is None for t in reparsed.transactions)
+        assert db_session.get(ImportBatch, preview.import_batch_id) is None
+        batch = db_session.get(ImportBatch, reparsed.import_batch_id)
+        assert batch.file_name == "test.csv"
+
+    def test_reparse_without_stored_file(self, db_session, setup_data):
+        """Batches from before the file store cannot be parsed again"""
+        batch = ImportBatch(
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+            file_name="old.csv",
+            file_format=FileFormat.CSV,
+        )
+        db_session.add(batch)
+        db_session.commit()
+
+        with pytest.raises(ValueError, match="not stored"):
+            ImportService(db_session).reparse_batch(batch.import_batch_id)
+
+
+class TestRecategorizeBatch:
+    """Tests for re-applying category mappings to a stored preview"""
+
+    def _preview(self, db_session, setup_data):
+        return ImportService(db_session).upload_and_preview(
+            file=io.BytesIO(CSV_CONTENT.encode()),
+            file_name="test.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+        )
+
+    def _staged(self, db_session, import_batch_id):
+        return {
+            r.row_number: r
+            for r in db_session.scalars(
+                select(ImportStagingRow).where(
+                    ImportStagingRow.import_batch_id == import_batch_id
+                )
+            )
+        }
+
+    def test_only_affected_rows_change(self, db_session, setup_data):
+        """Rows of other bank categories, and their hand-picked categories, stay"""
+        preview = self._preview(db_session, setup_data)
+        restaurants = setup_data["restaurants"]
+        # Hand-picked category on a row whose mapping does not change
+        ImportService(db_session).staging_repo.set_category(
+            preview.import_batch_id, 2, setup_data["shopping"].category_id
+        )
+        mapping = db_session.scalars(
+            select(CategoryMapping).where(
+                CategoryMapping.bank_category_name == "Shopping"
+            )
+        ).one()
+        mapping.coinpurse_category_id = restaurants.category_id
+        db_session.commit()
+
+        result = ImportService(db_session).recategorize_batch(preview.import_batch_id)
+
+        assert result.recategorized_rows == 2
+        assert result.duplicate_changes == 0
+        rows = self._staged(db_session, preview.import_batch_id)
+        assert rows[3].coinpurse_category_id == restaurants.category_id
+        assert rows[6].candidate_category_ids == [restaurants.category_id]
+        assert rows[2].coinpurse_category_id == setup_data["shopping"].category_id
+
+    def test_hand_picked_category_survives_remap(self, db_session, setup_data):
+        """A row the user categorized keeps its category when its mapping changes"""
+        preview = self._preview(db_session, setup_data)
+        restaurants = setup_data["restaurants"]
+        uncategorized = setup_data["uncategorized"]
+        ImportService(db_session).staging_repo.set_category(
+            preview.import_batch_id, 6, uncategorized.category_id
+        )
+        mapping = db_session.scalars(
+            select(CategoryMapping).where(
+                CategoryMapping.bank_category_name == "Shopping"
+            )
+        ).one()
+        mapping.coinpurse_category_id = restaurants.category_id
+        db_session.commit()
+
+        ImportService(db_session).recategorize_batch(preview.import_batch_id)
+
+        rows = self._staged(db_session, preview.import_batch_id)
+        assert rows[3].coinpurse_category_id == restaurants.category_id
+        assert rows[6].coinpurse_category_id == uncategorized.category_id
+        assert rows[6].candidate_category_ids == [restaurants.category_id]
+
+    def test_unchanged_mappings_touch_nothing(self, db_session, setup_data):
+        """Without a mapping change no row should be updated"""
+        preview = self._preview(db_session, setup_data)
+
+        result = ImportService(db_session).recategorize_batch(preview.import_batch_id)
+
+        assert result.recategorized_rows == 0
+
+    def test_detect_duplicates_again(self, db_session, setup_data):
+        """Transactions added since the preview should flag matching rows"""
+        preview = self._preview(db_session, setup_data)
+        assert preview.summary.duplicate_count == 1
+        db_session.add(
+            Transaction(
+                account_id=setup_data["account"].account_id,
+                category_id=setup_data["restaurants"].category_id,
+                transaction_date=date(2026, 1, 15),
+                posted_date=date(2026, 1, 15),
+                amount=-450,
+                description="Coffee Shop",
+                transaction_type=TransactionType.PURCHASE,
+                notes="",
+            )
+        )
+        db_session.commit()
+
+        result = ImportService(db_session, chunk_size=2).recategorize_batch(
+            preview.import_batch_id, detect_duplicates=True
+        )
+
+        assert result.duplicate_changes == 1
+        assert result.duplicate_count == 2
+        rows = self._staged(db_session, preview.import_batch_id)
+        assert rows[2].is_duplicate
+        batch = db_session.get(ImportBatch, preview.import_batch_id)
+        assert batch.duplicate_count == 2
+
+    def test_confirmed_batch_fails(self, db_session, setup_data):
+        """Only PREVIEW batches have staged rows to re-map"""
+        preview = self._preview(db_session, setup_data)
+        service = ImportService(db_session)
+        service.confirm_import(preview.import_batch_id, selected_rows=[2])
+
+        with pytest.raises(ValueError, match="not in PREVIEW status"):
+            service.recategorize_batch(preview.import_batch_id)
+
+
+class TestImportProgress:
+    """Tests for stage progress reports and confirms committed in chunks"""
+
+    def _preview(self, db_session, setup_data, progress_callback=None):
+        return ImportService(db_session, chunk_size=2).upload_and_preview(
+            file=io.BytesIO(CSV_CONTENT.encode()),
+            file_name="test.csv",
+            account_id=setup_data["account"].account_id,
+            template_id=setup_data["template"].template_id,
+            progress_callback=progress_callback,
+        )
+
+    def test_preview_reports_each_stage(self, db_session, setup_data):
+        """Every chunk should be reported parsed, categorized, then deduplicated"""
+        reports = []
+        self._preview(
+            db_session,
+            setup_data,
+            lambda current, total, stage=None: reports.append((current, stage)),
+        )
+
+        stages = ["parsed", "categorized", "deduplicated"]
+        assert reports == [(n, stage) for n in (2, 4, 5) for stage in stages]
+
+    def test_confirm_reports_inserted_rows(self, db_session, setup_data):
+        """A confirm should report rows inserted out of rows to import"""
+        preview = self._preview(db_session, setup_data)
+        reports = []
+
+        ImportService(db_session, chunk_size=2).confirm_import(
+            preview.import_batch_id,
+            selected_rows=[2, 3, 4, 5, 6],
+            progress_callback=lambda *report: reports.append(report),
+        )
+
+        assert reports[-1] == (3, 3, "inserted")
+        assert {stage for _, _, stage in reports} == {"inserted"}
+
+    def test_confirm_commits_in_chunks(self, db_session, setup_data, monkeypatch):
+        """Each chunk of imported rows should be committed as it is inserted"""
+        preview = self._preview(db_session, setup_data)
+        service = ImportService(db_session, chunk_size=1, commit_rows=1)
+        commits = []
+        monkeypatch.setattr(service.db, "commit", lambda: commits.append(True))
+
+        service.confirm_import(preview.import_batch_id, selected_rows=[2, 4, 6])
+
+        # One commit per imported row, plus marking the batch completed
+        assert len(commits) == 4
+
+    def test_interrupted_confirm_resumes(self, db_session, setup_data, monkeypatch):
+        """Rows committed before a failure stay imported and are not re-imported"""
+        preview = self._preview(db_session, setup_data)
+        service = ImportService(db_session, chunk_size=1, commit_rows=1)
+        insert_window = service._insert_window
+
+        def fail_at_row_4(import_batch_id, account_id, imported_date, row_range):
+            if row_range[0] == 4:
+                raise RuntimeError("connection lost")
+            return insert_window(import_batch_id, account_id, imported_date, row_range)
+
+        monkeypatch.setattr(service, "_insert_window", fail_at_row_4)
+        with pytest.raises(RuntimeError):
+            service.confirm_import(preview.import_batch_id, selected_rows=[2, 3, 4, 6])
+
+        batch = db_session.get(ImportBatch, preview.import_batch_id)
+        assert batch.status == ImportStatus.PREVIEW
+        assert batch.imported_count == 1
+
+        result = ImportService(db_session).confirm_import(
+            preview.import_batch_id, selected_rows=[2, 3, 4, 6]
+        )
+
+        assert result.imported_count == 3
+        assert result.duplicate_count == 1
+        imported = db_session.scalars(
+            select(Transaction.description).where(
+                Transaction.imported_date.is_not(None)
+            )
+        ).all()
+        assert sorted(imported) == ["Book Store", "Coffee Shop", "Paycheck"]
@@ -0,0 +1,146 @@
+"""
+Unit tests for the scheduled preview reaper
+"""
+
+import io
+import os
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from models import (
+    Account,
+    AccountType,
+    FileFormat,
+    ImportBatch,
+    ImportStagingRow,
+    ImportStatus,
+    Institution,
+    TaxTreatmentType,
+)
+from services.preview_reaper import PreviewReaper
+
+
+def _stale_preview(db_session: Session) -> int:
+    institution = Institution(name="Reaper Bank")
+    db_session.add(institution)
+    db_session.commit()
+    account = Account(
+        institution_id=institution.institution_id,
+        account_name="Reaper Account",
+        account_type=AccountType.CREDIT_CARD,
+        tax_treatment=TaxTreatmentType.NOT_APPLICABLE,
+        last_4_digits="9999",
+        tracks_transactions=True,
+    )
+    db_session.add(account)
+    db_session.commit()
+
+    batch = ImportBatch(
+        account_id=account.account_id,
+        file_name="stale.csv",
+        file_format=FileFormat.CSV,
+        status=ImportStatus.PREVIEW,
+        created_at=datetime.now(UTC) - timedelta(hours=48),
+    )
+    db_session.add(batch)
+    db_session.commit()
+    db_session.add(
+        ImportStagingRow(
+            import_batch_id=batch.import_batch_id,
+            row_number=2,
+            description="Stale",
+            transaction_type="DEBIT",
+        )
+    )
+    db_session.commit()
+    return batch.import_batch_id
+
+
+def _reaper(db_session: Session, interval_seconds: float) -> PreviewReaper:
+    return PreviewReaper(
+        session_factory=lambda: Session(
+            bind=db_session.get_bind(), join_transaction_mode="create_savepoint"
+        ),
+        interval_seconds=interval_seconds,
+    )
+
+
+class TestPreviewReaper:
+    """Tests for PreviewReaper"""
+
+    def test_run_once_reports_reclaimed(self, db_session):
+        """A run should delete stale previews and remember what it reclaimed"""
+        import_batch_id = _stale_preview(db_session)
+        reaper = _reaper(db_session, interval_seconds=0)
+
+        result = reaper.run_once()
+
+        assert (result.batches, result.rows) == (1, 1)
+        assert result.bytes > 0
+        assert reaper.last_result == result
+        db_session.expire_all()
+        assert db_session.get(ImportBatch, import_batch_id) is None
+
+    def test_run_once_reaps_stored_files(self, db_session, import_file_store):
+        """Old uploads should be deleted unless a remaining batch was read from them"""
+        import_batch_id = _stale_preview(db_session)
+        stale = import_file_store.put(io.BytesIO(b"stale"))
+        open_preview = import_file_store.put(io.BytesIO(b"open"))
+        confirmed = import_file_store.put(io.BytesIO(b"confirmed"))
+        for content_hash in (stale, open_preview, confirmed):
+            mtime = time.time() - 48 * 60 * 60
+            os.utime(import_file_store.path(content_hash), (mtime, mtime))
+        batch = db_session.get(ImportBatch, import_batch_id)
+        db_session.add(
+            ImportBatch(
+                account_id=batch.account_id,
+                file_name="open.csv",
+                file_format=FileFormat.CSV,
+                status=ImportStatus.PREVIEW,
+                content_hash=open_preview,
+            )
+        )
+        db_session.add(
+            ImportBatch(
+                account_id=batch.account_id,
+                file_name="confirmed.csv",
+                file_format=FileFormat.CSV,
+                status=ImportStatus.COMPLETED,
+                content_hash=confirmed,
+            )
+        )
+        batch.content_hash = stale
+        db_session.commit()
+        reaper = _reaper(db_session, interval_seconds=0)
+
+        reaper.run_once()
+
+        assert reaper.last_files.files == 1
+        assert not import_file_store.exists(stale)
+        assert import_file_store.exists(open_preview)
+        assert import_file_store.exists(confirmed)
+
+    def test_runs_on_schedule(self, db_session):
+        """A started reaper should run every interval until stopped"""
+        _stale_preview(db_session)
+        reaper = _reaper(db_session, interval_seconds=0.01)
+
+        reaper.start()
+        try:
+            deadline = time.monotonic() + 5
+            while reaper.last_result is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            reaper.stop()
+
+        assert reaper.last_result is not None
+
+    def test_zero_interval_never_starts(self, db_session):
+        """An interval of 0 should turn the schedule off"""
+        reaper = _reaper(db_session, interval_seconds=0)
+
+        reaper.start()
+
+        assert reaper._thread is None
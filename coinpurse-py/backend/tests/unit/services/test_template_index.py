@@ -0,0 +1,214 @@
+"""
+Unit tests for automatic template selection
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from models import FileFormat, ImportTemplate
+from services.template_index import (
+    TemplateIndex,
+    best_match,
+    get_template_index,
+    required_headers,
+)
+
+
+def _template(
+    template_id,
+    name,
+    config,
+    file_format=FileFormat.CSV,
+    header_row=1,
+    all_sheets=False,
+):
+    return ImportTemplate(
+        template_id=template_id,
+        template_name=name,
+        file_format=file_format,
+        column_mappings=config["column_mappings"],
+        amount_config=config["amount_config"],
+        header_row=header_row,
+        all_sheets=all_sheets,
+    )
+
+
+@pytest.fixture
+def templates(
+    chase_template_config, discover_template_config, capital_one_template_config
+):
+    return [
+        _template(1, "Chase", chase_template_config),
+        _template(2, "Discover", discover_template_config),
+        _template(3, "Capital One", capital_one_template_config),
+    ]
+
+
+CHASE_HEADER = "Transaction Date,Post Date,Description,Category,Type,Amount,Memo"
+DISCOVER_HEADER = "Trans. Date,Post Date,Description,Amount,Category"
+
+
+class TestTemplateIndex:
+    """Tests for TemplateIndex"""
+
+    def test_required_headers_include_split_columns(self, capital_one_template_config):
+        """Debit/credit columns named only in amount_config are required too"""
+        config = dict(capital_one_template_config)
+        config["amount_config"] = {
+            "sign_convention": "split_columns",
+            "debit_column": "Withdrawals",
+            "credit_column": "Deposits",
+        }
+        headers = required_headers(_template(1, "Bank", config))
+
+        assert {"withdrawals", "deposits", "debit", "credit"} <= headers
+
+    def test_matches_by_header(self, templates):
+        """Each bank's header should pick exactly its own template"""
+        index = TemplateIndex(templates)
+
+        chase = index.match(FileFormat.CSV, 1, CHASE_HEADER.split(","))
+        discover = index.match(FileFormat.CSV, 1, DISCOVER_HEADER.split(","))
+
+        assert [m.template_name for m in chase] == ["Chase"]
+        assert [m.template_name for m in discover] == ["Discover"]
+
+    def test_ignores_case_and_whitespace(self, templates):
+        """Header names should match regardless of case and padding"""
+        headers = [f"  {h.upper()} " for h in DISCOVER_HEADER.split(",")]
+
+        matches = TemplateIndex(templates).match(FileFormat.CSV, 1, headers)
+
+        assert [m.template_id for m in matches] == [2]
+
+    def test_missing_column_does_not_match(self, templates):
+        """A template matches only if every mapped column is present"""
+        headers = ["Transaction Date", "Description", "Amount"]
+
+        assert TemplateIndex(templates).match(FileFormat.CSV, 1, headers) == []
+
+    def test_format_and_header_row_must_agree(self, chase_template_config):
+        """Templates are only matched against files read the same way"""
+        index = TemplateIndex(
+            [_template(1, "Chase", chase_template_config, header_row=3)]
+        )
+        headers = CHASE_HEADER.split(",")
+
+        assert index.match(FileFormat.CSV, 1, headers) == []
+        assert index.match(FileFormat.EXCEL, 3, headers) == []
+        assert len(index.match(FileFormat.CSV, 3, headers)) == 1
+
+    def test_most_specific_match_wins(self, chase_template_config):
+        """A template mapping more of the file's columns should rank first"""
+        narrow = dict(chase_template_config)
+        narrow["column_mappings"] = {
+            k: v for k, v in narrow["column_mappings"].items() if k != "category"
+        }
+        index = TemplateIndex(
+            [
+                _template(1, "Narrow", narrow),
+                _template(2, "Chase", chase_template_config),
+            ]
+        )
+
+        matches = index.match(FileFormat.CSV, 1, CHASE_HEADER.split(","))
+
+        assert [m.template_id for m in matches] == [2, 1]
+        assert best_match(matches).template_id == 2
+
+    def test_tie_has_no_best_match(self, chase_template_config):
+        """Two templates with the same columns should not be chosen between"""
+        index = TemplateIndex(
+            [
+                _template(1, "Chase", chase_template_config),
+                _template(2, "Chase copy", chase_template_config),
+            ]
+        )
+
+        matches = index.match(FileFormat.CSV, 1, CHASE_HEADER.split(","))
+
+        assert len(matches) == 2
+        assert best_match(matches) is None
+
+    def test_detect_csv(self, templates, chase_template_config):
+        """detect() should read each header row used and rewind the file"""
+        templates.append(
+            _template(4, "Chase with preamble", chase_template_config, header_row=2)
+        )
+        index = TemplateIndex(templates)
+        content = f"Account export\n{CHASE_HEADER}\n1/1/2026,1/1/2026,x,,Sale,-1,\n"
+        file = io.BytesIO(content.encode())
+
+        matches = index.detect(file)
+
+        assert [m.template_id for m in matches] == [4]
+        assert file.tell() == 0
+
+    def test_detect_excel(self, chase_template_config):
+        """Workbooks should be recognized and matched against Excel templates"""
+        index = TemplateIndex(
+            [_template(1, "Chase", chase_template_config, FileFormat.EXCEL)]
+        )
+        file = io.BytesIO()
+        pd.DataFrame(columns=CHASE_HEADER.split(",")).to_excel(file, index=False)
+
+        assert [m.template_id for m in index.detect(file)] == [1]
+
+    def test_detect_later_sheet_needs_all_sheets(self, chase_template_config):
+        """Headers past the first sheet only match templates reading every sheet"""
+        file = io.BytesIO()
+        with pd.ExcelWriter(file) as writer:
+            pd.DataFrame(columns=["Total"]).to_excel(
+                writer, sheet_name="Summary", index=False
+            )
+            pd.DataFrame(columns=CHASE_HEADER.split(",")).to_excel(
+                writer, sheet_name="Activity", index=False
+            )
+
+        first_only = _template(1, "Chase", chase_template_config, FileFormat.EXCEL)
+        every = _template(
+            2, "Chase sheets", chase_template_config, FileFormat.EXCEL, all_sheets=True
+        )
+
+        assert TemplateIndex([first_only]).detect(file) == []
+        assert [
+            m.template_id for m in TemplateIndex([first_only, every]).detect(file)
+        ] == [2]
+
+    def test_detect_unreadable_file(self, templates):
+        """A file that cannot be read should simply match nothing"""
+        assert TemplateIndex(templates).detect(io.BytesIO(b"")) == []
+
+
+class TestGetTemplateIndex:
+    """Tests for the shared index and its rebuilds"""
+
+    def test_rebuilt_when_templates_change(self, db_session, chase_template_config):
+        """Creating, editing and deactivating templates should be picked up"""
+        assert len(get_template_index(db_session)) == 0
+
+        template = ImportTemplate(
+            template_name="Chase",
+            file_format=FileFormat.CSV,
+            column_mappings=chase_template_config["column_mappings"],
+            amount_config=chase_template_config["amount_config"],
+        )
+        db_session.add(template)
+        db_session.commit()
+        index = get_template_index(db_session)
+        assert len(index) == 1
+        assert get_template_index(db_session) is index
+
+        template.column_mappings = {
+            **template.column_mappings,
+            "amount": "Value",
+        }
+        db_session.commit()
+        headers = CHASE_HEADER.replace("Amount", "Value").split(",")
+        assert get_template_index(db_session).match(FileFormat.CSV, 1, headers)
+
+        template.is_active = False
+        db_session.commit()
+        assert len(get_template_index(db_session)) == 0
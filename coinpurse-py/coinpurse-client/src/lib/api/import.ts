@@ -5,10 +5,13 @@ import {
     buildQueryString,
 } from "$lib/api";
 import type {
+    ImportBatchRowsParams,
     ImportConfirmRequest,
     ImportConfirmResponse,
     ImportPreviewResponse,
     ImportTemplate,
+    ParsedTransaction,
+    ParsedTransactionPage,
 } from "$lib/types";
 
 export const importApi = {
@@ -70,6 +73,38 @@ export const importApi = {
         }
     },
 
+    /**
+     * Get one page of a preview batch's rows
+     */
+    getBatchRows(
+        batchId: number,
+        params: ImportBatchRowsParams = {},
+    ): Promise<ParsedTransactionPage> {
+        const query = buildQueryString({ ...params });
+        return apiFetch<ParsedTransactionPage>(
+            `/import/batches/${batchId}/rows${query}`,
+        );
+    },
+
+    /**
+     * Get every row of a preview, following next_cursor from the upload response
+     */
+    async getAllPreviewRows(
+        preview: ImportPreviewResponse,
+    ): Promise<ParsedTransaction[]> {
+        const rows = [...preview.transactions];
+        let cursor = preview.next_cursor;
+        while (cursor !== null) {
+            const page = await importApi.getBatchRows(preview.import_batch_id, {
+                after_row: cursor,
+                limit: 1000,
+            });
+            rows.push(...page.transactions);
+            cursor = page.next_cursor;
+        }
+        return rows;
+    },
+
     /**
      * Confirm and execute import for selected rows
      */
@@ -292,6 +292,7 @@ export interface ImportTemplate {
     amount_config: Record<string, any>;
     header_row: number;
     skip_rows: number;
+    all_sheets: boolean;
     date_format: string;
     is_active: boolean;
     created_at: string;
@@ -322,7 +323,25 @@ export interface ImportPreviewSummary {
 export interface ImportPreviewResponse {
     import_batch_id: number;
     summary: ImportPreviewSummary;
+    transactions: ParsedTransaction[]; // First page only
+    next_cursor: number | null; // Pass as after_row to fetch the next page
+}
+
+export interface ParsedTransactionPage {
     transactions: ParsedTransaction[];
+    total: number;
+    offset: number;
+    limit: number;
+    next_cursor: number | null;
+}
+
+export interface ImportBatchRowsParams {
+    offset?: number;
+    limit?: number;
+    after_row?: number;
+    is_duplicate?: boolean;
+    has_errors?: boolean;
+    category_id?: number;
 }
 
 export interface ImportConfirmRequest {